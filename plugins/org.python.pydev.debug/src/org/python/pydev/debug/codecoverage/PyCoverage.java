@@ -98,9 +98,13 @@ public class PyCoverage {
             }
             AbstractRunner runner = UniversalRunner.getRunner(nature);
 
+            //The combine and the report are done in parallel (with one job for each processor) when the installed
+            //coverage supports it.
+            String jobsArg = "--pydev-jobs=" + Runtime.getRuntime().availableProcessors();
+
             //First, combine the results of the many runs we may have.
             Tuple<String, String> output = runner.runScriptAndGetOutput(PythonRunnerConfig.getCoverageScript(),
-                    new String[] { "combine" }, getCoverageDirLocation(), monitor);
+                    new String[] { "combine", jobsArg }, getCoverageDirLocation(), monitor);
 
             if (output.o1 != null && output.o1.length() > 0) {
                 Log.logInfo(output.o1);
@@ -132,7 +136,7 @@ public class PyCoverage {
                 //                        PythonRunnerConfig.getCoverageScript(), new String[]{
                 //                            "-r", "-m", "--include", ".*"}, getCoverageDirLocation(), monitor);
                 Tuple<Process, String> tup = runner.createProcess(PythonRunnerConfig.getCoverageScript(),
-                        new String[] { "--pydev-analyze" }, getCoverageDirLocation(), monitor);
+                        new String[] { "--pydev-analyze", jobsArg }, getCoverageDirLocation(), monitor);
                 p = tup.o1;
                 try {
                     p.exitValue();
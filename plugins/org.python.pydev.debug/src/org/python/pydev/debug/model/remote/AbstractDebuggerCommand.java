@@ -86,6 +86,7 @@ public abstract class AbstractDebuggerCommand {
     static public final int CMD_SHOW_RETURN_VALUES = 146;
     static public final int CMD_INPUT_REQUESTED = 147;
     static public final int CMD_PROCESS_CREATED = 149;
+    static public final int CMD_EVALUATE_EXPRESSIONS = 150;
 
     static public final int CMD_ERROR = 901;
     static public final int CMD_VERSION = 501;
@@ -273,70 +273,114 @@ class Module(Container):
     def __str__(self):
         return self.ToStr()
 
+#===================================================================================================
+# WriteModule
+#===================================================================================================
+def WriteModule(api_file, handle_module, module, output_stream=None):
+    final_contents = '''"""Automatically generated file from %s (QScintilla API file)
+
+Note that the generated code must be Python 3.0 compatible to be used in a .pypredef file.
+
+Imports should not be used (if a class is used from another module,
+it should be completely redeclared in a .pypredef file)
+
+The name of the file should be a direct representation of the module name 
+(i.e.: a PyQt4.QtCore.pypredef file represents a PyQt4.QtCore module)
+"""
+'''
+    target = handle_module+'.pypredef'
+    print('Writing contents for: %s to: %s' % (handle_module, target))
+    final_contents += ToStr(module)
+    
+    if output_stream is None:
+        f = open(os.path.join(os.path.dirname(api_file), target), 'w')        
+        try:
+            f.write(final_contents.replace('None =', 'None_ =').replace('.None', '.None_'))
+        finally:
+            f.close()
+    else:
+        output_stream.write(final_contents)
+        
+        
 #===================================================================================================
 # Convert
 #===================================================================================================
 def Convert(api_file, parts_for_module, cancel_monitor, lines=None, output_stream=None):
+    '''
+    Converts the api file in a single pass: each line is added to the module with its prefix as it's read.
+    
+    The api files are usually sorted, so, when writing to files, a module is written as soon as a line from
+    a module after it is found (if the file isn't sorted, modules which receive contents after being written
+    are written again at the end). When an output_stream is passed, all the modules are written at the end.
+    '''
     cancel_monitor.setTaskName('Opening: '+api_file)
     
+    f = None
     if lines is None:
         f = open(api_file, 'r')
-        try:
-            lines = f.readlines()
-        finally:
-            f.close()
+        lines = f
+        
+    try:
+        cancel_monitor.setTaskName('Parsing: '+api_file)
+        if cancel_monitor.isCanceled():
+            return
+        cancel_monitor.worked(1)
         
+        found = {} #Module names (the ones which'll be written).
+        modules = {} #Module name -> Module
+        written = {} #Module names already written
+        rewrite = {} #Module names which must be written again at the end (unsorted file)
+        current = None
+        in_order = output_stream is None
         
-    directory = os.path.dirname(api_file)
+        for line in lines:
+            contents = line.split('.')
+            if len(contents) >= parts_for_module:
+                found['.'.join(contents[:2])] = ''
+                
+            if len(contents) < 3:
+                continue
+            
+            handle_module = '.'.join(contents[:2])
+            if handle_module != current:
+                if in_order and current is not None:
+                    if handle_module < current:
+                        in_order = False
+                    elif current in found:
+                        cancel_monitor.setTaskName('Handling: '+current)
+                        cancel_monitor.worked(1)
+                        if cancel_monitor.isCanceled():
+                            return
+                        WriteModule(api_file, current, modules[current], output_stream)
+                        written[current] = ''
+                current = handle_module
+                
+            module = modules.get(handle_module)
+            if module is None:
+                module = modules[handle_module] = Module()
+            elif handle_module in written:
+                rewrite[handle_module] = ''
+            
+            line = line[len(handle_module+'.'):].strip()
+            line = line.replace('::', '.')
+            before, after = line.split('?')
+            
+            module.AddString(before, after)
+    finally:
+        if f is not None:
+            f.close()
         
-    cancel_monitor.setTaskName('Parsing: '+api_file)
-    if cancel_monitor.isCanceled():
-        return
-    cancel_monitor.worked(1)
-    
-    found = {}
-    for line in lines:
-        contents = line.split('.')
-        if len(contents) >= parts_for_module:
-            found['.'.join(contents[:2])] = ''
     for handle_module in sorted(found.iterkeys()):
+        if handle_module in written and handle_module not in rewrite:
+            continue
         cancel_monitor.setTaskName('Handling: '+handle_module)
         cancel_monitor.worked(1)
         if cancel_monitor.isCanceled():
             return
-        module = Module()
-        
-        for line in lines:
-            if line.startswith(handle_module+'.'):
-                line = line[len(handle_module+'.'):].strip()
-                line = line.replace('::', '.')
-                before, after = line.split('?')
-                
-                module.AddString(before, after)
-        
-        final_contents = '''"""Automatically generated file from %s (QScintilla API file)
-
-Note that the generated code must be Python 3.0 compatible to be used in a .pypredef file.
-
-Imports should not be used (if a class is used from another module,
-it should be completely redeclared in a .pypredef file)
-
-The name of the file should be a direct representation of the module name 
-(i.e.: a PyQt4.QtCore.pypredef file represents a PyQt4.QtCore module)
-"""
-'''
-        target = handle_module+'.pypredef'
-        print('Writing contents for: %s to: %s' % (handle_module, target))
-        final_contents += ToStr(module)
-        
-        if output_stream is None:
-            f = open(os.path.join(directory, target), 'w')        
-            try:
-                f.write(final_contents.replace('None =', 'None_ =').replace('.None', '.None_'))
-            finally:
-                f.close()
-        else:
-            output_stream.write(final_contents)
+        module = modules.get(handle_module)
+        if module is None:
+            module = Module()
+        WriteModule(api_file, handle_module, module, output_stream)
             
         
 #===================================================================================================
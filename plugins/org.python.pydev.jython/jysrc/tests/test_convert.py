@@ -43,8 +43,23 @@ class Test(unittest.TestCase):
         self.Check("def connect(QObject, SIGNAL, QObject, SLOT, Qt_ConnectionType=Qt.AutoConnection):", output_stream.getvalue())
         self.Check("def leftJustified(width, fill=' ', truncate=False):", output_stream.getvalue())
         self.Check("def __init__(self, parent=None):", output_stream.getvalue())
-        
-        
+
+
+    def testConvertUnsorted(self):
+        import convert_api_to_pypredef
+        lines = [
+            "PyQt4.QtGui.QWidget.show?4(self)",
+            "PyQt4.QtCore.QObject.disconnect?4(QObject, SIGNAL(), QObject, SLOT()) -> object",
+            "PyQt4.QtGui.QWidget.hide?4(self)",
+        ]
+        cancel_monitor = convert_api_to_pypredef.CancelMonitor()
+        output_stream = StringIO()
+        Convert('test_passed_lines', 2, cancel_monitor, lines, output_stream=output_stream)
+        contents = output_stream.getvalue()
+        self.assertEqual(2, contents.count('Automatically generated file'))
+        self.assert_(contents.find('def disconnect') < contents.find('def hide') < contents.find('def show'))
+
+
         
 #        api_file = r'C:\Documents and Settings\Fabio\Desktop\pydev_temp\PyQt4.api'
 #        parts_for_module = 2
@@ -46,11 +46,15 @@ class _StartsWithFilter:
 #=======================================================================================================================
 class Completer:
     
-    def __init__(self, namespace=None, global_namespace=None):
+    def __init__(self, namespace=None, global_namespace=None, namespace_version=None):
         """Create a new completer for the command line.
 
         Completer([namespace,global_namespace]) -> completer instance.
 
+        If a namespace_version is given, the completions are cached until it
+        changes (the caller must change it whenever the namespace may have
+        changed).
+
         If unspecified, the default namespace where completions are performed
         is __main__ (technically, __main__.__dict__). Namespaces should be
         given as dictionaries.
@@ -80,6 +84,10 @@ class Completer:
         else:
             self.global_namespace = global_namespace
 
+        if not hasattr(_pydev_imports_tipper, 'member_tables'):
+            namespace_version = None  # i.e.: Jython
+        self.namespace_version = namespace_version
+
     def complete(self, text):
         """Return the next possible completion for 'text'.
 
@@ -109,13 +117,26 @@ class Completer:
         def get_item(obj, attr):
             return obj[attr]
         
-        a = {}
-        
-        for dict_with_comps in [__builtin__.__dict__, self.namespace, self.global_namespace]: #@UndefinedVariable
-            a.update(dict_with_comps)
+        def create_dict_with_comps():
+            a = {}
+            
+            for dict_with_comps in [__builtin__.__dict__, self.namespace, self.global_namespace]: #@UndefinedVariable
+                a.update(dict_with_comps)
+            return a
             
         filter = _StartsWithFilter(text)
+        
+        if self.namespace_version is not None:
+            def create_table():
+                a = create_dict_with_comps()
+                return _pydev_imports_tipper.MemberTable(
+                    self.namespace, self.namespace_version, a, list(a.keys()), get_item)
+            
+            table = _pydev_imports_tipper.member_tables.get_table(
+                self.namespace, self.namespace_version, create_table)
+            return table.get_completions(filter)
             
+        a = create_dict_with_comps()
         return dir2(a, a.keys(), get_item, filter)
 
     def attr_matches(self, text):
@@ -150,6 +171,10 @@ class Completer:
 
         filter = _StartsWithFilter(attr)
 
+        if self.namespace_version is not None:
+            table = _pydev_imports_tipper.member_tables.get_table(obj, self.namespace_version)
+            return table.get_completions(filter)
+
         words = dir2(obj, filter=filter)
 
         return words
@@ -131,7 +131,12 @@ def generate_tip(data, log=None):
 
     f, mod, parent, foundAs = Find(data, log)
     #print_ >> open('temp.txt', 'w'), f
-    tips = generate_imports_tip_for_module(mod)
+    table = member_tables.get_table(mod)
+    if table is not None:
+        # Modules and classes are served from the member tables cache.
+        tips = table.get_completions()
+    else:
+        tips = generate_imports_tip_for_module(mod)
     return f, tips
 
 
@@ -140,6 +145,127 @@ def check_char(c):
         return '_'
     return c
 
+def get_dir_comps(obj_to_complete):
+    '''
+        @return: list with the names which may be completed for the given object.
+    '''
+    dirComps = dir(obj_to_complete)
+    if hasattr(obj_to_complete, '__dict__'):
+        dirComps.append('__dict__')
+    if hasattr(obj_to_complete, '__class__'):
+        dirComps.append('__class__')
+    return dirComps
+
+
+#=======================================================================================================================
+# MemberTable
+#=======================================================================================================================
+class MemberTable:
+    '''
+        The names which may be completed for an object and the completion of each name already introspected (the
+        docs and arguments of a name are only gotten when it matches the text being completed).
+    '''
+
+    def __init__(self, obj, version, obj_to_complete, names, getattr=getattr):
+        self.obj = obj  # Kept alive so that its id isn't reused while it's in the cache.
+        self.version = version
+        self.obj_to_complete = obj_to_complete
+        self.names = names
+        self.getattr = getattr
+        self.completions = {}  # (name, get_complete_info) -> completion tuple
+
+    def get_completions(self, filter=lambda name:True):
+        matching = [d for d in self.names if d is not None and filter(d)]
+
+        # We don't want to let our users wait forever (see: generate_imports_tip_for_module).
+        get_complete_info = len(matching) <= 1000
+
+        completions = self.completions
+        ret = []
+        for d in matching:
+            key = (d, get_complete_info)
+            try:
+                completion = completions[key]
+            except KeyError:
+                completion = completions[key] = get_completion(self.obj_to_complete, d, self.getattr, get_complete_info)
+            ret.append(completion)
+        return ret
+
+
+def get_object_version(obj):
+    '''
+        @return: the version of the members of a module or class (the mtime of the module file and the number of
+            entries in its __dict__) or None if the object isn't a module nor a class.
+    '''
+    if inspect.ismodule(obj):
+        module = obj
+    elif inspect.isclass(obj):
+        module = sys.modules.get(getattr(obj, '__module__', None))
+    else:
+        return None
+
+    try:
+        size = len(obj.__dict__)
+    except:
+        return None
+
+    mtime = None
+    filename = getattr(module, '__file__', None)
+    if filename:
+        try:
+            mtime = os.path.getmtime(filename)
+        except:
+            pass
+    return mtime, size
+
+
+#=======================================================================================================================
+# MemberTablesCache
+#=======================================================================================================================
+class MemberTablesCache:
+    '''
+        Keeps the member tables of the latest objects completed (keyed by the object id, its type, the version given by
+        the caller and the version from get_object_version).
+
+        The caller version (i.e.: the console namespace version, which changes whenever code is executed) is needed to
+        notice changes which don't change the object version (such as rebinding an attribute). Without it, only modules
+        and classes are cached (by the completion server, where they're only changed by reloading the module).
+    '''
+
+    MAX_ENTRIES = 50
+
+    def __init__(self):
+        self._tables = {}
+
+    def get_table(self, obj, version=None, create_table=None):
+        '''
+            @param create_table: callable which creates the MemberTable (if not given, the names are gotten with
+                get_dir_comps(obj)).
+            @return: the MemberTable for the object or None if it can't be cached.
+        '''
+        object_version = get_object_version(obj)
+        if version is None and object_version is None:
+            return None
+
+        key = (id(obj), type(obj), version, object_version)
+        table = self._tables.get(key)
+        if table is None or table.obj is not obj:
+            if len(self._tables) >= self.MAX_ENTRIES:
+                self._tables.clear()
+            if create_table is None:
+                table = MemberTable(obj, (version, object_version), obj, get_dir_comps(obj))
+            else:
+                table = create_table()
+            self._tables[key] = table
+        return table
+
+    def clear(self):
+        self._tables.clear()
+
+
+member_tables = MemberTablesCache()
+
+
 def generate_imports_tip_for_module(obj_to_complete, dirComps=None, getattr=getattr, filter=lambda name:True):
     '''
         @param obj_to_complete: the object from where we should get the completions
@@ -152,11 +278,7 @@ def generate_imports_tip_for_module(obj_to_complete, dirComps=None, getattr=geta
     ret = []
 
     if dirComps is None:
-        dirComps = dir(obj_to_complete)
-        if hasattr(obj_to_complete, '__dict__'):
-            dirComps.append('__dict__')
-        if hasattr(obj_to_complete, '__class__'):
-            dirComps.append('__class__')
+        dirComps = get_dir_comps(obj_to_complete)
 
     getCompleteInfo = True
 
@@ -166,7 +288,6 @@ def generate_imports_tip_for_module(obj_to_complete, dirComps=None, getattr=geta
 
         getCompleteInfo = False
 
-    dontGetDocsOn = (float, int, str, tuple, list)
     for d in dirComps:
 
         if d is None:
@@ -175,90 +296,101 @@ def generate_imports_tip_for_module(obj_to_complete, dirComps=None, getattr=geta
         if not filter(d):
             continue
 
-        args = ''
+        ret.append(get_completion(obj_to_complete, d, getattr, getCompleteInfo))
+
+    return ret
+
 
+_DONT_GET_DOCS_ON = (float, int, str, tuple, list)
+
+
+def get_completion(obj_to_complete, d, getattr=getattr, getCompleteInfo=True):
+    '''
+        @param d: the name to be completed in obj_to_complete.
+        @param getCompleteInfo: if False, the docs and arguments aren't gotten (only the type).
+        @return: tuple with name, doc, args, type (from the TYPE_* constants)
+    '''
+    args = ''
+
+    try:
         try:
-            try:
-                obj = getattr(obj_to_complete.__class__, d)
-            except:
-                obj = getattr(obj_to_complete, d)
-        except: #just ignore and get it without additional info
-            ret.append((d, '', args, TYPE_BUILTIN))
-        else:
+            obj = getattr(obj_to_complete.__class__, d)
+        except:
+            obj = getattr(obj_to_complete, d)
+    except: #just ignore and get it without additional info
+        return (d, '', args, TYPE_BUILTIN)
 
-            if getCompleteInfo:
-                try:
-                    retType = TYPE_BUILTIN
+    if getCompleteInfo:
+        try:
+            retType = TYPE_BUILTIN
 
-                    #check if we have to get docs
-                    getDoc = True
-                    for class_ in dontGetDocsOn:
+            #check if we have to get docs
+            getDoc = True
+            for class_ in _DONT_GET_DOCS_ON:
 
-                        if isinstance(obj, class_):
-                            getDoc = False
-                            break
+                if isinstance(obj, class_):
+                    getDoc = False
+                    break
 
+            doc = ''
+            if getDoc:
+                #no need to get this info... too many constants are defined and
+                #makes things much slower (passing all that through sockets takes quite some time)
+                try:
+                    doc = inspect.getdoc(obj)
+                    if doc is None:
+                        doc = ''
+                except: #may happen on jython when checking java classes (so, just ignore it)
                     doc = ''
-                    if getDoc:
-                        #no need to get this info... too many constants are defined and
-                        #makes things much slower (passing all that through sockets takes quite some time)
-                        try:
-                            doc = inspect.getdoc(obj)
-                            if doc is None:
-                                doc = ''
-                        except: #may happen on jython when checking java classes (so, just ignore it)
-                            doc = ''
-
-
-                    if inspect.ismethod(obj) or inspect.isbuiltin(obj) or inspect.isfunction(obj) or inspect.isroutine(obj):
-                        try:
-                            args, vargs, kwargs, defaults = inspect.getargspec(obj)
-
-                            r = ''
-                            for a in (args):
-                                if len(r) > 0:
-                                    r = r + ', '
-                                r = r + str(a)
-                            args = '(%s)' % (r)
-                        except TypeError:
-                            #ok, let's see if we can get the arguments from the doc
-                            args, doc = signature_from_docstring(doc, getattr(obj, '__name__', None))
-
-                        retType = TYPE_FUNCTION
-
-                    elif inspect.isclass(obj):
-                        retType = TYPE_CLASS
-
-                    elif inspect.ismodule(obj):
-                        retType = TYPE_IMPORT
 
-                    else:
-                        retType = TYPE_ATTR
 
+            if inspect.ismethod(obj) or inspect.isbuiltin(obj) or inspect.isfunction(obj) or inspect.isroutine(obj):
+                try:
+                    args, vargs, kwargs, defaults = inspect.getargspec(obj)
+
+                    r = ''
+                    for a in (args):
+                        if len(r) > 0:
+                            r = r + ', '
+                        r = r + str(a)
+                    args = '(%s)' % (r)
+                except TypeError:
+                    #ok, let's see if we can get the arguments from the doc
+                    args, doc = signature_from_docstring(doc, getattr(obj, '__name__', None))
 
-                    #add token and doc to return - assure only strings.
-                    ret.append((d, doc, args, retType))
+                retType = TYPE_FUNCTION
 
-                except: #just ignore and get it without aditional info
-                    ret.append((d, '', args, TYPE_BUILTIN))
+            elif inspect.isclass(obj):
+                retType = TYPE_CLASS
 
-            else: #getCompleteInfo == False
-                if inspect.ismethod(obj) or inspect.isbuiltin(obj) or inspect.isfunction(obj) or inspect.isroutine(obj):
-                    retType = TYPE_FUNCTION
+            elif inspect.ismodule(obj):
+                retType = TYPE_IMPORT
 
-                elif inspect.isclass(obj):
-                    retType = TYPE_CLASS
+            else:
+                retType = TYPE_ATTR
 
-                elif inspect.ismodule(obj):
-                    retType = TYPE_IMPORT
 
-                else:
-                    retType = TYPE_ATTR
-                #ok, no complete info, let's try to do this as fast and clean as possible
-                #so, no docs for this kind of information, only the signatures
-                ret.append((d, '', str(args), retType))
+            #add token and doc to return - assure only strings.
+            return (d, doc, args, retType)
 
-    return ret
+        except: #just ignore and get it without aditional info
+            return (d, '', args, TYPE_BUILTIN)
+
+    else: #getCompleteInfo == False
+        if inspect.ismethod(obj) or inspect.isbuiltin(obj) or inspect.isfunction(obj) or inspect.isroutine(obj):
+            retType = TYPE_FUNCTION
+
+        elif inspect.isclass(obj):
+            retType = TYPE_CLASS
+
+        elif inspect.ismodule(obj):
+            retType = TYPE_IMPORT
+
+        else:
+            retType = TYPE_ATTR
+        #ok, no complete info, let's try to do this as fast and clean as possible
+        #so, no docs for this kind of information, only the signatures
+        return (d, '', str(args), retType)
 
 
 def signature_from_docstring(doc, obj_name):
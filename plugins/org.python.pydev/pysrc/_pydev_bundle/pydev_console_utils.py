@@ -173,6 +173,22 @@ class CodeFragment:
             self.is_single_line = False
 
 
+# =======================================================================================================================
+# ExecQueue
+# =======================================================================================================================
+class ExecQueue(_queue.Queue):
+    """
+    The queue with the commands to be executed in the main thread: adding a command wakes up the GUI event loop
+    run by the inputhook (if any) so that it returns control right away.
+    """
+
+    def put(self, item, block=True, timeout=None):
+        _queue.Queue.put(self, item, block, timeout)
+        inputhook = sys.modules.get('pydev_ipython.inputhook')
+        if inputhook is not None:
+            inputhook.wakeup()
+
+
 # =======================================================================================================================
 # BaseInterpreterInterface
 # =======================================================================================================================
@@ -180,8 +196,9 @@ class BaseInterpreterInterface:
     def __init__(self, mainThread):
         self.mainThread = mainThread
         self.interruptable = False
-        self.exec_queue = _queue.Queue(0)
+        self.exec_queue = ExecQueue(0)
         self.buffer = None
+        self.namespace_version = 0  # Changed whenever the namespace may have changed (used to cache completions).
 
     def need_more_for_code(self, source):
         # PyDev-502: PyDev 3.9 F2 doesn't support backslash continuations
@@ -229,6 +246,14 @@ class BaseInterpreterInterface:
             return DebugConsoleStdIn(dbg=debugger, original_stdin=original_std_in)
 
     def add_exec(self, code_fragment, debugger=None):
+        return self.add_exec_fragments([code_fragment], debugger)
+
+    def add_exec_fragments(self, code_fragments, debugger=None):
+        '''
+        Executes the given code fragments (with a single setup of stdin, help and tracing for all of them).
+
+        @return: more (for the last fragment).
+        '''
         original_in = sys.stdin
         try:
             help = None
@@ -269,7 +294,11 @@ class BaseInterpreterInterface:
                         import pydevd_tracing
                         pydevd_tracing.SetTrace(self.debugger.trace_dispatch)
 
-                    more = self.do_add_exec(code_fragment)
+                    try:
+                        for code_fragment in code_fragments:
+                            more = self.do_add_exec(code_fragment)
+                    finally:
+                        self.namespace_version += 1
 
                     if hasattr(self, 'debugger'):
                         import pydevd_tracing
@@ -380,6 +409,22 @@ class BaseInterpreterInterface:
         else:
             return self.do_exec_code(lines, False)
 
+    def execBatch(self, fragments):
+        '''
+        Executes many code fragments (each one must be a complete statement, i.e.: a notebook cell) with a single
+        request (and a single setup/teardown of the console to execute all of them).
+        '''
+        try:
+            if IS_JYTHON:
+                for lines in fragments:
+                    self.execMultipleLines(lines)
+            else:
+                self.exec_queue.put([CodeFragment(lines, False) for lines in fragments])
+            return True
+        except:
+            traceback.print_exc()
+            return False
+
     def interrupt(self):
         self.buffer = None  # Also clear the buffer when it's interrupted.
         try:
@@ -492,6 +537,7 @@ class BaseInterpreterInterface:
     def changeVariable(self, attr, value):
         def do_change_variable():
             Exec('%s=%s' % (attr, value), self.get_namespace(), self.get_namespace())
+            self.namespace_version += 1
 
         # Important: it has to be really enabled in the main thread, so, schedule
         # it to run in the main thread.
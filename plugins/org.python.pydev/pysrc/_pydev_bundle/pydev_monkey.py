@@ -22,6 +22,21 @@ def log_error_once(msg):
 pydev_src_dir = os.path.dirname(os.path.dirname(__file__))
 
 def _get_python_c_args(host, port, indC, args):
+    from pydevd import SetupHolder
+    setup = SetupHolder.setup
+    if setup is not None and setup.get('lazy-attach'):
+        from _pydevd_bundle.pydevd_comm import get_global_debugger
+        from _pydevd_bundle.pydevd_lazy_attach import get_lazy_attach_info
+        return ("import sys; sys.path.append(r'%s'); import pydevd; "
+                "pydevd.settrace_lazy(host='%s', port=%s, lazy_attach_info=%r); "
+                "%s"
+                ) % (
+                   pydev_src_dir,
+                   host,
+                   port,
+                   get_lazy_attach_info(get_global_debugger()),
+                   args[indC + 1])
+
     return ("import sys; sys.path.append(r'%s'); import pydevd; "
             "pydevd.settrace(host='%s', port=%s, suspend=False, trace_only_current_thread=False, patch_multiprocessing=True); "
             "%s"
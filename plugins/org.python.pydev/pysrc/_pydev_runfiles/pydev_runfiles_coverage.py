@@ -74,3 +74,295 @@ def start_coverage_support_from_params(coverage_output_dir, coverage_output_file
                 
     return coverage_files, coverage_instance
 
+
+
+#=======================================================================================================================
+# Parallel combine/report
+#
+# When many jobs are used, each one generates its own coverage file and combining/reporting them serially through
+# coverage.cmdline may take longer than the tests themselves. The functions below merge the data files in a tree
+# reduction (pairs of files are merged in parallel until only one remains) and analyze the files to be reported in a
+# process pool (the results are cached based on the file mtime/size, the lines executed in it and the coverage
+# version/configuration, so, files whose coverage didn't change don't need to be analyzed again).
+#=======================================================================================================================
+REPORT_CACHE_FILE = '.pydev_coverage_report_cache'
+
+
+def _get_coverage_version():
+    import coverage  #@UnresolvedImport
+    # Note: version_info is only available from coverage 4 onwards.
+    return getattr(coverage, 'version_info', (0,))
+
+
+def _has_path_aliases():
+    import coverage  #@UnresolvedImport
+    config = getattr(coverage.coverage(), 'config', None)
+    return bool(getattr(config, 'paths', None))
+
+
+def can_combine_in_parallel():
+    '''
+    :return bool: whether combine_coverage_files_in_parallel() may be used (it needs coverage 4 onwards, where the
+        data files can be merged with CoverageData.update, and doesn't do the remapping configured in [paths], so,
+        'coverage combine' must be used in that case).
+    '''
+    try:
+        return _get_coverage_version() >= (4,) and not _has_path_aliases()
+    except:
+        return False
+
+
+def can_report_in_parallel():
+    '''
+    :return bool: whether create_coverage_report() may be used (it needs coverage 4 onwards).
+    '''
+    try:
+        return _get_coverage_version() >= (4,)
+    except:
+        return False
+
+
+def _read_coverage_data(filename):
+    from coverage import CoverageData  #@UnresolvedImport
+    if hasattr(CoverageData, 'read_file'):
+        # coverage 4.x
+        data = CoverageData()
+        data.read_file(filename)
+    else:
+        data = CoverageData(basename=filename)
+        data.read()
+    return data
+
+
+def _write_coverage_data(data, filename):
+    if hasattr(data, 'write_file'):
+        # coverage 4.x
+        data.write_file(filename)
+    else:
+        data.write()
+
+
+def _merge_coverage_files(target_and_source):
+    target, source = target_and_source
+    data = _read_coverage_data(target)
+    data.update(_read_coverage_data(source))
+    _write_coverage_data(data, target)
+    os.remove(source)
+    return target
+
+
+def _analyze_files(data_file_and_filenames):
+    data_file, filenames = data_file_and_filenames
+    import coverage  #@UnresolvedImport
+    cov = coverage.coverage(data_file=data_file)
+    cov.load()
+    ret = []
+    for filename in filenames:
+        try:
+            _filename, statements, _excluded, missing, missing_formatted = cov.analysis2(filename)
+            ret.append((filename, (len(statements), len(missing), missing_formatted, None)))
+        except Exception:
+            exc = sys.exc_info()[1]
+            ret.append((filename, (0, 0, '', '%s: %s' % (exc.__class__.__name__, exc))))
+    return ret
+
+
+def _create_pool(jobs):
+    if jobs <= 1:
+        return None
+    try:
+        import multiprocessing
+        return multiprocessing.Pool(jobs)
+    except:
+        # i.e.: Jython or no support for processes in this platform: do it serially.
+        return None
+
+
+def _map(pool, func, iterable):
+    if pool is None:
+        return [func(x) for x in iterable]
+    return pool.map(func, iterable)
+
+
+def combine_coverage_files_in_parallel(data_files, output_file, jobs):
+    '''
+    Merges the given coverage data files into output_file (the data files are removed afterwards).
+    '''
+    data_files = list(data_files)
+    if not data_files:
+        return
+
+    pool = _create_pool(jobs)
+    try:
+        while len(data_files) > 1:
+            pairs = [(data_files[i], data_files[i + 1]) for i in range(0, len(data_files) - 1, 2)]
+            merged = _map(pool, _merge_coverage_files, pairs)
+            if len(data_files) % 2:
+                merged.append(data_files[-1])
+            data_files = merged
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    os.rename(data_files[0], output_file)
+
+
+def get_parallel_data_files(coverage_output_dir, output_file):
+    output_file = os.path.abspath(output_file)
+    ret = []
+    for name in sorted(os.listdir(coverage_output_dir)):
+        f = os.path.abspath(os.path.join(coverage_output_dir, name))
+        if name.startswith('.coverage.') and f != output_file and os.path.isfile(f):
+            ret.append(f)
+    return ret
+
+
+def _load_report_cache(cache_file):
+    try:
+        import cPickle as pickle
+    except ImportError:
+        import pickle
+    try:
+        stream = open(cache_file, 'rb')
+        try:
+            return pickle.load(stream)
+        finally:
+            stream.close()
+    except:
+        return {}
+
+
+def _save_report_cache(cache_file, cache):
+    try:
+        import cPickle as pickle
+    except ImportError:
+        import pickle
+    try:
+        stream = open(cache_file, 'wb')
+        try:
+            pickle.dump(cache, stream, 2)
+        finally:
+            stream.close()
+    except:
+        pass  # Not having the cache is not fatal.
+
+
+def _get_report_config_key():
+    '''
+    :return tuple: the coverage version and the configuration which changes the analysis (the exclusion rules and
+        the contents of the config files read).
+    '''
+    import hashlib
+    import coverage  #@UnresolvedImport
+    config = coverage.coverage().config
+    key = [getattr(coverage, '__version__', None)]
+    for name in ('exclude_list', 'partial_list', 'partial_always_list'):
+        key.append(tuple(getattr(config, name, None) or ()))
+
+    # Note: config_files_read is only available from coverage 5 onwards (config_files in coverage 4).
+    config_files = getattr(config, 'config_files_read', None) or getattr(config, 'config_files', None) or ()
+    for config_file in config_files:
+        try:
+            stream = open(config_file, 'rb')
+            try:
+                key.append((config_file, hashlib.md5(stream.read()).hexdigest()))
+            finally:
+                stream.close()
+        except (IOError, OSError):
+            key.append((config_file, None))
+    return tuple(key)
+
+
+def _get_report_cache_key(data, filename, config_key):
+    try:
+        stat = os.stat(filename)
+        mtime, size = stat.st_mtime, stat.st_size
+    except OSError:
+        mtime, size = -1, -1
+    lines = data.lines(filename) or ()
+    return (mtime, size, len(lines), hash(tuple(sorted(lines))), config_key)
+
+
+def create_coverage_report(filenames, data_file, jobs, cache_file=REPORT_CACHE_FILE):
+    '''
+    :return list(tuple(str, tuple(int, int, str, str))):
+        A list with (filename, (statements, missing, missing_formatted, error)) for each file.
+    '''
+    data = _read_coverage_data(data_file)
+    cache = {}
+    if cache_file:
+        cache = _load_report_cache(cache_file)
+
+    results = {}
+    keys = {}
+    to_analyze = []
+    config_key = _get_report_config_key()
+    for filename in filenames:
+        key = keys[filename] = _get_report_cache_key(data, filename, config_key)
+        cached = cache.get(filename)
+        if cached is not None and cached[0] == key:
+            results[filename] = cached[1]
+        else:
+            to_analyze.append(filename)
+
+    if to_analyze:
+        n_chunks = max(1, min(len(to_analyze), jobs * 4))
+        chunks = [(data_file, to_analyze[i::n_chunks]) for i in range(n_chunks)]
+        pool = _create_pool(min(jobs, n_chunks))
+        try:
+            for analyzed in _map(pool, _analyze_files, chunks):
+                for filename, result in analyzed:
+                    results[filename] = result
+                    if result[3] is None:
+                        cache[filename] = (keys[filename], result)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        if cache_file:
+            _save_report_cache(cache_file, cache)
+
+    return [(filename, results[filename]) for filename in filenames]
+
+
+def write_coverage_report(report, stream):
+    '''
+    Writes the report in the format of 'coverage report -m' from coverage 3.x (which is the format parsed in
+    PyCoverage.analyzeReadLine): the files are written without their extension.
+    '''
+    report = [(os.path.splitext(filename)[0], result) for filename, result in report]
+    name_len = max([len('Name')] + [len(filename) for filename, _result in report])
+    header = '%s   Stmts   Miss  Cover   Missing' % ('Name'.ljust(name_len),)
+    stream.write(header + '\n')
+    stream.write('-' * len(header) + '\n')
+
+    total_statements = 0
+    total_missing = 0
+    for filename, (statements, missing, missing_formatted, error) in report:
+        if error is not None:
+            stream.write('%s %s\n' % (filename, error))
+            continue
+        total_statements += statements
+        total_missing += missing
+        stream.write('%s %7d %6d %5s   %s\n' % (
+            filename.ljust(name_len), statements, missing, _get_percent(statements, missing), missing_formatted))
+
+    stream.write('-' * len(header) + '\n')
+    stream.write('%s %7d %6d %5s\n' % (
+        'TOTAL'.ljust(name_len), total_statements, total_missing, _get_percent(total_statements, total_missing)))
+
+
+def _get_percent(statements, missing):
+    if statements == 0:
+        return '100%'
+    percent = 100.0 * (statements - missing) / statements
+    # Like coverage: only show 0% or 100% when nothing or everything is covered.
+    if 0 < percent < 1:
+        percent = 1
+    elif 99 < percent < 100:
+        percent = 99
+    return '%d%%' % (int(round(percent)),)
@@ -62,20 +62,44 @@ def get_exception_name(exctype):
     return exctype.__name__
 
 
-def get_exception_breakpoint(exctype, exceptions):
+# (exceptions dict, dict(exctype -> ExceptionBreakpoint or None)): the breakpoint resolved for each exception type.
+# The dicts with the exception breakpoints are never changed in-place (a new dict is set in the debugger whenever an
+# exception breakpoint is added or removed), so, the cache is rebuilt when a different dict is received.
+_exception_breakpoint_resolution = (None, {})
+
+
+def _resolve_exception_breakpoint(exctype, exceptions):
     exception_full_qname = get_exception_full_qname(exctype)
 
     exc = None
-    if exceptions is not None:
-        try:
-            return exceptions[exception_full_qname]
-        except KeyError:
-            for exception_breakpoint in dict_iter_values(exceptions):
-                if exception_breakpoint.type is not None and issubclass(exctype, exception_breakpoint.type):
-                    if exc is None or issubclass(exception_breakpoint.type, exc.type):
-                        exc = exception_breakpoint
+    try:
+        return exceptions[exception_full_qname]
+    except KeyError:
+        for exception_breakpoint in dict_iter_values(exceptions):
+            if exception_breakpoint.type is not None and issubclass(exctype, exception_breakpoint.type):
+                if exc is None or issubclass(exception_breakpoint.type, exc.type):
+                    exc = exception_breakpoint
     return exc
 
+
+def get_exception_breakpoint(exctype, exceptions):
+    global _exception_breakpoint_resolution
+    if exceptions is None:
+        return None
+
+    resolution = _exception_breakpoint_resolution
+    if resolution[0] is not exceptions:
+        resolution = _exception_breakpoint_resolution = (exceptions, {})
+
+    resolved = resolution[1]
+    try:
+        return resolved[exctype]
+    except KeyError:
+        exc = resolved[exctype] = _resolve_exception_breakpoint(exctype, exceptions)
+        return exc
+    except TypeError:  # i.e.: not hashable
+        return _resolve_exception_breakpoint(exctype, exceptions)
+
 #=======================================================================================================================
 # _excepthook
 #=======================================================================================================================
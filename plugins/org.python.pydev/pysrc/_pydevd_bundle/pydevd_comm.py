@@ -72,7 +72,6 @@ try:
     from urllib import quote_plus, unquote, unquote_plus
 except:
     from urllib.parse import quote_plus, unquote, unquote_plus  #@Reimport @UnresolvedImport
-import pydevconsole
 from _pydevd_bundle import pydevd_vars
 import pydevd_tracing
 from _pydevd_bundle import pydevd_xml
@@ -82,10 +81,8 @@ import sys
 import traceback
 from _pydevd_bundle.pydevd_utils import quote_smart as quote, compare_object_attrs, cmp_to_key, to_string
 from _pydev_bundle import pydev_log
-from _pydev_bundle import _pydev_completer
 
 from pydevd_tracing import get_exception_traceback_str
-from _pydevd_bundle import pydevd_console
 from _pydev_bundle.pydev_monkey import disable_trace_thread_modules, enable_trace_thread_modules
 from _pydev_bundle.pydev_is_thread_alive import is_thread_alive
 
@@ -145,6 +142,7 @@ CMD_INPUT_REQUESTED = 147
 CMD_GET_DESCRIPTION = 148
 
 CMD_PROCESS_CREATED = 149
+CMD_EVALUATE_EXPRESSIONS = 150
 
 CMD_VERSION = 501
 CMD_RETURN = 502
@@ -202,13 +200,14 @@ ID_TO_MEANING = {
     '148': 'CMD_GET_DESCRIPTION',
 
     '149': 'CMD_PROCESS_CREATED',
+    '150': 'CMD_EVALUATE_EXPRESSIONS',
 
     '501': 'CMD_VERSION',
     '502': 'CMD_RETURN',
     '901': 'CMD_ERROR',
     }
 
-MAX_IO_MSG_SIZE = 1000  #if the io is too big, we'll not send all (could make the debugger too non-responsive)
+MAX_IO_MSG_SIZE = 1000  #if the io is too big, it's split in many messages (a big one could make the debugger too non-responsive)
 #this number can be changed if there's need to do so
 
 VERSION_STRING = "@@BUILD_NUMBER@@"
@@ -393,6 +392,11 @@ class ReaderThread(PyDBDaemonThread):
     def process_command(self, cmd_id, seq, text):
         self.process_net_command(self.global_debugger_holder.global_dbg, cmd_id, seq, text)
 
+        # If some GUI inputhook is blocked waiting for events, wake it up so that the command is handled.
+        inputhook = sys.modules.get('pydev_ipython.inputhook')
+        if inputhook is not None:
+            inputhook.wakeup()
+
 
 #----------------------------------------------------------------------------------- SOCKET UTILITIES - WRITER
 #=======================================================================================================================
@@ -559,8 +563,28 @@ class NetCommand:
             seq = NetCommand.next_seq
         self.seq = seq
         self.text = text
-        encoded = quote(to_string(text), '/<>_=" \t')
-        self.outgoing = '%s\t%s\t%s\n' % (id, seq, encoded)
+        self.outgoing = pydevd_xml.make_net_command_line(id, seq, text)
+
+def _split_io_message(v, max_size):
+    '''
+    :return list(str): v split in chunks with at most max_size chars (when v is a bytes str, an utf-8 sequence isn't
+        split among chunks).
+    '''
+    len_v = len(v)
+    if len_v <= max_size:
+        return [v]
+
+    chunks = []
+    i = 0
+    while i < len_v:
+        end = i + max_size
+        if end < len_v and not IS_PY3K and isinstance(v, str):
+            while end > i + 1 and (ord(v[end]) & 0xC0) == 0x80:  # utf-8 continuation byte
+                end -= 1
+        chunks.append(v[i:end])
+        i = end
+    return chunks
+
 
 #=======================================================================================================================
 # NetCommandFactory
@@ -613,25 +637,25 @@ class NetCommandFactory:
 
     def make_io_message(self, v, ctx, dbg=None):
         '''
-        @param v: the message to pass to the debug server
+        @param v: the message to pass to the debug server (if bigger than MAX_IO_MSG_SIZE it's split in many
+            messages -- all are added to the writer and the last one is returned).
         @param ctx: 1 for stdio 2 for stderr
         @param dbg: If not none, add to the writer
         '''
 
         try:
-            if len(v) > MAX_IO_MSG_SIZE:
-                v = v[0:MAX_IO_MSG_SIZE]
-                v += '...'
-
-            v = pydevd_xml.make_valid_xml_value(quote(v, '/>_= \t'))
-            net = NetCommand(str(CMD_WRITE_TO_CONSOLE), 0, '<xml><io s="%s" ctx="%s"/></xml>' % (v, ctx))
+            nets = []
+            for chunk in _split_io_message(v, MAX_IO_MSG_SIZE):
+                chunk = pydevd_xml.make_valid_xml_value(quote(chunk, '/>_= \t'))
+                nets.append(NetCommand(str(CMD_WRITE_TO_CONSOLE), 0, '<xml><io s="%s" ctx="%s"/></xml>' % (chunk, ctx)))
         except:
-            net = self.make_error_message(0, get_exception_traceback_str())
+            nets = [self.make_error_message(0, get_exception_traceback_str())]
 
         if dbg:
-            dbg.writer.add_command(net)
+            for net in nets:
+                dbg.writer.add_command(net)
 
-        return net
+        return nets[-1]
 
     def make_version_message(self, seq):
         try:
@@ -646,66 +670,7 @@ class NetCommandFactory:
             return self.make_error_message(0, get_exception_traceback_str())
 
     def make_thread_suspend_str(self, thread_id, frame, stop_reason, message):
-        """ <xml>
-            <thread id="id" stop_reason="reason">
-                    <frame id="id" name="functionName " file="file" line="line">
-                    <var variable stuffff....
-                </frame>
-            </thread>
-        """
-        cmd_text_list = ["<xml>"]
-        append = cmd_text_list.append
-        make_valid_xml_value = pydevd_xml.make_valid_xml_value
-
-        if message:
-            message = make_valid_xml_value(message)
-
-        append('<thread id="%s" stop_reason="%s" message="%s">' % (thread_id, stop_reason, message))
-
-        curr_frame = frame
-        try:
-            while curr_frame:
-                #print cmdText
-                my_id = id(curr_frame)
-                #print "id is ", my_id
-
-                if curr_frame.f_code is None:
-                    break #Iron Python sometimes does not have it!
-
-                my_name = curr_frame.f_code.co_name #method name (if in method) or ? if global
-                if my_name is None:
-                    break #Iron Python sometimes does not have it!
-
-                #print "name is ", my_name
-
-                abs_path_real_path_and_base = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(curr_frame)
-
-                myFile = pydevd_file_utils.norm_file_to_client(abs_path_real_path_and_base[0])
-                if file_system_encoding.lower() != "utf-8" and hasattr(myFile, "decode"):
-                    # myFile is a byte string encoded using the file system encoding
-                    # convert it to utf8
-                    myFile = myFile.decode(file_system_encoding).encode("utf-8")
-
-                #print "file is ", myFile
-                #myFile = inspect.getsourcefile(curr_frame) or inspect.getfile(frame)
-
-                myLine = str(curr_frame.f_lineno)
-                #print "line is ", myLine
-
-                #the variables are all gotten 'on-demand'
-                #variables = pydevd_xml.frame_vars_to_xml(curr_frame.f_locals)
-
-                variables = ''
-                append('<frame id="%s" name="%s" ' % (my_id , make_valid_xml_value(my_name)))
-                append('file="%s" line="%s">' % (quote(myFile, '/>_= \t'), myLine))
-                append(variables)
-                append("</frame>")
-                curr_frame = curr_frame.f_back
-        except :
-            traceback.print_exc()
-
-        append("</thread></xml>")
-        return ''.join(cmd_text_list)
+        return pydevd_xml.make_thread_suspend_str(thread_id, frame, stop_reason, message)
 
     def make_thread_suspend_message(self, thread_id, frame, stop_reason, message):
         try:
@@ -751,6 +716,12 @@ class NetCommandFactory:
         except Exception:
             return self.make_error_message(seq, get_exception_traceback_str())
 
+    def make_evaluate_expressions_message(self, seq, payload):
+        try:
+            return NetCommand(CMD_EVALUATE_EXPRESSIONS, seq, payload)
+        except Exception:
+            return self.make_error_message(seq, get_exception_traceback_str())
+
     def make_get_completions_message(self, seq, payload):
         try:
             return NetCommand(CMD_GET_COMPLETIONS, seq, payload)
@@ -1069,6 +1040,21 @@ class InternalChangeVariable(InternalThreadCommand):
             dbg.writer.add_command(cmd)
 
 
+def get_ipython_hidden_vars_dict():
+    '''
+    The IPython hidden variables only exist if the console was started (which sets the 'interpreter' builtin), so,
+    pydevconsole (which imports IPython) is only imported in that case.
+    '''
+    try:
+        import __builtin__
+    except ImportError:
+        import builtins as __builtin__  # @UnresolvedImport
+    if not hasattr(__builtin__, 'interpreter'):
+        return None
+    import pydevconsole
+    return pydevconsole.get_ipython_hidden_vars_dict()
+
+
 #=======================================================================================================================
 # InternalGetFrame
 #=======================================================================================================================
@@ -1084,7 +1070,7 @@ class InternalGetFrame(InternalThreadCommand):
         try:
             frame = pydevd_vars.find_frame(self.thread_id, self.frame_id)
             if frame is not None:
-                hidden_ns = pydevconsole.get_ipython_hidden_vars_dict()
+                hidden_ns = get_ipython_hidden_vars_dict()
                 xml = "<xml>"
                 xml += pydevd_xml.frame_vars_to_xml(frame.f_locals, hidden_ns)
                 del frame
@@ -1133,6 +1119,36 @@ class InternalEvaluateExpression(InternalThreadCommand):
             cmd = dbg.cmd_factory.make_error_message(self.sequence, "Error evaluating expression " + exc)
             dbg.writer.add_command(cmd)
 
+#=======================================================================================================================
+# InternalEvaluateExpressions
+#=======================================================================================================================
+class InternalEvaluateExpressions(InternalThreadCommand):
+    """ gets the values of many expressions in the same frame (i.e.: watches) in a single response """
+
+    def __init__(self, seq, thread_id, frame_id, expressions, doTrim):
+        self.sequence = seq
+        self.thread_id = thread_id
+        self.frame_id = frame_id
+        self.expressions = expressions
+        self.doTrim = doTrim
+
+    def do_it(self, dbg):
+        """ Converts request into python variables """
+        try:
+            results = pydevd_vars.evaluate_expressions(self.thread_id, self.frame_id, self.expressions)
+            xml = ["<xml>"]
+            if results is not None:
+                for expression, result in zip(self.expressions, results):
+                    xml.append(pydevd_xml.var_to_xml(result, expression, self.doTrim))
+            xml.append("</xml>")
+            cmd = dbg.cmd_factory.make_evaluate_expressions_message(self.sequence, ''.join(xml))
+            dbg.writer.add_command(cmd)
+        except:
+            exc = get_exception_traceback_str()
+            sys.stderr.write('%s\n' % (exc,))
+            cmd = dbg.cmd_factory.make_error_message(self.sequence, "Error evaluating expressions " + exc)
+            dbg.writer.add_command(cmd)
+
 #=======================================================================================================================
 # InternalGetCompletions
 #=======================================================================================================================
@@ -1154,7 +1170,7 @@ class InternalGetCompletions(InternalThreadCommand):
 
                 frame = pydevd_vars.find_frame(self.thread_id, self.frame_id)
                 if frame is not None:
-
+                    from _pydev_bundle import _pydev_completer
                     msg = _pydev_completer.generate_completions_as_xml(frame, self.act_tok)
 
                     cmd = dbg.cmd_factory.make_get_completions_message(self.sequence, msg)
@@ -1192,6 +1208,7 @@ class InternalGetDescription(InternalThreadCommand):
         """ Get completions and write back to the client
         """
         try:
+            from _pydevd_bundle import pydevd_console
             frame = pydevd_vars.find_frame(self.thread_id, self.frame_id)
             description = pydevd_console.get_description(frame, self.thread_id, self.frame_id, self.expression)
             description = pydevd_xml.make_valid_xml_value(quote(description, '/>_= \t'))
@@ -1309,6 +1326,7 @@ class InternalEvaluateConsoleExpression(InternalThreadCommand):
         </xml>
         """
         try:
+            from _pydevd_bundle import pydevd_console
             frame = pydevd_vars.find_frame(self.thread_id, self.frame_id)
             if frame is not None:
                 console_message = pydevd_console.execute_console_command(
@@ -1316,8 +1334,7 @@ class InternalEvaluateConsoleExpression(InternalThreadCommand):
 
                 cmd = dbg.cmd_factory.make_send_console_message(self.sequence, console_message.to_xml())
             else:
-                from _pydevd_bundle.pydevd_console import ConsoleMessage
-                console_message = ConsoleMessage()
+                console_message = pydevd_console.ConsoleMessage()
                 console_message.add_console_message(
                     pydevd_console.CONSOLE_ERROR,
                     "Select the valid frame in the debug view (thread: %s, frame: %s invalid)" % (self.thread_id, self.frame_id),
@@ -1374,6 +1391,7 @@ class InternalConsoleGetCompletions(InternalThreadCommand):
         """ Get completions and write back to the client
         """
         try:
+            from _pydevd_bundle import pydevd_console
             frame = pydevd_vars.find_frame(self.thread_id, self.frame_id)
             completions_xml = pydevd_console.get_completions(frame, self.act_tok)
             cmd = dbg.cmd_factory.make_send_console_message(self.sequence, completions_xml)
@@ -1403,6 +1421,7 @@ class InternalConsoleExec(InternalThreadCommand):
                 #don't trace new threads created by console command
                 disable_trace_thread_modules()
 
+                import pydevconsole
                 result = pydevconsole.console_exec(self.thread_id, self.frame_id, self.expression, dbg)
                 xml = "<xml>"
                 xml += pydevd_xml.var_to_xml(result, "")
@@ -56,7 +56,10 @@ ACCEPTED_ARG_HANDLERS = [
     ArgHandlerBool('DEBUG_RECORD_SOCKET_READS'),
     ArgHandlerBool('multiproc'), # Used by PyCharm (reuses connection: ssh tunneling)
     ArgHandlerBool('multiprocess'), # Used by PyDev (creates new connection to ide)
+    ArgHandlerBool('lazy-attach'), # With multiprocess: children only attach when a breakpoint may be hit (see: pydevd_lazy_attach)
+    ArgHandlerBool('multiprocess-relay'), # With multiprocess: children connect to a relay which shares one connection to the ide
     ArgHandlerBool('save-signatures'),
+    ArgHandlerBool('sample-signatures'), # Like save-signatures, but samples calls and sends signatures in batches
     ArgHandlerBool('save-threading'),
     ArgHandlerBool('save-asyncio'),
     ArgHandlerBool('qt-support'),
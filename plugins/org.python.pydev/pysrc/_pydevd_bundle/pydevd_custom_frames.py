@@ -15,6 +15,8 @@ class CustomFramesContainer:
 
     custom_frames = None
 
+    custom_frames_by_thread_ident = None
+
     _next_frame_id = None
 
     _py_db_command_thread_event = None
@@ -22,14 +24,19 @@ class CustomFramesContainer:
 
 def custom_frames_container_init(): #Note: no staticmethod on jython 2.1 (so, use free-function)
 
+    # Only needed to change custom_frames/custom_frames_by_thread_ident (reading them doesn't require a lock: single
+    # dict operations are atomic and iterations must be done in a copy -- see: get_custom_frames_for_thread).
     CustomFramesContainer.custom_frames_lock = thread.allocate_lock()
 
-    # custom_frames can only be accessed if properly locked with custom_frames_lock!
     # Key is a string identifying the frame (as well as the thread it belongs to).
     # Value is a CustomFrame.
     #
     CustomFramesContainer.custom_frames = {}
 
+    # Key is the ident of the thread of the custom frames (CustomFrame.thread_id).
+    # Value is a dict(frame_id -> CustomFrame) with the custom frames of that thread.
+    CustomFramesContainer.custom_frames_by_thread_ident = {}
+
     # Only to be used in this module
     CustomFramesContainer._next_frame_id = 0
 
@@ -59,6 +66,41 @@ class CustomFrame:
         # 3 = the thread id of the given frame
         self.thread_id = thread_id
 
+        # id(frame) -> frame for the frame and its parents (computed when needed).
+        self._frames_by_id = None
+
+    def get_frame_by_id(self, frame_id):
+        '''
+        :param int frame_id: the id() of the frame or of one of its parents.
+        '''
+        frames_by_id = self._frames_by_id
+        if frames_by_id is None or frame_id not in frames_by_id:
+            frames_by_id = {}
+            f = self.frame
+            while f is not None:
+                frames_by_id[id(f)] = f
+                f = f.f_back
+            self._frames_by_id = frames_by_id
+        return frames_by_id.get(frame_id)
+
+
+def _add_to_thread_index(frame_id, custom_frame):
+    # Note: called with the lock held.
+    try:
+        thread_custom_frames = CustomFramesContainer.custom_frames_by_thread_ident[custom_frame.thread_id]
+    except KeyError:
+        thread_custom_frames = CustomFramesContainer.custom_frames_by_thread_ident[custom_frame.thread_id] = {}
+    thread_custom_frames[frame_id] = custom_frame
+
+
+def _remove_from_thread_index(frame_id, custom_frame):
+    # Note: called with the lock held.
+    thread_custom_frames = CustomFramesContainer.custom_frames_by_thread_ident.get(custom_frame.thread_id)
+    if thread_custom_frames is not None:
+        dict_pop(thread_custom_frames, frame_id, None)
+        if not thread_custom_frames:
+            dict_pop(CustomFramesContainer.custom_frames_by_thread_ident, custom_frame.thread_id, None)
+
 
 def add_custom_frame(frame, name, thread_id):
     CustomFramesContainer.custom_frames_lock.acquire()
@@ -73,7 +115,9 @@ def add_custom_frame(frame, name, thread_id):
             sys.stderr.write('add_custom_frame: %s (%s) %s %s\n' % (
                 frame_id, get_abs_path_real_path_and_base_from_frame(frame)[-1], frame.f_lineno, frame.f_code.co_name))
 
-        CustomFramesContainer.custom_frames[frame_id] = CustomFrame(name, frame, thread_id)
+        custom_frame = CustomFrame(name, frame, thread_id)
+        CustomFramesContainer.custom_frames[frame_id] = custom_frame
+        _add_to_thread_index(frame_id, custom_frame)
         CustomFramesContainer._py_db_command_thread_event.set()
         return frame_id
     finally:
@@ -91,7 +135,11 @@ def update_custom_frame(frame_id, frame, thread_id, name=None):
             if name is not None:
                 old.name = name
             old.mod_time += 1
-            old.thread_id = thread_id
+            old._frames_by_id = None
+            if old.thread_id != thread_id:
+                _remove_from_thread_index(frame_id, old)
+                old.thread_id = thread_id
+                _add_to_thread_index(frame_id, old)
         except:
             sys.stderr.write('Unable to get frame to replace: %s\n' % (frame_id,))
             import traceback;traceback.print_exc()
@@ -106,18 +154,24 @@ def get_custom_frame(thread_id, frame_id):
     :param thread_id: This should actually be the frame_id which is returned by add_custom_frame.
     :param frame_id: This is the actual id() of the frame
     '''
+    return CustomFramesContainer.custom_frames[thread_id].get_frame_by_id(int(frame_id))
 
-    CustomFramesContainer.custom_frames_lock.acquire()
-    try:
-        frame_id = int(frame_id)
-        f = CustomFramesContainer.custom_frames[thread_id].frame
-        while f is not None:
-            if id(f) == frame_id:
-                return f
-            f = f.f_back
-    finally:
-        f = None
-        CustomFramesContainer.custom_frames_lock.release()
+
+def get_custom_frames_for_thread(thread_ident):
+    '''
+    :return list(tuple(str, CustomFrame)): the (frame_id, custom_frame) of the custom frames of the given thread.
+    '''
+    thread_custom_frames = CustomFramesContainer.custom_frames_by_thread_ident.get(thread_ident)
+    if not thread_custom_frames:
+        return []
+    return list(thread_custom_frames.items())
+
+
+def get_custom_frames():
+    '''
+    :return list(CustomFrame): all the custom frames.
+    '''
+    return list(CustomFramesContainer.custom_frames.values())
 
 
 def remove_custom_frame(frame_id):
@@ -125,7 +179,9 @@ def remove_custom_frame(frame_id):
     try:
         if DEBUG:
             sys.stderr.write('remove_custom_frame: %s\n' % frame_id)
-        dict_pop(CustomFramesContainer.custom_frames, frame_id, None)
+        custom_frame = dict_pop(CustomFramesContainer.custom_frames, frame_id, None)
+        if custom_frame is not None:
+            _remove_from_thread_index(frame_id, custom_frame)
         CustomFramesContainer._py_db_command_thread_event.set()
     finally:
         CustomFramesContainer.custom_frames_lock.release()
@@ -0,0 +1,1020 @@
+# Important: Autogenerated file.
+
+# DO NOT edit manually!
+# DO NOT edit manually!
+try:
+    import StringIO
+except:
+    import io as StringIO
+import traceback
+from os.path import basename
+
+try:
+    __setFalse = False
+except:
+    import __builtin__
+    setattr(__builtin__, 'True', 1)
+    setattr(__builtin__, 'False', 0)
+
+from _pydevd_bundle import pydevd_constants
+from _pydevd_bundle.pydevd_constants import dict_iter_items, dict_keys, xrange
+
+
+# Note: 300 is already a lot to see in the outline (after that the user should really use the shell to get things)
+# and this also means we'll pass less information to the client side (which makes debugging faster).
+MAX_ITEMS_TO_HANDLE = 300 
+
+TOO_LARGE_MSG = 'Too large to show contents. Max items to show: ' + str(MAX_ITEMS_TO_HANDLE)
+TOO_LARGE_ATTR = 'Unable to handle:'
+
+#=======================================================================================================================
+# UnableToResolveVariableException
+#=======================================================================================================================
+class UnableToResolveVariableException(Exception):
+    pass
+
+
+#=======================================================================================================================
+# InspectStub
+#=======================================================================================================================
+class InspectStub:
+    def isbuiltin(self, _args):
+        return False
+    def isroutine(self, object):
+        return False
+
+try:
+    import inspect
+except:
+    inspect = InspectStub()
+
+try:
+    import java.lang #@UnresolvedImport
+except:
+    pass
+
+#types does not include a MethodWrapperType
+try:
+    MethodWrapperType = type([].__str__)
+except:
+    MethodWrapperType = None
+
+
+#=======================================================================================================================
+# AbstractResolver
+#=======================================================================================================================
+class AbstractResolver:
+    '''
+        This class exists only for documentation purposes to explain how to create a resolver.
+
+        Some examples on how to resolve things:
+        - list: get_dictionary could return a dict with index->item and use the index to resolve it later
+        - set: get_dictionary could return a dict with id(object)->object and reiterate in that array to resolve it later
+        - arbitrary instance: get_dictionary could return dict with attr_name->attr and use getattr to resolve it later
+    '''
+
+    def resolve(self, var, attribute):
+        '''
+            In this method, we'll resolve some child item given the string representation of the item in the key
+            representing the previously asked dictionary.
+
+            @param var: this is the actual variable to be resolved.
+            @param attribute: this is the string representation of a key previously returned in get_dictionary.
+        '''
+        raise NotImplementedError
+
+    def get_dictionary(self, var):
+        '''
+            @param var: this is the variable that should have its children gotten.
+
+            @return: a dictionary where each pair key, value should be shown to the user as children items
+            in the variables view for the given var.
+        '''
+        raise NotImplementedError
+
+
+#=======================================================================================================================
+# DefaultResolver
+#=======================================================================================================================
+class DefaultResolver:
+    '''
+        DefaultResolver is the class that'll actually resolve how to show some variable.
+    '''
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, var, attribute):
+        return getattr(var, attribute)
+
+    def get_dictionary(self, var, names=None):
+        if MethodWrapperType:
+            return self._getPyDictionary(var, names)
+        else:
+            return self._getJyDictionary(var)
+
+    def _getJyDictionary(self, obj):
+        ret = {}
+        found = java.util.HashMap()
+
+        original = obj
+        if hasattr(obj, '__class__') and obj.__class__ == java.lang.Class:
+
+            #get info about superclasses
+            classes = []
+            classes.append(obj)
+            c = obj.getSuperclass()
+            while c != None:
+                classes.append(c)
+                c = c.getSuperclass()
+
+            #get info about interfaces
+            interfs = []
+            for obj in classes:
+                interfs.extend(obj.getInterfaces())
+            classes.extend(interfs)
+
+            #now is the time when we actually get info on the declared methods and fields
+            for obj in classes:
+
+                declaredMethods = obj.getDeclaredMethods()
+                declaredFields = obj.getDeclaredFields()
+                for i in xrange(len(declaredMethods)):
+                    name = declaredMethods[i].getName()
+                    ret[name] = declaredMethods[i].toString()
+                    found.put(name, 1)
+
+                for i in xrange(len(declaredFields)):
+                    name = declaredFields[i].getName()
+                    found.put(name, 1)
+                    #if declaredFields[i].isAccessible():
+                    declaredFields[i].setAccessible(True)
+                    #ret[name] = declaredFields[i].get( declaredFields[i] )
+                    try:
+                        ret[name] = declaredFields[i].get(original)
+                    except:
+                        ret[name] = declaredFields[i].toString()
+
+        #this simple dir does not always get all the info, that's why we have the part before
+        #(e.g.: if we do a dir on String, some methods that are from other interfaces such as
+        #charAt don't appear)
+        try:
+            d = dir(original)
+            for name in d:
+                if found.get(name) is not 1:
+                    ret[name] = getattr(original, name)
+        except:
+            #sometimes we're unable to do a dir
+            pass
+
+        return ret
+
+    def get_names(self, var):
+        names = dir(var)
+        if not names and hasattr(var, '__members__'):
+            names = var.__members__
+        return names
+
+    def _getPyDictionary(self, var, names=None):
+        # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+        cdef bint filterPrivate, filterSpecial, filterFunction, filterBuiltIn;
+        cdef dict d;
+        # ELSE
+        # ENDIF
+        filterPrivate = False
+        filterSpecial = True
+        filterFunction = True
+        filterBuiltIn = True
+
+        if not names:
+            names = self.get_names(var)
+        d = {}
+
+        #Be aware that the order in which the filters are applied attempts to
+        #optimize the operation by removing as many items as possible in the
+        #first filters, leaving fewer items for later filters
+
+        if filterBuiltIn or filterFunction:
+            for n in names:
+                if filterSpecial:
+                    if n.startswith('__') and n.endswith('__'):
+                        continue
+
+                if filterPrivate:
+                    if n.startswith('_') or n.endswith('__'):
+                        continue
+
+                try:
+                    attr = getattr(var, n)
+
+                    #filter builtins?
+                    if filterBuiltIn:
+                        if inspect.isbuiltin(attr):
+                            continue
+
+                    #filter functions?
+                    if filterFunction:
+                        if inspect.isroutine(attr) or isinstance(attr, MethodWrapperType):
+                            continue
+                except:
+                    #if some error occurs getting it, let's put it to the user.
+                    strIO = StringIO.StringIO()
+                    traceback.print_exc(file=strIO)
+                    attr = strIO.getvalue()
+
+                d[ n ] = attr
+
+        return d
+
+
+#=======================================================================================================================
+# DictResolver
+#=======================================================================================================================
+class DictResolver:
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, dict, key):
+        if key in ('__len__', TOO_LARGE_ATTR):
+            return None
+
+        if '(' not in key:
+            #we have to treat that because the dict resolver is also used to directly resolve the global and local
+            #scopes (which already have the items directly)
+            try:
+                return dict[key]
+            except:
+                return getattr(dict, key)
+
+        #ok, we have to iterate over the items to find the one that matches the id, because that's the only way
+        #to actually find the reference from the string we have before.
+        expected_id = int(key.split('(')[-1][:-1])
+        for key, val in dict_iter_items(dict):
+            if id(key) == expected_id:
+                return val
+
+        raise UnableToResolveVariableException()
+
+    def key_to_str(self, key):
+        if isinstance(key, str):
+            return '%r' % key
+        else:
+            if not pydevd_constants.IS_PY3K:
+                if isinstance(key, unicode):
+                    return "u'%s'" % key
+            return key
+
+    def get_dictionary(self, dict):
+        # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+        cdef int i;
+        # ELSE
+        # ENDIF
+        ret = {}
+
+        i = 0
+        for key, val in dict_iter_items(dict):
+            i += 1
+            #we need to add the id because otherwise we cannot find the real object to get its contents later on.
+            key = '%s (%s)' % (self.key_to_str(key), id(key))
+            ret[key] = val
+            if i > MAX_ITEMS_TO_HANDLE:
+                ret[TOO_LARGE_ATTR] = TOO_LARGE_MSG
+                break
+
+        ret['__len__'] = len(dict)
+        # in case if the class extends built-in type and has some additional fields
+        additional_fields = defaultResolver.get_dictionary(dict)
+        ret.update(additional_fields)
+        return ret
+
+
+#=======================================================================================================================
+# TupleResolver
+#=======================================================================================================================
+class TupleResolver: #to enumerate tuples and lists
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, var, attribute):
+        '''
+            @param var: that's the original attribute
+            @param attribute: that's the key passed in the dict (as a string)
+        '''
+        if attribute in ('__len__', TOO_LARGE_ATTR):
+            return None
+        try:
+            return var[int(attribute)]
+        except:
+            return getattr(var, attribute)
+
+    def get_dictionary(self, var):
+        # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+        cdef dict d;
+        cdef int i;
+        # ELSE
+        # ENDIF
+        l = len(var)
+        d = {}
+
+        format_str = '%0' + str(int(len(str(l)))) + 'd'
+
+        i = 0
+        for item in var:
+            d[format_str % i] = item
+            i += 1
+            
+            if i > MAX_ITEMS_TO_HANDLE:
+                d[TOO_LARGE_ATTR] = TOO_LARGE_MSG
+                break
+                
+        d['__len__'] = len(var)
+        # in case if the class extends built-in type and has some additional fields
+        additional_fields = defaultResolver.get_dictionary(var)
+        d.update(additional_fields)
+        return d
+
+
+
+#=======================================================================================================================
+# SetResolver
+#=======================================================================================================================
+class SetResolver:
+    '''
+        Resolves a set as dict id(object)->object
+    '''
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, var, attribute):
+        if attribute in ('__len__', TOO_LARGE_ATTR):
+            return None
+
+        try:
+            attribute = int(attribute)
+        except:
+            return getattr(var, attribute)
+
+        for v in var:
+            if id(v) == attribute:
+                return v
+
+        raise UnableToResolveVariableException('Unable to resolve %s in %s' % (attribute, var))
+
+    def get_dictionary(self, var):
+        # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+        cdef dict d;
+        cdef int i;
+        # ELSE
+        # ENDIF
+        d = {}
+        i = 0
+        for item in var:
+            i+= 1
+            d[id(item)] = item
+            
+            if i > MAX_ITEMS_TO_HANDLE:
+                d[TOO_LARGE_ATTR] = TOO_LARGE_MSG
+                break
+
+            
+        d['__len__'] = len(var)
+        # in case if the class extends built-in type and has some additional fields
+        additional_fields = defaultResolver.get_dictionary(var)
+        d.update(additional_fields)
+        return d
+
+
+#=======================================================================================================================
+# InstanceResolver
+#=======================================================================================================================
+class InstanceResolver:
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, var, attribute):
+        field = var.__class__.getDeclaredField(attribute)
+        field.setAccessible(True)
+        return field.get(var)
+
+    def get_dictionary(self, obj):
+        ret = {}
+
+        declaredFields = obj.__class__.getDeclaredFields()
+        for i in xrange(len(declaredFields)):
+            name = declaredFields[i].getName()
+            try:
+                declaredFields[i].setAccessible(True)
+                ret[name] = declaredFields[i].get(obj)
+            except:
+                traceback.print_exc()
+
+        return ret
+
+
+#=======================================================================================================================
+# JyArrayResolver
+#=======================================================================================================================
+class JyArrayResolver:
+    '''
+        This resolves a regular Object[] array from java
+    '''
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, var, attribute):
+        if attribute == '__len__':
+            return None
+        return var[int(attribute)]
+
+    def get_dictionary(self, obj):
+        ret = {}
+
+        for i in xrange(len(obj)):
+            ret[ i ] = obj[i]
+
+        ret['__len__'] = len(obj)
+        return ret
+
+
+#=======================================================================================================================
+# NdArrayResolver
+#=======================================================================================================================
+class NdArrayResolver:
+    '''
+        This resolves a numpy ndarray returning some metadata about the NDArray
+    '''
+    use_value_repr_instead_of_str = False
+
+    def is_numeric(self, obj):
+        if not hasattr(obj, 'dtype'):
+            return False
+        return obj.dtype.kind in 'biufc'
+
+    def resolve(self, obj, attribute):
+        if attribute == '__internals__':
+            return defaultResolver.get_dictionary(obj)
+        if attribute == 'min':
+            if self.is_numeric(obj):
+                return obj.min()
+            else:
+                return None
+        if attribute == 'max':
+            if self.is_numeric(obj):
+                return obj.max()
+            else:
+                return None
+        if attribute == 'shape':
+            return obj.shape
+        if attribute == 'dtype':
+            return obj.dtype
+        if attribute == 'size':
+            return obj.size
+        if attribute.startswith('['):
+            container = NdArrayItemsContainer()
+            i = 0
+            format_str = '%0' + str(int(len(str(len(obj))))) + 'd'
+            for item in obj:
+                setattr(container, format_str % i, item)
+                i += 1
+                if i > MAX_ITEMS_TO_HANDLE:
+                    setattr(container, TOO_LARGE_ATTR, TOO_LARGE_MSG)
+                    break
+            return container
+        return None
+
+    def get_dictionary(self, obj):
+        ret = dict()
+        ret['__internals__'] = defaultResolver.get_dictionary(obj)
+        if obj.size > 1024 * 1024:
+            ret['min'] = 'ndarray too big, calculating min would slow down debugging'
+            ret['max'] = 'ndarray too big, calculating max would slow down debugging'
+        else:
+            if self.is_numeric(obj):
+                ret['min'] = obj.min()
+                ret['max'] = obj.max()
+            else:
+                ret['min'] = 'not a numeric object'
+                ret['max'] = 'not a numeric object'
+        ret['shape'] = obj.shape
+        ret['dtype'] = obj.dtype
+        ret['size'] = obj.size
+        ret['[0:%s] ' % (len(obj))] = list(obj[0:MAX_ITEMS_TO_HANDLE])
+        return ret
+
+class NdArrayItemsContainer: pass
+
+
+
+#=======================================================================================================================
+# MultiValueDictResolver
+#=======================================================================================================================
+class MultiValueDictResolver(DictResolver):
+
+    def resolve(self, dict, key):
+        if key in ('__len__', TOO_LARGE_ATTR):
+            return None
+
+        #ok, we have to iterate over the items to find the one that matches the id, because that's the only way
+        #to actually find the reference from the string we have before.
+        expected_id = int(key.split('(')[-1][:-1])
+        for key in dict_keys(dict):
+            val = dict.getlist(key)
+            if id(key) == expected_id:
+                return val
+
+        raise UnableToResolveVariableException()
+
+
+
+#=======================================================================================================================
+# DjangoFormResolver
+#=======================================================================================================================
+class DjangoFormResolver(DefaultResolver):
+    has_errors_attr = False
+    use_value_repr_instead_of_str = True
+
+    def get_names(self, var):
+        names = dir(var)
+        if not names and hasattr(var, '__members__'):
+            names = var.__members__
+
+        if "errors" in names:
+            self.has_errors_attr = True
+            names.remove("errors")
+        return names
+
+    def get_dictionary(self, var, names=None):
+        # Do not call self.errors because it is property and has side effects
+        d = defaultResolver.get_dictionary(var, self.get_names(var))
+        if self.has_errors_attr:
+            try:
+                errors_attr = getattr(var, "_errors")
+            except:
+                errors_attr = None
+            d["errors"] = errors_attr
+        return d
+
+
+#=======================================================================================================================
+# DequeResolver
+#=======================================================================================================================
+class DequeResolver(TupleResolver):
+    def get_dictionary(self, var):
+        d = TupleResolver.get_dictionary(self, var)
+        d['maxlen'] = getattr(var, 'maxlen', None)
+        return d
+
+
+#=======================================================================================================================
+# FrameResolver
+#=======================================================================================================================
+class FrameResolver:
+    '''
+    This resolves a frame.
+    '''
+    use_value_repr_instead_of_str = False
+
+    def resolve(self, obj, attribute):
+        if attribute == '__internals__':
+            return defaultResolver.get_dictionary(obj)
+
+        if attribute == 'stack':
+            return self.get_frame_stack(obj)
+
+        if attribute == 'f_locals':
+            return obj.f_locals
+
+        return None
+
+
+    def get_dictionary(self, obj):
+        ret = dict()
+        ret['__internals__'] = defaultResolver.get_dictionary(obj)
+        ret['stack'] = self.get_frame_stack(obj)
+        ret['f_locals'] = obj.f_locals
+        return ret
+
+
+    def get_frame_stack(self, frame):
+        ret = []
+        if frame is not None:
+            ret.append(self.get_frame_name(frame))
+
+            while frame.f_back:
+                frame = frame.f_back
+                ret.append(self.get_frame_name(frame))
+
+        return ret
+
+    def get_frame_name(self, frame):
+        if frame is None:
+            return 'None'
+        try:
+            name = basename(frame.f_code.co_filename)
+            return 'frame: %s [%s:%s]  id:%s' % (frame.f_code.co_name, name, frame.f_lineno, id(frame))
+        except:
+            return 'frame object'
+
+
+defaultResolver = DefaultResolver()
+dictResolver = DictResolver()
+tupleResolver = TupleResolver()
+instanceResolver = InstanceResolver()
+jyArrayResolver = JyArrayResolver()
+setResolver = SetResolver()
+ndarrayResolver = NdArrayResolver()
+multiValueDictResolver = MultiValueDictResolver()
+djangoFormResolver = DjangoFormResolver()
+dequeResolver = DequeResolver()
+frameResolver = FrameResolver()
+from _pydev_bundle import pydev_log
+import traceback
+import sys
+from _pydevd_bundle.pydevd_constants import dict_contains, dict_iter_items, dict_keys, IS_PY3K, \
+    MAXIMUM_VARIABLE_REPRESENTATION_SIZE, RETURN_VALUES_DICT
+# IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+# The resolvers are compiled in this same module (see: build_tools/generate_code.py).
+# ELSE
+# from _pydevd_bundle.pydevd_resolver import defaultResolver, dictResolver, tupleResolver, instanceResolver, \
+#     jyArrayResolver, setResolver, ndarrayResolver, multiValueDictResolver, djangoFormResolver, dequeResolver, \
+#     frameResolver
+# ENDIF
+
+from _pydev_bundle.pydev_imports import quote
+from _pydevd_bundle.pydevd_utils import quote_smart, to_string
+from _pydev_bundle._pydev_filesystem_encoding import getfilesystemencoding
+import pydevd_file_utils
+
+file_system_encoding = getfilesystemencoding()
+
+try:
+    import types
+    frame_type = types.FrameType
+except:
+    frame_type = None
+
+try:
+    from xml.sax.saxutils import escape
+
+    def make_valid_xml_value(s):
+        return escape(s, {'"': '&quot;'})
+except:
+    #Simple replacement if it's not there.
+    def make_valid_xml_value(s):
+        return s.replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+class ExceptionOnEvaluate:
+    def __init__(self, result):
+        self.result = result
+
+#------------------------------------------------------------------------------------------------------ resolvers in map
+
+_TYPE_MAP = None
+
+
+def _update_type_map():
+    global _TYPE_MAP
+    if not sys.platform.startswith("java"):
+        _TYPE_MAP = [
+                #None means that it should not be treated as a compound variable
+
+                #isintance does not accept a tuple on some versions of python, so, we must declare it expanded
+                (type(None), None,),
+                (int, None),
+                (float, None),
+                (complex, None),
+                (str, None),
+                (tuple, tupleResolver),
+                (list, tupleResolver),
+                (dict, dictResolver),
+        ]
+
+        try:
+            _TYPE_MAP.append((long, None))
+        except:
+            pass #not available on all python versions
+
+        try:
+            _TYPE_MAP.append((unicode, None))
+        except:
+            pass #not available on all python versions
+
+        try:
+            _TYPE_MAP.append((set, setResolver))
+        except:
+            pass #not available on all python versions
+
+        try:
+            _TYPE_MAP.append((frozenset, setResolver))
+        except:
+            pass #not available on all python versions
+
+        try:
+            import numpy
+            _TYPE_MAP.append((numpy.ndarray, ndarrayResolver))
+        except:
+            pass  #numpy may not be installed
+
+        try:
+            from django.utils.datastructures import MultiValueDict
+            _TYPE_MAP.insert(0, (MultiValueDict, multiValueDictResolver))
+            #we should put it before dict
+        except:
+            pass  #django may not be installed
+
+        try:
+            from django.forms import BaseForm
+            _TYPE_MAP.insert(0, (BaseForm, djangoFormResolver))
+            #we should put it before instance resolver
+        except:
+            pass  #django may not be installed
+
+        try:
+            from collections import deque
+            _TYPE_MAP.append((deque, dequeResolver))
+        except:
+            pass
+
+        if frame_type is not None:
+            _TYPE_MAP.append((frame_type, frameResolver))
+
+
+    else: #platform is java
+        from org.python import core #@UnresolvedImport
+        _TYPE_MAP = [
+                (core.PyNone, None),
+                (core.PyInteger, None),
+                (core.PyLong, None),
+                (core.PyFloat, None),
+                (core.PyComplex, None),
+                (core.PyString, None),
+                (core.PyTuple, tupleResolver),
+                (core.PyList, tupleResolver),
+                (core.PyDictionary, dictResolver),
+                (core.PyStringMap, dictResolver),
+        ]
+
+        if hasattr(core, 'PyJavaInstance'):
+            #Jython 2.5b3 removed it.
+            _TYPE_MAP.append((core.PyJavaInstance, instanceResolver))
+
+
+def get_type(o):
+    """ returns a triple (typeObject, typeString, resolver
+        resolver != None means that variable is a container,
+        and should be displayed as a hierarchy.
+        Use the resolver to get its attributes.
+
+        All container objects should have a resolver.
+    """
+
+    try:
+        type_object = type(o)
+        type_name = type_object.__name__
+    except:
+        #This happens for org.python.core.InitModule
+        return 'Unable to get Type', 'Unable to get Type', None
+
+    try:
+
+        if type_name == 'org.python.core.PyJavaInstance':
+            return (type_object, type_name, instanceResolver)
+
+        if type_name == 'org.python.core.PyArray':
+            return (type_object, type_name, jyArrayResolver)
+
+        if _TYPE_MAP is None:
+            _update_type_map()
+        for t in _TYPE_MAP:
+            if isinstance(o, t[0]):
+                return (type_object, type_name, t[1])
+    except:
+        traceback.print_exc()
+
+    #no match return default
+    return (type_object, type_name, defaultResolver)
+
+
+def return_values_from_dict_to_xml(return_dict):
+    res = ""
+    for name, val in dict_iter_items(return_dict):
+        res += var_to_xml(val, name, additional_in_xml=' isRetVal="True"')
+    return res
+
+
+def frame_vars_to_xml(frame_f_locals, hidden_ns=None):
+    """ dumps frame variables to XML
+    <var name="var_name" scope="local" type="type" value="value"/>
+    """
+    # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+    cdef list keys;
+    # ELSE
+    # ENDIF
+    xml = ""
+
+    keys = dict_keys(frame_f_locals)
+    if hasattr(keys, 'sort'):
+        keys.sort() #Python 3.0 does not have it
+    else:
+        keys = sorted(keys) #Jython 2.1 does not have it
+        
+    return_values_xml = ''
+
+    for k in keys:
+        try:
+            v = frame_f_locals[k]
+            if k == RETURN_VALUES_DICT:
+                for name, val in dict_iter_items(v):
+                    return_values_xml += var_to_xml(val, name, additional_in_xml=' isRetVal="True"')
+
+            else:
+                if hidden_ns is not None and dict_contains(hidden_ns, k):
+                    xml += var_to_xml(v, str(k), additional_in_xml=' isIPythonHidden="True"')
+                else:
+                    xml += var_to_xml(v, str(k))
+        except Exception:
+            traceback.print_exc()
+            pydev_log.error("Unexpected error, recovered safely.\n")
+
+    # Show return values as the first entry.
+    return return_values_xml + xml
+
+
+def var_to_xml(val, name, doTrim=True, additional_in_xml=''):
+    """ single variable or dictionary to xml representation """
+    # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+    cdef bint is_exception_on_eval;
+    cdef bint do_not_call_value_str;
+    # ELSE
+    # ENDIF
+
+    try:
+        # This should be faster than isinstance (but we have to protect against not having a '__class__' attribute).
+        is_exception_on_eval = val.__class__ == ExceptionOnEvaluate
+    except:
+        is_exception_on_eval = False
+
+    if is_exception_on_eval:
+        v = val.result
+    else:
+        v = val
+
+    _type, typeName, resolver = get_type(v)
+    type_qualifier = getattr(_type, "__module__", "")
+    do_not_call_value_str = resolver is not None and resolver.use_value_repr_instead_of_str
+
+    try:
+        if hasattr(v, '__class__'):
+            if v.__class__ == frame_type:
+                value = frameResolver.get_frame_name(v)
+
+            elif v.__class__ in (list, tuple):
+                if len(v) > 300:
+                    value = '%s: %s' % (str(v.__class__), '<Too big to print. Len: %s>' % (len(v),))
+                else:
+                    value = '%s: %s' % (str(v.__class__), v)
+            else:
+                try:
+                    cName = str(v.__class__)
+                    if cName.find('.') != -1:
+                        cName = cName.split('.')[-1]
+
+                    elif cName.find("'") != -1: #does not have '.' (could be something like <type 'int'>)
+                        cName = cName[cName.index("'") + 1:]
+
+                    if cName.endswith("'>"):
+                        cName = cName[:-2]
+                except:
+                    cName = str(v.__class__)
+
+                if do_not_call_value_str:
+                    value = '%s: %r' % (cName, v)
+                else:
+                    value = '%s: %s' % (cName, v)
+        else:
+            value = str(v)
+    except:
+        try:
+            value = repr(v)
+        except:
+            value = 'Unable to get repr for %s' % v.__class__
+
+    try:
+        name = quote(name, '/>_= ') #TODO: Fix PY-5834 without using quote
+    except:
+        pass
+
+    xml = '<var name="%s" type="%s" ' % (make_valid_xml_value(name), make_valid_xml_value(typeName))
+
+    if type_qualifier:
+        xml_qualifier = 'qualifier="%s"' % make_valid_xml_value(type_qualifier)
+    else:
+        xml_qualifier = ''
+
+    if value:
+        #cannot be too big... communication may not handle it.
+        if len(value) > MAXIMUM_VARIABLE_REPRESENTATION_SIZE and doTrim:
+            value = value[0:MAXIMUM_VARIABLE_REPRESENTATION_SIZE]
+            value += '...'
+
+        #fix to work with unicode values
+        try:
+            if not IS_PY3K:
+                if isinstance(value, unicode):
+                    value = value.encode('utf-8')
+            else:
+                if isinstance(value, bytes):
+                    value = value.encode('utf-8')
+        except TypeError: #in java, unicode is a function
+            pass
+
+        xml_value = ' value="%s"' % (make_valid_xml_value(quote(value, '/>_= ')))
+    else:
+        xml_value = ''
+
+    if is_exception_on_eval:
+        xml_container = ' isErrorOnEval="True"'
+    else:
+        if resolver is not None:
+            xml_container = ' isContainer="True"'
+        else:
+            xml_container = ''
+
+    return ''.join((xml, xml_qualifier, xml_value, xml_container, additional_in_xml, ' />\n'))
+
+
+
+def make_net_command_line(id, seq, text):
+    """ the line sent for a NetCommand (id, seq and the quoted text separated by tabs) """
+    return '%s\t%s\t%s\n' % (id, seq, quote_smart(to_string(text), '/<>_=" \t'))
+
+
+def make_thread_suspend_str(thread_id, frame, stop_reason, message):
+    """ <xml>
+        <thread id="id" stop_reason="reason">
+                <frame id="id" name="functionName " file="file" line="line">
+                <var variable stuffff....
+            </frame>
+        </thread>
+    """
+    # IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+    cdef list cmd_text_list;
+    # ELSE
+    # ENDIF
+    cmd_text_list = ["<xml>"]
+    append = cmd_text_list.append
+
+    if message:
+        message = make_valid_xml_value(message)
+
+    append('<thread id="%s" stop_reason="%s" message="%s">' % (thread_id, stop_reason, message))
+
+    curr_frame = frame
+    try:
+        while curr_frame:
+            my_id = id(curr_frame)
+
+            if curr_frame.f_code is None:
+                break #Iron Python sometimes does not have it!
+
+            my_name = curr_frame.f_code.co_name #method name (if in method) or ? if global
+            if my_name is None:
+                break #Iron Python sometimes does not have it!
+
+            abs_path_real_path_and_base = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(curr_frame)
+
+            myFile = pydevd_file_utils.norm_file_to_client(abs_path_real_path_and_base[0])
+            if file_system_encoding.lower() != "utf-8" and hasattr(myFile, "decode"):
+                # myFile is a byte string encoded using the file system encoding
+                # convert it to utf8
+                myFile = myFile.decode(file_system_encoding).encode("utf-8")
+
+            myLine = str(curr_frame.f_lineno)
+
+            #the variables are all gotten 'on-demand'
+            append('<frame id="%s" name="%s" ' % (my_id , make_valid_xml_value(my_name)))
+            append('file="%s" line="%s">' % (quote_smart(myFile, '/>_= \t'), myLine))
+            append("</frame>")
+            curr_frame = curr_frame.f_back
+    except :
+        traceback.print_exc()
+
+    append("</thread></xml>")
+    return ''.join(cmd_text_list)
+
+
+#=======================================================================================================================
+# Compiled version
+#=======================================================================================================================
+# IFDEF CYTHON -- DONT EDIT THIS FILE (it is automatically generated)
+# ELSE
+# # The functions in this module (and the resolvers) are also compiled with cython in pydevd_cython_xml (generated
+# # by build_tools/generate_code.py). When it's available it's used instead of the pure python version.
+# import os
+# _use_cython = os.getenv('PYDEVD_USE_CYTHON', None)
+# 
+# if _use_cython != 'NO':
+#     if _use_cython not in (None, 'YES'):
+#         raise RuntimeError('Unexpected value for PYDEVD_USE_CYTHON: %s (accepted: YES, NO)' % (_use_cython,))
+#     try:
+#         from _pydevd_bundle.pydevd_cython_xml_wrapper import ExceptionOnEvaluate, get_type, \
+#             return_values_from_dict_to_xml, frame_vars_to_xml, var_to_xml, make_valid_xml_value, \
+#             make_net_command_line, make_thread_suspend_str
+#     except ImportError:
+#         # The compiled module is optional (even if the tracing speedups are available), so, just keep on
+#         # with the pure python version.
+#         pass
+# ENDIF
@@ -0,0 +1,33 @@
+try:
+    from _pydevd_bundle.pydevd_cython_xml import ExceptionOnEvaluate, get_type, return_values_from_dict_to_xml, \
+        frame_vars_to_xml, var_to_xml, make_valid_xml_value, make_net_command_line, make_thread_suspend_str
+except ImportError:
+    try:
+        import struct
+        import sys
+        try:
+            is_python_64bit = (struct.calcsize('P') == 8)
+        except:
+            # In Jython this call fails, but this is Ok, we don't support Jython for speedups anyways.
+            raise ImportError
+        plat = '32'
+        if is_python_64bit:
+            plat = '64'
+
+        # We also accept things as:
+        #
+        # _pydevd_bundle.pydevd_cython_xml_win32_27_32
+        # _pydevd_bundle.pydevd_cython_xml_win32_34_64
+        #
+        # (same as pydevd_cython_wrapper).
+
+        mod_name = 'pydevd_cython_xml_%s_%s%s_%s' % (sys.platform, sys.version_info[0], sys.version_info[1], plat)
+        check_name = '_pydevd_bundle.%s' % (mod_name,)
+        mod = __import__(check_name)
+        mod = getattr(mod, mod_name)
+        ExceptionOnEvaluate, get_type, return_values_from_dict_to_xml, frame_vars_to_xml, var_to_xml, \
+            make_valid_xml_value, make_net_command_line, make_thread_suspend_str = \
+            mod.ExceptionOnEvaluate, mod.get_type, mod.return_values_from_dict_to_xml, mod.frame_vars_to_xml, \
+            mod.var_to_xml, mod.make_valid_xml_value, mod.make_net_command_line, mod.make_thread_suspend_str
+    except ImportError:
+        raise
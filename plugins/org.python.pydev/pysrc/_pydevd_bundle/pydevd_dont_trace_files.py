@@ -62,6 +62,7 @@ DONT_TRACE = {
     'pydevd.py': PYDEV_FILE,
     'pydevd_additional_thread_info.py': PYDEV_FILE,
     'pydevd_additional_thread_info_regular.py': PYDEV_FILE,
+    'pydevd_asyncio_wrappers.py': PYDEV_FILE,
     'pydevd_breakpoints.py': PYDEV_FILE,
     'pydevd_comm.py': PYDEV_FILE,
     'pydevd_command_line_handling.py': PYDEV_FILE,
@@ -70,6 +71,7 @@ DONT_TRACE = {
     'pydevd_constants.py': PYDEV_FILE,
     'pydevd_custom_frames.py': PYDEV_FILE,
     'pydevd_cython_wrapper.py': PYDEV_FILE,
+    'pydevd_cython_xml_wrapper.py': PYDEV_FILE,
     'pydevd_dont_trace.py': PYDEV_FILE,
     'pydevd_dont_trace_files.py': PYDEV_FILE,
     'pydevd_exec.py': PYDEV_FILE,
@@ -80,9 +82,11 @@ DONT_TRACE = {
     'pydevd_import_class.py': PYDEV_FILE,
     'pydevd_io.py': PYDEV_FILE,
     'pydevd_kill_all_pydevd_threads.py': PYDEV_FILE,
+    'pydevd_lazy_attach.py': PYDEV_FILE,
     'pydevd_plugin_utils.py': PYDEV_FILE,
     'pydevd_process_net_command.py': PYDEV_FILE,
     'pydevd_referrers.py': PYDEV_FILE,
+    'pydevd_relay.py': PYDEV_FILE,
     'pydevd_reload.py': PYDEV_FILE,
     'pydevd_resolver.py': PYDEV_FILE,
     'pydevd_save_locals.py': PYDEV_FILE,
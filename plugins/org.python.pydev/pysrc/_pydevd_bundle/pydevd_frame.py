@@ -368,7 +368,8 @@ class PyDBFrame: # No longer cdef because object was dying when only a reference
                     can_skip = (step_cmd == -1 and stop_frame is None)\
                         or (step_cmd in (CMD_STEP_RETURN, CMD_STEP_OVER) and stop_frame is not frame)
 
-                if can_skip and plugin_manager is not None and main_debugger.has_plugin_line_breaks:
+                if can_skip and plugin_manager is not None and main_debugger.has_plugin_line_breaks and \
+                        plugin_manager.code_name_filter[frame.f_code.co_name]:
                     can_skip = not plugin_manager.can_not_skip(main_debugger, self, frame)
 
                 if can_skip and main_debugger.show_return_values:
@@ -429,7 +430,8 @@ class PyDBFrame: # No longer cdef because object was dying when only a reference
                     stop = True
                     if step_cmd == CMD_STEP_OVER and stop_frame is frame and event in ('line', 'return'):
                         stop = False #we don't stop on breakpoint if we have to stop by step-over (it will be processed later)
-                elif plugin_manager is not None and main_debugger.has_plugin_line_breaks:
+                elif plugin_manager is not None and main_debugger.has_plugin_line_breaks and \
+                        plugin_manager.code_name_filter[frame.f_code.co_name]:
                     result = plugin_manager.get_breakpoint(main_debugger, self, frame, event, self._args)
                     if result:
                         exist_result = True
@@ -1,3 +1,8 @@
+import os
+
+from _pydev_imps._pydev_saved_modules import threading
+from _pydev_imps._pydev_saved_modules import time
+from _pydev_bundle import pydev_log
 from _pydevd_bundle import pydevd_constants
 
 IS_PY3K = pydevd_constants.IS_PY3K
@@ -29,27 +34,171 @@ class IORedirector:
                 return getattr(r, name)
         raise AttributeError(name)
 
+#=======================================================================================================================
+# Overflow policies for a bounded IOBuf (i.e.: what to do when a write doesn't fit in max_size).
+#=======================================================================================================================
+IO_OVERFLOW_BLOCK = 'block'  # The writer waits for the contents to be consumed (up to IO_BLOCK_TIMEOUT, then drop oldest).
+IO_OVERFLOW_DROP_OLDEST = 'drop_oldest'  # The oldest contents are discarded.
+IO_OVERFLOW_SUMMARIZE = 'summarize'  # New contents are discarded (and a summary of what was lost is added).
+
+IO_OVERFLOW_POLICIES = (IO_OVERFLOW_BLOCK, IO_OVERFLOW_DROP_OLDEST, IO_OVERFLOW_SUMMARIZE)
+
+
+def _get_io_buffer_max_size(default=256 * 1024):
+    value = os.environ.get('PYDEVD_IO_BUFFER_MAX_SIZE')
+    if value is None:
+        return default
+    try:
+        max_size = int(value)
+        if max_size <= 0:
+            raise ValueError(value)
+        return max_size
+    except ValueError:
+        pydev_log.error('Warning: ignoring invalid PYDEVD_IO_BUFFER_MAX_SIZE: %r (using %s).' % (value, default))
+        return default
+
+
+def _get_io_buffer_overflow_policy(default=IO_OVERFLOW_DROP_OLDEST):
+    value = os.environ.get('PYDEVD_IO_BUFFER_OVERFLOW_POLICY')
+    if value is None:
+        return default
+    if value not in IO_OVERFLOW_POLICIES:
+        pydev_log.error('Warning: ignoring invalid PYDEVD_IO_BUFFER_OVERFLOW_POLICY: %r (expected one of: %s; using %s).' % (
+            value, ', '.join(IO_OVERFLOW_POLICIES), default))
+        return default
+    return value
+
+
+# Settings used for the output redirected to the debug server (may be overridden through environment variables).
+IO_BUFFER_MAX_SIZE = _get_io_buffer_max_size()
+IO_BUFFER_OVERFLOW_POLICY = _get_io_buffer_overflow_policy()
+IO_BLOCK_TIMEOUT = 5.0
+
+
 class IOBuf:
     '''This class works as a replacement for stdio and stderr.
     It is a buffer and when its contents are requested, it will erase what
     
     it has so far so that the next return will not return the same contents again.
+
+    If max_size is given, it holds at most max_size chars (the overflow_policy
+    determines what happens when a write doesn't fit).
+
+    If on_first_write is given, it's called (without arguments) whenever something
+    is written to an empty buffer (i.e.: to wake up whoever consumes the contents).
     '''
-    def __init__(self):
+    def __init__(self, max_size=None, overflow_policy=IO_OVERFLOW_DROP_OLDEST, on_first_write=None):
         self.buflist = []
-        import os
         self.encoding = os.environ.get('PYTHONIOENCODING', 'utf-8')
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.on_first_write = on_first_write
+        self._size = 0
+        self._dropped = 0
+        if max_size is not None:
+            self._condition = threading.Condition()
 
     def getvalue(self):
-        b = self.buflist
-        self.buflist = [] #clear it
-        return ''.join(b)
+        if self.max_size is None:
+            b = self.buflist
+            self.buflist = [] #clear it
+            return ''.join(b)
+
+        self._condition.acquire()
+        try:
+            b = self.buflist
+            self.buflist = [] #clear it
+            dropped = self._dropped
+            self._dropped = 0
+            self._size = 0
+            self._condition.notifyAll()
+        finally:
+            self._condition.release()
+
+        ret = ''.join(b)
+        if dropped:
+            if self.overflow_policy == IO_OVERFLOW_SUMMARIZE:
+                ret += '\n... (%s characters of output omitted)\n' % (dropped,)
+            else:
+                ret = '... (%s characters of output dropped)\n' % (dropped,) + ret
+        return ret
     
     def write(self, s):
         if not IS_PY3K:
             if isinstance(s, unicode):
                 s = s.encode(self.encoding)
-        self.buflist.append(s)
+        if not s:
+            return
+
+        if self.max_size is None:
+            was_empty = not self.buflist
+            self.buflist.append(s)
+        else:
+            self._condition.acquire()
+            try:
+                was_empty = self._size == 0
+                self._write_bounded(s)
+            finally:
+                self._condition.release()
+
+        if was_empty and self.on_first_write is not None:
+            self.on_first_write()
+
+    def _write_bounded(self, s):
+        # Note: called with the lock held.
+        max_size = self.max_size
+        len_s = len(s)
+        if self._size + len_s <= max_size:
+            self.buflist.append(s)
+            self._size += len_s
+            return
+
+        if self.overflow_policy == IO_OVERFLOW_BLOCK and \
+                not getattr(threading.currentThread(), 'is_pydev_daemon_thread', False):
+            timeout_at = time.time() + IO_BLOCK_TIMEOUT
+            while self._size > 0 and self._size + len_s > max_size:
+                remaining = timeout_at - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            if self._size + len_s <= max_size:
+                self.buflist.append(s)
+                self._size += len_s
+                return
+
+        if self.overflow_policy == IO_OVERFLOW_SUMMARIZE:
+            available = max_size - self._size
+            if available > 0:
+                self.buflist.append(s[:available])
+                self._size += available
+                self._dropped += len_s - available
+            else:
+                self._dropped += len_s
+            return
+
+        # Drop oldest (also the fallback when blocking timed out).
+        if len_s >= max_size:
+            self._dropped += self._size + len_s - max_size
+            self.buflist = [s[len_s - max_size:]]
+            self._size = max_size
+            return
+
+        excess = self._size + len_s - max_size
+        buflist = self.buflist
+        removed = 0
+        i = 0
+        while removed < excess:
+            removed += len(buflist[i])
+            i += 1
+        keep_from_last = removed - excess
+        last_removed = buflist[i - 1]
+        del buflist[:i]
+        if keep_from_last:
+            buflist.insert(0, last_removed[-keep_from_last:])
+        buflist.append(s)
+        self._size += len_s - excess
+        self._dropped += excess
 
     def isatty(self):
         return False
@@ -58,7 +207,7 @@ class IOBuf:
         pass
 
     def empty(self):
-        return len(self.buflist) == 0
+        return len(self.buflist) == 0 and not self._dropped
 
 class _RedirectionsHolder:
     _stack_stdout = []
@@ -0,0 +1,157 @@
+'''
+Lazy attach for children processes (enabled with --lazy-attach, used along with --multiprocess).
+
+Instead of connecting to the IDE and tracing all the threads right away, a forked child (or a child spawned with
+'python -c', as done by multiprocessing) only installs a cheap stub (an import hook and, if needed, an excepthook)
+and only attaches the debugger when:
+
+- a module of a file which has a breakpoint is imported (or was already imported when the stub is installed).
+- an uncaught exception is raised (if there are breakpoints for uncaught exceptions).
+
+The breakpoints are the ones known by the parent when the child is created (in a fork they're gotten from the parent
+debugger and in a spawned child they're passed in the command line). Breakpoints added afterwards in the IDE are
+only seen by children which are already attached.
+
+The child attaches right away if the parent has breakpoints which can't be checked without tracing (i.e.: caught
+exceptions, django/jinja2 templates), if the main script of the parent has breakpoints (children spawned by
+multiprocessing run it with runpy.run_path, which doesn't go through the import hooks) or if the import hook isn't
+available (Python < 3.4).
+'''
+import sys
+
+from _pydev_imps._pydev_saved_modules import thread
+from _pydev_imps._pydev_saved_modules import threading
+from pydevd_file_utils import get_abs_path_real_path_and_base_from_file
+
+# The info used by the current process (reused for its children if it's not attached).
+_lazy_attach_info = None
+
+
+def get_lazy_attach_info(debugger):
+    '''
+    :return dict: with the files with breakpoints ('files'), whether there are uncaught exception breakpoints
+        ('exceptions') and whether a child must attach right away ('eager').
+    '''
+    if debugger is None:
+        if _lazy_attach_info is not None:
+            return _lazy_attach_info
+        return {'files': [], 'exceptions': False, 'eager': True}
+
+    files = []
+    for filename, breakpoints in list(debugger.breakpoints.items()):
+        if breakpoints:
+            files.append(filename)
+    files.sort()
+    return {
+        'files': files,
+        'exceptions': bool(debugger.break_on_uncaught_exceptions),
+        'eager': bool(debugger.break_on_caught_exceptions) or bool(debugger.has_plugin_line_breaks) or \
+            bool(debugger.has_plugin_exception_breaks) or _main_has_breakpoints(files),
+    }
+
+
+def _main_has_breakpoints(files):
+    # The main script is run again in children spawned by multiprocessing (where the pool workers are usually
+    # defined), but with runpy.run_path, so, the import hook can't attach when it's run.
+    main_file = getattr(sys.modules.get('__main__'), '__file__', None)
+    return bool(main_file) and _normalize(main_file) in files
+
+
+def _normalize(filename):
+    return get_abs_path_real_path_and_base_from_file(filename)[1]
+
+
+#=======================================================================================================================
+# LazyAttachStub
+#=======================================================================================================================
+class LazyAttachStub(object):
+    '''
+    Import hook (added to sys.meta_path) which calls attach() when a module whose file has a breakpoint is imported.
+    Also works as the excepthook when there are breakpoints for uncaught exceptions.
+    '''
+
+    def __init__(self, files, attach):
+        self.files = frozenset(files)
+        self._attach = attach
+        self._attached = False
+        self._lock = threading.Lock()
+        self._finding = {}  # Thread idents currently in find_spec.
+        self.original_excepthook = None
+
+    def attach(self):
+        self._lock.acquire()
+        try:
+            if self._attached:
+                return
+            self._attached = True
+        finally:
+            self._lock.release()
+        self.uninstall()
+        self._attach()
+
+    def uninstall(self):
+        try:
+            sys.meta_path.remove(self)
+        except ValueError:
+            pass
+        if self.original_excepthook is not None and sys.excepthook == self.excepthook:
+            sys.excepthook = self.original_excepthook
+
+    def has_breakpoint(self, filename):
+        return bool(filename) and _normalize(filename) in self.files
+
+    def has_imported_module_with_breakpoint(self):
+        for module in list(sys.modules.values()):
+            if self.has_breakpoint(getattr(module, '__file__', None)):
+                return True
+        return False
+
+    def find_spec(self, fullname, path=None, target=None):
+        ident = thread.get_ident()
+        if ident in self._finding:
+            return None
+        self._finding[ident] = True
+        try:
+            # Find the spec with the other finders to know the file of the module (it's returned so that
+            # the import machinery doesn't need to search for it again).
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find_spec = getattr(finder, 'find_spec', None)
+                if find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    if self.has_breakpoint(spec.origin):
+                        self.attach()
+                    return spec
+            return None
+        finally:
+            del self._finding[ident]
+
+    def excepthook(self, exctype, value, tb):
+        self.attach()
+        # After attaching, the excepthook is the one from the debugger (which stops in the exception).
+        sys.excepthook(exctype, value, tb)
+
+
+def install_lazy_attach(info, attach):
+    '''
+    :param dict info: see: get_lazy_attach_info.
+    :param callable attach: called (only once) to actually attach the debugger.
+    :return bool: True if the stub was installed (if False, the caller should attach right away).
+    '''
+    global _lazy_attach_info
+    if info.get('eager') or sys.version_info[:2] < (3, 4):
+        return False
+
+    stub = LazyAttachStub(info.get('files', ()), attach)
+    if stub.has_imported_module_with_breakpoint():
+        return False
+
+    _lazy_attach_info = info
+    sys.meta_path.insert(0, stub)
+    if info.get('exceptions'):
+        stub.original_excepthook = sys.excepthook
+        sys.excepthook = stub.excepthook
+    return True
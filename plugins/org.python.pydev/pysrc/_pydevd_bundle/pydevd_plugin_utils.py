@@ -32,11 +32,44 @@ def bind_func_to_method(func, obj, method_name):
     return bound_method
 
 
+class CodeNameFilter(dict):
+    '''
+    Maps a code name (frame.f_code.co_name) to whether some active plugin may have a line breakpoint in a frame
+    with that name (so, the tracer can skip calling the plugins with a single lookup for all other frames).
+
+    Plugins declare the names they're interested in with LINE_BREAKPOINT_CODE_NAMES and
+    LINE_BREAKPOINT_CODE_NAME_PREFIXES (a plugin which doesn't declare them is interested in all frames).
+    The result for each name is computed on its first access.
+    '''
+
+    def __init__(self, plugins):
+        dict.__init__(self)
+        self.accept_all = False
+        self.code_names = set()
+        prefixes = []
+        for plugin in plugins:
+            code_names = getattr(plugin, 'LINE_BREAKPOINT_CODE_NAMES', None)
+            code_name_prefixes = getattr(plugin, 'LINE_BREAKPOINT_CODE_NAME_PREFIXES', None)
+            if code_names is None and code_name_prefixes is None:
+                self.accept_all = True
+            else:
+                self.code_names.update(code_names or ())
+                prefixes.extend(code_name_prefixes or ())
+        self.code_name_prefixes = tuple(prefixes)
+
+    def __missing__(self, code_name):
+        ret = self.accept_all or code_name in self.code_names or \
+            (bool(self.code_name_prefixes) and code_name.startswith(self.code_name_prefixes))
+        self[code_name] = ret
+        return ret
+
+
 class PluginManager(object):
 
     def __init__(self, main_debugger):
         self.plugins = load_plugins()
         self.active_plugins = []
+        self.code_name_filter = CodeNameFilter(self.active_plugins)
         self.main_debugger = main_debugger
         self.rebind_methods()
 
@@ -58,6 +91,7 @@ class PluginManager(object):
             self.rebind_methods()
 
     def rebind_methods(self):
+        self.code_name_filter = CodeNameFilter(self.active_plugins)
         if len(self.active_plugins) == 0:
             self.bind_functions(pydevd_trace_api, getattr, pydevd_trace_api)
         elif len(self.active_plugins) == 1:
@@ -18,7 +18,8 @@ from _pydevd_bundle.pydevd_comm import CMD_RUN, CMD_VERSION, CMD_LIST_THREADS, C
     CMD_REMOVE_EXCEPTION_BREAK, CMD_LOAD_SOURCE, CMD_ADD_DJANGO_EXCEPTION_BREAK, CMD_REMOVE_DJANGO_EXCEPTION_BREAK, \
     CMD_EVALUATE_CONSOLE_EXPRESSION, InternalEvaluateConsoleExpression, InternalConsoleGetCompletions, \
     CMD_RUN_CUSTOM_OPERATION, InternalRunCustomOperation, CMD_IGNORE_THROWN_EXCEPTION_AT, CMD_ENABLE_DONT_TRACE, \
-    CMD_SHOW_RETURN_VALUES, ID_TO_MEANING, CMD_GET_DESCRIPTION, InternalGetDescription
+    CMD_SHOW_RETURN_VALUES, ID_TO_MEANING, CMD_GET_DESCRIPTION, InternalGetDescription, CMD_EVALUATE_EXPRESSIONS, \
+    InternalEvaluateExpressions
 from _pydevd_bundle.pydevd_constants import get_thread_id, IS_PY3K, DebugInfoHolder, dict_contains, dict_keys, dict_pop, \
     STATE_RUN
 
@@ -387,6 +388,16 @@ def process_net_command(py_db, cmd_id, seq, text):
                     cmd_id == CMD_EXEC_EXPRESSION, int(trim) == 1, temp_name)
                 py_db.post_internal_command(int_cmd, thread_id)
 
+            elif cmd_id == CMD_EVALUATE_EXPRESSIONS:
+                #command to evaluate many expressions in the same frame (answered in a single message)
+                #text is: thread\tstackframe\tLOCAL\ttrim\texpression1\texpression2...
+                #(new lines and tabs in the expressions must be sent as @_@NEW_LINE_CHAR@_@ and @_@TAB_CHAR@_@)
+                thread_id, frame_id, scope, trim, expressions = text.split('\t', 4)
+                expressions = [expression.replace("@_@NEW_LINE_CHAR@_@", '\n').replace("@_@TAB_CHAR@_@", '\t')
+                               for expression in expressions.split('\t')]
+                int_cmd = InternalEvaluateExpressions(seq, thread_id, frame_id, expressions, int(trim) == 1)
+                py_db.post_internal_command(int_cmd, thread_id)
+
             elif cmd_id == CMD_CONSOLE_EXEC:
                 #command to exec expression in console, in case expression is only partially valid 'False' is returned
                 #text is: thread\tstackframe\tLOCAL\texpression
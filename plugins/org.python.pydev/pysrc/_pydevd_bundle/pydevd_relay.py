@@ -0,0 +1,466 @@
+'''
+Relay used to debug many processes through a single connection to the IDE (enabled with --multiprocess-relay).
+
+The process started by the IDE starts the relay (after connecting itself), which listens in a unix socket (or in
+a localhost port where unix sockets aren't available). Its address is set in the PYDEVD_RELAY_ADDRESS environment
+variable, so, children (forked or spawned) connect to it instead of creating a new connection to the IDE.
+
+All the children share a single connection from the relay to the IDE:
+
+- The messages from the children are forwarded as is (thread ids are already tagged with the pid of the process:
+  'pid_<pid>_id_<id>').
+
+- Commands from the IDE which have a thread id (or frame id) are sent only to the process with that pid. Other
+  commands are sent to all the children and the ones which set state (i.e.: version, breakpoints, run) are kept to be
+  replayed to children which connect later on (only the latest command for each state is kept, i.e.: a removed
+  breakpoint isn't replayed). The responses to a command sent to many children are forwarded to the IDE only once.
+
+- When a child disconnects, the IDE is notified that its threads were killed (and its CMD_EXIT isn't forwarded, as
+  that would finish the debug session of all the children).
+
+The protocol between a child and the relay is the same one used with the IDE, except that the child first sends a
+line with its pid.
+'''
+from collections import deque
+import os
+import re
+import sys
+import tempfile
+import traceback
+
+from _pydev_imps._pydev_saved_modules import socket as socket_module
+from _pydev_imps._pydev_saved_modules import threading
+from _pydev_imps._pydev_saved_modules import time
+from _pydevd_bundle.pydevd_comm import PyDBDaemonThread, NetCommand, CMD_VERSION, CMD_RUN, CMD_SET_BREAK, \
+    CMD_REMOVE_BREAK, CMD_ADD_EXCEPTION_BREAK, CMD_REMOVE_EXCEPTION_BREAK, CMD_ADD_DJANGO_EXCEPTION_BREAK, \
+    CMD_REMOVE_DJANGO_EXCEPTION_BREAK, CMD_SET_PY_EXCEPTION, CMD_SET_PROPERTY_TRACE, CMD_IGNORE_THROWN_EXCEPTION_AT, \
+    CMD_ENABLE_DONT_TRACE, CMD_SHOW_RETURN_VALUES, CMD_THREAD_CREATE, CMD_THREAD_KILL, CMD_EXIT
+from _pydev_bundle import pydev_log
+
+RELAY_ADDRESS_ENV_VAR = 'PYDEVD_RELAY_ADDRESS'
+
+# Commands from the IDE which are replayed to children which connect after they were sent.
+REPLAYED_COMMANDS = frozenset([
+    CMD_VERSION,
+    CMD_RUN,
+    CMD_SET_BREAK,
+    CMD_REMOVE_BREAK,
+    CMD_ADD_EXCEPTION_BREAK,
+    CMD_REMOVE_EXCEPTION_BREAK,
+    CMD_ADD_DJANGO_EXCEPTION_BREAK,
+    CMD_REMOVE_DJANGO_EXCEPTION_BREAK,
+    CMD_SET_PY_EXCEPTION,
+    CMD_SET_PROPERTY_TRACE,
+    CMD_IGNORE_THROWN_EXCEPTION_AT,
+    CMD_ENABLE_DONT_TRACE,
+    CMD_SHOW_RETURN_VALUES,
+])
+
+# Max number of broadcast commands whose responses are tracked (commands which no child answers are only forgotten
+# when this is exceeded or when the children which received them disconnect).
+MAX_BROADCAST_SEQS = 1000
+
+_NEW_LINE = '\n'.encode('ascii')
+_TAB = '\t'.encode('ascii')
+_THREAD_ID_RE = re.compile('pid_(\\d+)_id_\\d+'.encode('ascii'))
+_REPLACE = 'REPLACE:'.encode('ascii')
+
+# Replayed commands which set the whole state they refer to (so, only the latest one needs to be replayed).
+_WHOLE_STATE_COMMANDS = frozenset([
+    CMD_VERSION,
+    CMD_RUN,
+    CMD_SET_PY_EXCEPTION,
+    CMD_SET_PROPERTY_TRACE,
+    CMD_ENABLE_DONT_TRACE,
+    CMD_SHOW_RETURN_VALUES,
+])
+
+
+def get_relay_address():
+    return os.environ.get(RELAY_ADDRESS_ENV_VAR)
+
+
+def connect_to_relay(address):
+    '''
+    :param str address: 'unix:<path>' or 'tcp:<host>:<port>' (as set in PYDEVD_RELAY_ADDRESS).
+    :return: a socket connected to the relay (to be used as the connection to the IDE).
+    '''
+    pydev_log.debug('Connecting to relay: %s\n' % (address,))
+    if address.startswith('unix:'):
+        s = socket_module.socket(socket_module.AF_UNIX, socket_module.SOCK_STREAM)
+        s.connect(address[len('unix:'):])
+    else:
+        host, port = address[len('tcp:'):].rsplit(':', 1)
+        s = socket_module.socket(socket_module.AF_INET, socket_module.SOCK_STREAM)
+        s.connect((host, int(port)))
+    s.sendall(('%s\n' % (os.getpid(),)).encode('ascii'))
+    return s
+
+
+def _parse_line(line):
+    '''
+    :return tuple(int, int): the command id and sequence of a message line (or (None, None) if it can't be parsed).
+    '''
+    try:
+        cmd_id, seq, _text = line.split(_TAB, 2)
+        return int(cmd_id), int(seq)
+    except ValueError:
+        return None, None
+
+
+def _get_replay_key(cmd_id, text):
+    '''
+    :return tuple(tuple, bool): the key of the state set by a replayed command (a later command with the same key
+        replaces it) and whether the command removes that state (in which case nothing needs to be replayed for it).
+    '''
+    if cmd_id in _WHOLE_STATE_COMMANDS:
+        return (cmd_id,), False
+
+    if cmd_id == CMD_SET_BREAK:
+        splitted = text.split(_TAB)
+        if len(splitted) >= 4:  # breakpoint_id, type, file, line...
+            return (CMD_SET_BREAK, splitted[1], splitted[2], splitted[0]), False
+
+    elif cmd_id == CMD_REMOVE_BREAK:
+        splitted = text.split(_TAB)
+        if len(splitted) == 3:  # type, file, breakpoint_id
+            return (CMD_SET_BREAK, splitted[0], splitted[1], splitted[2]), True
+
+    elif cmd_id == CMD_ADD_EXCEPTION_BREAK:
+        return (CMD_ADD_EXCEPTION_BREAK, text.split(_TAB, 1)[0]), False
+
+    elif cmd_id == CMD_REMOVE_EXCEPTION_BREAK:
+        return (CMD_ADD_EXCEPTION_BREAK, text), True
+
+    elif cmd_id == CMD_ADD_DJANGO_EXCEPTION_BREAK:
+        return (CMD_ADD_DJANGO_EXCEPTION_BREAK, text), False
+
+    elif cmd_id == CMD_REMOVE_DJANGO_EXCEPTION_BREAK:
+        return (CMD_ADD_DJANGO_EXCEPTION_BREAK, text), True
+
+    # Unknown format or additive command (i.e.: CMD_IGNORE_THROWN_EXCEPTION_AT): only repeated commands are collapsed.
+    return (cmd_id, text), False
+
+
+def _iter_lines(sock):
+    '''
+    Yields the lines (without the new line) read from the socket until it's closed.
+    '''
+    read_buffer = bytearray()
+    while True:
+        try:
+            r = sock.recv(8192)
+        except socket_module.error:
+            return
+        if not r:
+            return
+        search_from = len(read_buffer)  # What's already in the buffer has no new line.
+        read_buffer.extend(r)
+        start = 0
+        while True:
+            i = read_buffer.find(_NEW_LINE, search_from)
+            if i == -1:
+                break
+            yield bytes(read_buffer[start:i])
+            start = search_from = i + 1
+        if start:
+            del read_buffer[:start]
+
+
+#=======================================================================================================================
+# Relay
+#=======================================================================================================================
+class Relay(object):
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.address = None
+        self._server = None
+        self._unix_socket_dir = None
+        self._unix_socket_path = None
+
+        self._lock = threading.RLock()  # Guards the state below (children, replay, seqs and the upstream connection).
+        self._upstream = None
+        self._upstream_write_lock = threading.Lock()
+        self._children = {}  # pid -> socket
+        self._children_threads = {}  # pid -> set(thread ids created)
+        self._replay = {}  # Lines to be replayed to new children: key (see: _get_replay_key) -> (order, line)
+        self._replay_order = 0
+        # Commands sent to many children: seq -> [whether a response was already forwarded, pids yet to answer]
+        self._broadcast_seqs = {}
+        self._broadcast_seqs_order = deque()
+
+    def start(self):
+        if hasattr(socket_module, 'AF_UNIX'):
+            # The socket is created in a directory only accessible by the current user (so, other users can't
+            # connect to the debug session).
+            self._unix_socket_dir = tempfile.mkdtemp(prefix='pydevd-relay-')
+            self._unix_socket_path = os.path.join(self._unix_socket_dir, 'relay.sock')
+            server = socket_module.socket(socket_module.AF_UNIX, socket_module.SOCK_STREAM)
+            server.bind(self._unix_socket_path)
+            self.address = 'unix:%s' % (self._unix_socket_path,)
+        else:
+            server = socket_module.socket(socket_module.AF_INET, socket_module.SOCK_STREAM)
+            server.bind(('127.0.0.1', 0))
+            self.address = 'tcp:127.0.0.1:%s' % (server.getsockname()[1],)
+        server.listen(128)
+        self._server = server
+
+        _RelayAcceptThread(self).start()
+        os.environ[RELAY_ADDRESS_ENV_VAR] = self.address
+        pydev_log.debug('Started relay at: %s\n' % (self.address,))
+
+    def close(self):
+        if os.environ.get(RELAY_ADDRESS_ENV_VAR) == self.address:
+            del os.environ[RELAY_ADDRESS_ENV_VAR]
+        for s in [self._server, self._upstream] + list(self._children.values()):
+            if s is not None:
+                try:
+                    s.close()
+                except:
+                    pass
+        if self._unix_socket_path is not None:
+            try:
+                os.remove(self._unix_socket_path)
+            except:
+                pass
+            try:
+                os.rmdir(self._unix_socket_dir)
+            except:
+                pass
+
+    def _connect_upstream(self):
+        # Note: called with the lock held.
+        if self._upstream is not None:
+            return
+        pydev_log.debug('Relay connecting to %s:%s\n' % (self.host, self.port))
+        for _i in range(50):
+            s = socket_module.socket(socket_module.AF_INET, socket_module.SOCK_STREAM)
+            try:
+                s.connect((self.host, self.port))
+                break
+            except socket_module.error:
+                s.close()
+                time.sleep(0.2)
+        else:
+            raise RuntimeError('Relay could not connect to %s:%s' % (self.host, self.port))
+        self._upstream = s
+        _RelayUpstreamReaderThread(self, s).start()
+
+    def send_upstream(self, line):
+        self._upstream_write_lock.acquire()
+        try:
+            self._upstream.sendall(line + _NEW_LINE)
+        finally:
+            self._upstream_write_lock.release()
+
+    def add_child(self, pid, sock):
+        self._lock.acquire()
+        try:
+            self._connect_upstream()
+            # The replay is sent with the lock held so that new commands are only sent after it.
+            for _order, line in sorted(self._replay.values()):
+                sock.sendall(line + _NEW_LINE)
+                _cmd_id, seq = _parse_line(line)
+                if seq is not None:
+                    # The IDE already got (or will get from the other children) the response.
+                    self._add_broadcast_seq(seq, (pid,), True)
+            self._children[pid] = sock
+            self._children_threads[pid] = set()
+        finally:
+            self._lock.release()
+
+    def remove_child(self, pid):
+        self._lock.acquire()
+        try:
+            self._children.pop(pid, None)
+            thread_ids = self._children_threads.pop(pid, ())
+            for seq, (_answered, pending) in list(self._broadcast_seqs.items()):
+                pending.discard(pid)
+                if not pending:
+                    del self._broadcast_seqs[seq]
+        finally:
+            self._lock.release()
+
+        for thread_id in thread_ids:
+            try:
+                self.send_upstream(NetCommand(str(CMD_THREAD_KILL), 0, thread_id).outgoing.rstrip('\n').encode('utf-8'))
+            except:
+                pass
+
+    def on_child_message(self, pid, line):
+        cmd_id, seq = _parse_line(line)
+        if cmd_id == CMD_EXIT:
+            return
+
+        self._lock.acquire()
+        try:
+            if cmd_id == CMD_THREAD_CREATE or cmd_id == CMD_THREAD_KILL:
+                thread_ids = self._children_threads.get(pid)
+                if thread_ids is not None:
+                    for match in _THREAD_ID_RE.finditer(line):
+                        thread_id = match.group(0).decode('ascii')
+                        if cmd_id == CMD_THREAD_CREATE:
+                            thread_ids.add(thread_id)
+                        else:
+                            thread_ids.discard(thread_id)
+
+            broadcast = self._broadcast_seqs.get(seq)
+            if broadcast is not None:
+                answered, pending = broadcast
+                pending.discard(pid)
+                if not pending:
+                    del self._broadcast_seqs[seq]  # All the children answered.
+                if answered:
+                    return
+                broadcast[0] = True
+        finally:
+            self._lock.release()
+
+        self.send_upstream(line)
+
+    def _update_replay(self, cmd_id, line):
+        # Note: called with the lock held.
+        text = line.split(_TAB, 2)[-1]
+        if cmd_id == CMD_IGNORE_THROWN_EXCEPTION_AT and text.startswith(_REPLACE):
+            for key in list(self._replay):
+                if key[0] == CMD_IGNORE_THROWN_EXCEPTION_AT:
+                    del self._replay[key]
+
+        key, removes = _get_replay_key(cmd_id, text)
+        if removes:
+            self._replay.pop(key, None)
+        else:
+            # An updated state keeps its position (i.e.: the version is still replayed before the breakpoints).
+            previous = self._replay.get(key)
+            if previous is not None:
+                order = previous[0]
+            else:
+                self._replay_order += 1
+                order = self._replay_order
+            self._replay[key] = (order, line)
+
+    def _add_broadcast_seq(self, seq, pids, answered=False):
+        # Note: called with the lock held.
+        broadcast = self._broadcast_seqs.get(seq)
+        if broadcast is not None:
+            broadcast[1].update(pids)
+            return
+        order = self._broadcast_seqs_order
+        order.append(seq)
+        while len(order) > MAX_BROADCAST_SEQS:
+            self._broadcast_seqs.pop(order.popleft(), None)
+        self._broadcast_seqs[seq] = [answered, set(pids)]
+
+    def on_upstream_message(self, line):
+        cmd_id, seq = _parse_line(line)
+        match = _THREAD_ID_RE.search(line)
+
+        self._lock.acquire()
+        try:
+            if match is not None:
+                targets = []
+                sock = self._children.get(int(match.group(1)))
+                if sock is not None:
+                    targets.append(sock)
+            else:
+                targets = list(self._children.values())
+                if seq is not None and targets:
+                    self._add_broadcast_seq(seq, self._children)
+                if cmd_id in REPLAYED_COMMANDS:
+                    self._update_replay(cmd_id, line)
+
+            for sock in targets:
+                try:
+                    sock.sendall(line + _NEW_LINE)
+                except:
+                    pass  # The child reader will remove it.
+        finally:
+            self._lock.release()
+
+
+class _RelayAcceptThread(PyDBDaemonThread):
+
+    def __init__(self, relay):
+        PyDBDaemonThread.__init__(self)
+        self.relay = relay
+        self.setName('pydevd.RelayAccept')
+
+    def _on_run(self):
+        self._stop_trace()
+        while not self.killReceived:
+            try:
+                sock, _addr = self.relay._server.accept()
+            except:
+                return
+            _RelayChildReaderThread(self.relay, sock).start()
+
+
+class _RelayChildReaderThread(PyDBDaemonThread):
+
+    def __init__(self, relay, sock):
+        PyDBDaemonThread.__init__(self)
+        self.relay = relay
+        self.sock = sock
+        self.setName('pydevd.RelayChildReader')
+
+    def _on_run(self):
+        self._stop_trace()
+        pid = None
+        try:
+            for line in _iter_lines(self.sock):
+                if pid is None:
+                    pid = int(line)
+                    self.relay.add_child(pid, self.sock)
+                else:
+                    self.relay.on_child_message(pid, line)
+        except:
+            traceback.print_exc()
+        if pid is not None:
+            self.relay.remove_child(pid)
+        try:
+            self.sock.close()
+        except:
+            pass
+
+
+class _RelayUpstreamReaderThread(PyDBDaemonThread):
+
+    def __init__(self, relay, sock):
+        PyDBDaemonThread.__init__(self)
+        self.relay = relay
+        self.sock = sock
+        self.setName('pydevd.RelayUpstreamReader')
+
+    def _on_run(self):
+        self._stop_trace()
+        try:
+            for line in _iter_lines(self.sock):
+                self.relay.on_upstream_message(line)
+        except:
+            traceback.print_exc()
+        # The IDE finished the session: finish the children connections too.
+        self.relay.close()
+
+
+_relay = None
+
+
+def start_relay(host, port):
+    '''
+    Starts the relay in this process (if no relay is available yet).
+    '''
+    global _relay
+    if _relay is not None or get_relay_address():
+        return _relay
+    relay = Relay(host, port)
+    try:
+        relay.start()
+    except:
+        sys.stderr.write('pydev debugger: unable to start the multiprocess relay.\n')
+        traceback.print_exc()
+        relay.close()
+        return None
+    _relay = relay
+    return relay
@@ -170,6 +170,11 @@ class DefaultResolver:
         return names
 
     def _getPyDictionary(self, var, names=None):
+        # IFDEF CYTHON
+        # cdef bint filterPrivate, filterSpecial, filterFunction, filterBuiltIn;
+        # cdef dict d;
+        # ELSE
+        # ENDIF
         filterPrivate = False
         filterSpecial = True
         filterFunction = True
@@ -253,6 +258,10 @@ class DictResolver:
             return key
 
     def get_dictionary(self, dict):
+        # IFDEF CYTHON
+        # cdef int i;
+        # ELSE
+        # ENDIF
         ret = {}
 
         i = 0
@@ -291,6 +300,11 @@ class TupleResolver: #to enumerate tuples and lists
             return getattr(var, attribute)
 
     def get_dictionary(self, var):
+        # IFDEF CYTHON
+        # cdef dict d;
+        # cdef int i;
+        # ELSE
+        # ENDIF
         l = len(var)
         d = {}
 
@@ -338,6 +352,11 @@ class SetResolver:
         raise UnableToResolveVariableException('Unable to resolve %s in %s' % (attribute, var))
 
     def get_dictionary(self, var):
+        # IFDEF CYTHON
+        # cdef dict d;
+        # cdef int i;
+        # ELSE
+        # ENDIF
         d = {}
         i = 0
         for item in var:
@@ -5,12 +5,26 @@ except ImportError:
     pass
 else:
     trace._warn = lambda *args: None   # workaround for http://bugs.python.org/issue17143 (PY-8706)
+    try:
+        _modname = trace.modname
+    except AttributeError:
+        _modname = trace._modname  # trace.modname was made private in Python 3.6
 
 from _pydevd_bundle.pydevd_comm import CMD_SIGNATURE_CALL_TRACE, NetCommand
 from _pydevd_bundle import pydevd_xml
 from _pydevd_bundle.pydevd_constants import xrange, dict_iter_items
 from _pydevd_bundle import pydevd_utils
 from _pydevd_bundle.pydevd_utils import get_clsname_for_code
+from _pydev_imps._pydev_saved_modules import thread
+
+# In the sampled mode, after this number of distinct signatures is found for some code object...
+SAMPLED_SIGNATURES_BEFORE_SAMPLING = 10
+
+# ... only 1 in each SAMPLED_SIGNATURES_RATE calls to it is actually checked.
+SAMPLED_SIGNATURES_RATE = 100
+
+# Max number of signatures sent in a single message (in the sampled mode).
+SIGNATURES_PER_MESSAGE = 100
 
 class Signature(object):
     def __init__(self, file, name):
@@ -76,9 +90,22 @@ def get_type_of_value(value, ignore_module_name=('__main__', '__builtin__', 'bui
 
 
 class SignatureFactory(object):
-    def __init__(self):
+    def __init__(self, sampled=False):
+        '''
+        :param bool sampled:
+            If True, calls are first checked with a cheap key (code object, types of the arguments)
+            and, after SAMPLED_SIGNATURES_BEFORE_SAMPLING distinct signatures are found for a code
+            object, only some of its calls are checked. The signatures found are sent in batches
+            (see: flush_signatures), so, the collection may be kept on in long runs.
+        '''
         self._caller_cache = {}
         self.cache = CallSignatureCache()
+        self.sampled = sampled
+
+        self._code_to_arg_types = {}
+        self._code_to_calls = {}
+        self._pending_signatures = []
+        self._pending_signatures_lock = thread.allocate_lock()
 
     def is_in_scope(self, filename):
         return not pydevd_utils.not_in_project_roots(filename)
@@ -95,11 +122,57 @@ class SignatureFactory(object):
             traceback.print_exc()
 
 
+    def collect_call_signature(self, frame):
+        '''
+        Used in the sampled mode: the signature is only created (and kept to be sent in the next
+        flush) if the types of the arguments weren't seen before for the code object.
+
+        :return bool: whether a new signature was collected.
+        '''
+        code = frame.f_code
+        seen = self._code_to_arg_types.get(code)
+        if seen is None:
+            seen = self._code_to_arg_types[code] = set()
+
+        elif len(seen) >= SAMPLED_SIGNATURES_BEFORE_SAMPLING:
+            calls = self._code_to_calls.get(code, 0) + 1
+            self._code_to_calls[code] = calls
+            if calls % SAMPLED_SIGNATURES_RATE != 0:
+                return False
+
+        f_locals = frame.f_locals
+        varnames = code.co_varnames
+        arg_types = tuple([type(f_locals[varnames[i]]) for i in xrange(0, code.co_argcount)])
+        if arg_types in seen:
+            return False
+        seen.add(arg_types)
+
+        signature = self.create_signature(frame)
+        if signature is None or self.cache.is_in_cache(signature):
+            return False
+
+        self.cache.add(signature)
+        self._pending_signatures_lock.acquire()
+        try:
+            self._pending_signatures.append(signature)
+        finally:
+            self._pending_signatures_lock.release()
+        return True
+
+    def pop_pending_signatures(self):
+        self._pending_signatures_lock.acquire()
+        try:
+            pending = self._pending_signatures
+            self._pending_signatures = []
+            return pending
+        finally:
+            self._pending_signatures_lock.release()
+
     def file_module_function_of(self, frame): #this code is take from trace module and fixed to work with new-style classes
         code = frame.f_code
         filename = code.co_filename
         if filename:
-            modulename = trace.modname(filename)
+            modulename = _modname(filename)
         else:
             modulename = None
 
@@ -150,9 +223,7 @@ class CallSignatureCache(object):
         return False
 
 
-def create_signature_message(signature):
-    cmdTextList = ["<xml>"]
-
+def _append_signature_xml(cmdTextList, signature):
     cmdTextList.append('<call_signature file="%s" name="%s">' % (pydevd_xml.make_valid_xml_value(signature.file), pydevd_xml.make_valid_xml_value(signature.name)))
 
     for arg in signature.args:
@@ -161,13 +232,43 @@ def create_signature_message(signature):
     if signature.return_type is not None:
         cmdTextList.append('<return type="%s"></return>' % (pydevd_xml.make_valid_xml_value(signature.return_type)))
 
-    cmdTextList.append("</call_signature></xml>")
+    cmdTextList.append("</call_signature>")
+
+
+def create_signature_message(signature):
+    cmdTextList = ["<xml>"]
+    _append_signature_xml(cmdTextList, signature)
+    cmdTextList.append("</xml>")
     cmdText = ''.join(cmdTextList)
     return NetCommand(CMD_SIGNATURE_CALL_TRACE, 0, cmdText)
 
 
+def create_signatures_message(signatures):
+    cmdTextList = ["<xml>"]
+    for signature in signatures:
+        _append_signature_xml(cmdTextList, signature)
+    cmdTextList.append("</xml>")
+    cmdText = ''.join(cmdTextList)
+    return NetCommand(CMD_SIGNATURE_CALL_TRACE, 0, cmdText)
+
+
+def flush_signatures(dbg):
+    '''
+    Sends the signatures collected in the sampled mode (a message for each SIGNATURES_PER_MESSAGE).
+    '''
+    if dbg.signature_factory is None or dbg.writer is None:
+        return
+    pending = dbg.signature_factory.pop_pending_signatures()
+    for i in xrange(0, len(pending), SIGNATURES_PER_MESSAGE):
+        dbg.writer.add_command(create_signatures_message(pending[i:i + SIGNATURES_PER_MESSAGE]))
+
+
 def send_signature_call_trace(dbg, frame, filename):
     if dbg.signature_factory and dbg.signature_factory.is_in_scope(filename):
+        if dbg.signature_factory.sampled:
+            # Will be sent in the next flush_signatures().
+            return dbg.signature_factory.collect_call_signature(frame)
+
         signature = dbg.signature_factory.create_signature(frame)
         if signature is not None:
             if dbg.signature_factory.cache is not None:
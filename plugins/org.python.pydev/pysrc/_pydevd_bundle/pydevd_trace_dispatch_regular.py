@@ -101,12 +101,6 @@ class ThreadTracer:
             except:
                 abs_path_real_path_and_base = get_abs_path_real_path_and_base_from_frame(frame)
 
-            if py_db.thread_analyser is not None:
-                py_db.thread_analyser.log_event(frame)
-
-            if py_db.asyncio_analyser is not None:
-                py_db.asyncio_analyser.log_event(frame)
-
             file_type = get_file_type(abs_path_real_path_and_base[-1]) #we don't want to debug threading or anything related to pydevd
 
             if file_type is not None:
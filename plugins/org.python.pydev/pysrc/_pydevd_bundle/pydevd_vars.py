@@ -292,10 +292,12 @@ def custom_operation(thread_id, frame_id, scope, attrs, style, code_or_file, ope
         traceback.print_exc()
 
 
-def eval_in_context(expression, globals, locals):
+def eval_in_context(expression, globals, locals, compiled=None):
     result = None
     try:
-        result = eval(expression, globals, locals)
+        if compiled is None:
+            compiled = expression
+        result = eval(compiled, globals, locals)
     except Exception:
         s = StringIO()
         traceback.print_exc(file=s)
@@ -369,6 +371,82 @@ def evaluate_expression(thread_id, frame_id, expression, doExec):
         del frame
 
 
+#=======================================================================================================================
+# Batch evaluation
+#=======================================================================================================================
+# expression -> (code, has_nested_scopes) or the exception raised when compiling it. Kept for the whole session so that
+# watches re-evaluated at each stop are only compiled once.
+_compiled_expressions = {}
+MAX_COMPILED_EXPRESSIONS = 1000
+
+
+def _compile_expression(expression):
+    try:
+        compiled = _compiled_expressions[expression]
+    except KeyError:
+        try:
+            code = compile(expression, '<string>', 'eval')
+        except Exception:
+            compiled = None  # The error is reported when evaluating (see: evaluate_expressions).
+        else:
+            # Names used in nested scopes (generator expressions, lambdas, comprehensions in Python 3) are only
+            # looked up in the globals (and not in the locals passed to eval).
+            has_nested_scopes = False
+            for const in code.co_consts:
+                if hasattr(const, 'co_code'):
+                    has_nested_scopes = True
+                    break
+            compiled = (code, has_nested_scopes)
+
+        if len(_compiled_expressions) >= MAX_COMPILED_EXPRESSIONS:
+            _compiled_expressions.clear()
+        _compiled_expressions[expression] = compiled
+    return compiled
+
+
+def evaluate_expressions(thread_id, frame_id, expressions):
+    '''Evaluates many expressions in the same frame.
+
+    Each expression is compiled only once (the code is reused in subsequent evaluations) and evaluated with the
+    frame globals and locals (no copy of the namespaces is done unless some expression has a nested scope).
+
+    @return: a list with the result of each expression (an ExceptionOnEvaluate for expressions which failed) or
+        None if the frame was not found.
+    '''
+    frame = find_frame(thread_id, frame_id)
+    if frame is None:
+        return
+
+    updated_globals = None
+    try:
+        f_globals = frame.f_globals
+        f_locals = frame.f_locals
+        results = []
+        for expression in expressions:
+            expression = str(expression.replace('@LINE@', '\n'))
+            compiled = _compile_expression(expression)
+            if compiled is None:
+                # Let eval_in_context compile it again so that the error is reported just as in evaluate_expression.
+                results.append(eval_in_context(expression, f_globals, f_locals))
+                continue
+
+            code, has_nested_scopes = compiled
+            if has_nested_scopes:
+                if updated_globals is None:
+                    # See: evaluate_expression (locals later because it has precedence over the actual globals).
+                    updated_globals = {}
+                    updated_globals.update(f_globals)
+                    updated_globals.update(f_locals)
+                results.append(eval_in_context(expression, updated_globals, f_locals, code))
+            else:
+                results.append(eval_in_context(expression, f_globals, f_locals, code))
+        return results
+    finally:
+        # Should not be kept alive if an exception happens and this frame is kept in the stack.
+        del updated_globals
+        del frame
+
+
 def change_attr_expression(thread_id, frame_id, attr, expression, dbg, value=SENTINEL_VALUE):
     '''Changes some attribute in a given frame.
     '''
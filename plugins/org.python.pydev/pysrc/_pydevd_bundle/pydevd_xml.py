@@ -1,11 +1,22 @@
 from _pydev_bundle import pydev_log
 import traceback
-from _pydevd_bundle import pydevd_resolver
 import sys
 from _pydevd_bundle.pydevd_constants import dict_contains, dict_iter_items, dict_keys, IS_PY3K, \
     MAXIMUM_VARIABLE_REPRESENTATION_SIZE, RETURN_VALUES_DICT
+# IFDEF CYTHON
+# # The resolvers are compiled in this same module (see: build_tools/generate_code.py).
+# ELSE
+from _pydevd_bundle.pydevd_resolver import defaultResolver, dictResolver, tupleResolver, instanceResolver, \
+    jyArrayResolver, setResolver, ndarrayResolver, multiValueDictResolver, djangoFormResolver, dequeResolver, \
+    frameResolver
+# ENDIF
 
 from _pydev_bundle.pydev_imports import quote
+from _pydevd_bundle.pydevd_utils import quote_smart, to_string
+from _pydev_bundle._pydev_filesystem_encoding import getfilesystemencoding
+import pydevd_file_utils
+
+file_system_encoding = getfilesystemencoding()
 
 try:
     import types
@@ -44,9 +55,9 @@ def _update_type_map():
                 (float, None),
                 (complex, None),
                 (str, None),
-                (tuple, pydevd_resolver.tupleResolver),
-                (list, pydevd_resolver.tupleResolver),
-                (dict, pydevd_resolver.dictResolver),
+                (tuple, tupleResolver),
+                (list, tupleResolver),
+                (dict, dictResolver),
         ]
 
         try:
@@ -60,43 +71,43 @@ def _update_type_map():
             pass #not available on all python versions
 
         try:
-            _TYPE_MAP.append((set, pydevd_resolver.setResolver))
+            _TYPE_MAP.append((set, setResolver))
         except:
             pass #not available on all python versions
 
         try:
-            _TYPE_MAP.append((frozenset, pydevd_resolver.setResolver))
+            _TYPE_MAP.append((frozenset, setResolver))
         except:
             pass #not available on all python versions
 
         try:
             import numpy
-            _TYPE_MAP.append((numpy.ndarray, pydevd_resolver.ndarrayResolver))
+            _TYPE_MAP.append((numpy.ndarray, ndarrayResolver))
         except:
             pass  #numpy may not be installed
 
         try:
             from django.utils.datastructures import MultiValueDict
-            _TYPE_MAP.insert(0, (MultiValueDict, pydevd_resolver.multiValueDictResolver))
+            _TYPE_MAP.insert(0, (MultiValueDict, multiValueDictResolver))
             #we should put it before dict
         except:
             pass  #django may not be installed
 
         try:
             from django.forms import BaseForm
-            _TYPE_MAP.insert(0, (BaseForm, pydevd_resolver.djangoFormResolver))
+            _TYPE_MAP.insert(0, (BaseForm, djangoFormResolver))
             #we should put it before instance resolver
         except:
             pass  #django may not be installed
 
         try:
             from collections import deque
-            _TYPE_MAP.append((deque, pydevd_resolver.dequeResolver))
+            _TYPE_MAP.append((deque, dequeResolver))
         except:
             pass
 
         if frame_type is not None:
-            _TYPE_MAP.append((frame_type, pydevd_resolver.frameResolver))
+            _TYPE_MAP.append((frame_type, frameResolver))
 
 
     else: #platform is java
@@ -108,15 +119,15 @@ def _update_type_map():
                 (core.PyFloat, None),
                 (core.PyComplex, None),
                 (core.PyString, None),
-                (core.PyTuple, pydevd_resolver.tupleResolver),
-                (core.PyList, pydevd_resolver.tupleResolver),
-                (core.PyDictionary, pydevd_resolver.dictResolver),
-                (core.PyStringMap, pydevd_resolver.dictResolver),
+                (core.PyTuple, tupleResolver),
+                (core.PyList, tupleResolver),
+                (core.PyDictionary, dictResolver),
+                (core.PyStringMap, dictResolver),
         ]
 
         if hasattr(core, 'PyJavaInstance'):
             #Jython 2.5b3 removed it.
-            _TYPE_MAP.append((core.PyJavaInstance, pydevd_resolver.instanceResolver))
+            _TYPE_MAP.append((core.PyJavaInstance, instanceResolver))
 
 
 def get_type(o):
@@ -138,10 +149,10 @@ def get_type(o):
     try:
 
         if type_name == 'org.python.core.PyJavaInstance':
-            return (type_object, type_name, pydevd_resolver.instanceResolver)
+            return (type_object, type_name, instanceResolver)
 
         if type_name == 'org.python.core.PyArray':
-            return (type_object, type_name, pydevd_resolver.jyArrayResolver)
+            return (type_object, type_name, jyArrayResolver)
 
         if _TYPE_MAP is None:
             _update_type_map()
@@ -152,7 +163,7 @@ def get_type(o):
         traceback.print_exc()
 
     #no match return default
-    return (type_object, type_name, pydevd_resolver.defaultResolver)
+    return (type_object, type_name, defaultResolver)
 
 
 def return_values_from_dict_to_xml(return_dict):
@@ -166,6 +177,10 @@ def frame_vars_to_xml(frame_f_locals, hidden_ns=None):
     """ dumps frame variables to XML
     <var name="var_name" scope="local" type="type" value="value"/>
     """
+    # IFDEF CYTHON
+    # cdef list keys;
+    # ELSE
+    # ENDIF
     xml = ""
 
     keys = dict_keys(frame_f_locals)
@@ -198,6 +213,11 @@ def frame_vars_to_xml(frame_f_locals, hidden_ns=None):
 
 def var_to_xml(val, name, doTrim=True, additional_in_xml=''):
     """ single variable or dictionary to xml representation """
+    # IFDEF CYTHON
+    # cdef bint is_exception_on_eval;
+    # cdef bint do_not_call_value_str;
+    # ELSE
+    # ENDIF
 
     try:
         # This should be faster than isinstance (but we have to protect against not having a '__class__' attribute).
@@ -217,7 +237,7 @@ def var_to_xml(val, name, doTrim=True, additional_in_xml=''):
     try:
         if hasattr(v, '__class__'):
             if v.__class__ == frame_type:
-                value = pydevd_resolver.frameResolver.get_frame_name(v)
+                value = frameResolver.get_frame_name(v)
 
             elif v.__class__ in (list, tuple):
                 if len(v) > 300:
@@ -293,3 +313,86 @@ def var_to_xml(val, name, doTrim=True, additional_in_xml=''):
 
     return ''.join((xml, xml_qualifier, xml_value, xml_container, additional_in_xml, ' />\n'))
 
+
+
+def make_net_command_line(id, seq, text):
+    """ the line sent for a NetCommand (id, seq and the quoted text separated by tabs) """
+    return '%s\t%s\t%s\n' % (id, seq, quote_smart(to_string(text), '/<>_=" \t'))
+
+
+def make_thread_suspend_str(thread_id, frame, stop_reason, message):
+    """ <xml>
+        <thread id="id" stop_reason="reason">
+                <frame id="id" name="functionName " file="file" line="line">
+                <var variable stuffff....
+            </frame>
+        </thread>
+    """
+    # IFDEF CYTHON
+    # cdef list cmd_text_list;
+    # ELSE
+    # ENDIF
+    cmd_text_list = ["<xml>"]
+    append = cmd_text_list.append
+
+    if message:
+        message = make_valid_xml_value(message)
+
+    append('<thread id="%s" stop_reason="%s" message="%s">' % (thread_id, stop_reason, message))
+
+    curr_frame = frame
+    try:
+        while curr_frame:
+            my_id = id(curr_frame)
+
+            if curr_frame.f_code is None:
+                break #Iron Python sometimes does not have it!
+
+            my_name = curr_frame.f_code.co_name #method name (if in method) or ? if global
+            if my_name is None:
+                break #Iron Python sometimes does not have it!
+
+            abs_path_real_path_and_base = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(curr_frame)
+
+            myFile = pydevd_file_utils.norm_file_to_client(abs_path_real_path_and_base[0])
+            if file_system_encoding.lower() != "utf-8" and hasattr(myFile, "decode"):
+                # myFile is a byte string encoded using the file system encoding
+                # convert it to utf8
+                myFile = myFile.decode(file_system_encoding).encode("utf-8")
+
+            myLine = str(curr_frame.f_lineno)
+
+            #the variables are all gotten 'on-demand'
+            append('<frame id="%s" name="%s" ' % (my_id , make_valid_xml_value(my_name)))
+            append('file="%s" line="%s">' % (quote_smart(myFile, '/>_= \t'), myLine))
+            append("</frame>")
+            curr_frame = curr_frame.f_back
+    except :
+        traceback.print_exc()
+
+    append("</thread></xml>")
+    return ''.join(cmd_text_list)
+
+
+#=======================================================================================================================
+# Compiled version
+#=======================================================================================================================
+# IFDEF CYTHON
+# ELSE
+# The functions in this module (and the resolvers) are also compiled with cython in pydevd_cython_xml (generated
+# by build_tools/generate_code.py). When it's available it's used instead of the pure python version.
+import os
+_use_cython = os.getenv('PYDEVD_USE_CYTHON', None)
+
+if _use_cython != 'NO':
+    if _use_cython not in (None, 'YES'):
+        raise RuntimeError('Unexpected value for PYDEVD_USE_CYTHON: %s (accepted: YES, NO)' % (_use_cython,))
+    try:
+        from _pydevd_bundle.pydevd_cython_xml_wrapper import ExceptionOnEvaluate, get_type, \
+            return_values_from_dict_to_xml, frame_vars_to_xml, var_to_xml, make_valid_xml_value, \
+            make_net_command_line, make_thread_suspend_str
+    except ImportError:
+        # The compiled module is optional (even if the tracing speedups are available), so, just keep on
+        # with the pure python version.
+        pass
+# ENDIF
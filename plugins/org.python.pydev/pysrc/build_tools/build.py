@@ -13,7 +13,8 @@ import os
 import subprocess
 import sys
 
-from generate_code import remove_if_exists, root_dir, is_python_64bit, generate_dont_trace_files, generate_cython_module
+from generate_code import remove_if_exists, root_dir, is_python_64bit, generate_dont_trace_files, generate_cython_module, \
+    generate_cython_xml_module
 
 
 def validate_pair(ob):
@@ -163,6 +164,7 @@ if __name__ == '__main__':
         if '--no-regenerate-files' not in sys.argv:
             generate_dont_trace_files()
             generate_cython_module()
+            generate_cython_xml_module()
         build()
     else:
         raise RuntimeError('Unexpected value for PYDEVD_USE_CYTHON: %s (accepted: YES, NO)' % (use_cython,))
@@ -85,10 +85,12 @@ def extract_version(python_install):
 def main():
     from generate_code import generate_dont_trace_files
     from generate_code import generate_cython_module
+    from generate_code import generate_cython_xml_module
 
     # First, make sure that our code is up to date.
     generate_dont_trace_files()
     generate_cython_module()
+    generate_cython_xml_module()
 
     for python_install in python_installations:
         assert os.path.exists(python_install)
@@ -180,6 +180,27 @@ def generate_cython_module():
         else:
             os.environ['PYDEVD_USE_CYTHON'] = curr
 
+def generate_cython_xml_module():
+    '''
+    The resolvers and the xml serialization (pydevd_resolver + pydevd_xml) are compiled in a separate module
+    (pydevd_cython_xml), which pydevd_xml uses when available.
+    '''
+    target = os.path.join(root_dir, '_pydevd_bundle', 'pydevd_cython_xml.pyx')
+    remove_if_exists(target)
+
+    curr = os.environ.get('PYDEVD_USE_CYTHON')
+    try:
+        os.environ['PYDEVD_USE_CYTHON'] = 'NO'
+
+        from _pydevd_bundle import pydevd_resolver, pydevd_xml
+        _generate_cython_from_files(target, [pydevd_resolver, pydevd_xml])
+    finally:
+        if curr is None:
+            del os.environ['PYDEVD_USE_CYTHON']
+        else:
+            os.environ['PYDEVD_USE_CYTHON'] = curr
+
 if __name__ == '__main__':
     generate_dont_trace_files()
     generate_cython_module()
+    generate_cython_xml_module()
@@ -163,14 +163,10 @@ def toasciimxl(s):
     return ret
 
 
-if __name__ == '__main__':
-    try:
-        # just give some time to get the reading threads attached (just in case)
-        import time
-        time.sleep(0.1)
-    except:
-        pass
-
+def get_interpreter_info_xml():
+    '''
+    :return: the xml (as unicode) with the interpreter information.
+    '''
     try:
         executable = tounicode(native_path(sys.executable))
     except:
@@ -207,13 +203,7 @@ if __name__ == '__main__':
 
     result = []
 
-    path_used = sys.path
-    try:
-        path_used = path_used[1:]  # Use a copy (and don't include the directory of this script as a path.)
-    except:
-        pass  # just ignore it...
-
-    for p in path_used:
+    for p in get_path_used():
         p = tounicode(native_path(p))
 
         try:
@@ -244,14 +234,154 @@ if __name__ == '__main__':
 
 
     contents.append(tounicode('</xml>'))
-    unic = tounicode('\n').join(contents)
-    inasciixml = toasciimxl(unic)
+    return tounicode('\n').join(contents)
+
+
+def get_path_used():
+    path_used = sys.path
+    try:
+        path_used = path_used[1:]  # Use a copy (and don't include the directory of this script as a path.)
+    except:
+        pass  # just ignore it...
+    return path_used
+
+
+def write_output(inasciixml):
     if IS_PYTHON_3K:
         # This is the 'official' way of writing binary output in Py3K (see: http://bugs.python.org/issue4571)
         sys.stdout.buffer.write(inasciixml)
     else:
         sys.stdout.write(inasciixml)
 
+
+#=======================================================================================================================
+# Fast mode (--fast [--cache-dir dir]; an empty dir disables the cache)
+#
+# The xml is cached in a file (one for each executable) along with a fingerprint made from the executable path and
+# the modification time of the executable and of the entries in the pythonpath (i.e.: site-packages: installing or
+# removing a package changes it). When the fingerprint matches, the cached contents are written directly. In this
+# mode we also don't sleep nor raise an error at the end.
+#=======================================================================================================================
+def get_default_cache_dir():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    if not cache_home:
+        cache_home = join(os.path.expanduser('~'), '.cache')
+    return join(join(cache_home, 'pydev'), 'interpreter_info')
+
+
+def get_fingerprint():
+    import hashlib
+    parts = []
+    for p in [sys.executable] + list(get_path_used()):
+        try:
+            mtime = os.path.getmtime(p)
+        except:
+            mtime = -1
+        parts.append('%s=%s' % (p, mtime))
+    return hashlib.md5(tobytes('\n'.join(parts))).hexdigest()
+
+
+def get_cache_file(cache_dir):
+    import hashlib
+    return join(cache_dir, 'interpreter_info_%s.xml' % (hashlib.md5(tobytes(sys.executable)).hexdigest(),))
+
+
+def get_interpreter_info_xml_cached(cache_dir):
+    '''
+    :return: the xml (as ascii bytes) with the interpreter information (from the cache if it's still valid).
+    '''
+    if not cache_dir:
+        return toasciimxl(get_interpreter_info_xml())
+
+    try:
+        fingerprint = tobytes(get_fingerprint())
+        cache_file = get_cache_file(cache_dir)
+    except:  # i.e.: no hashlib/os (old jython): just compute it.
+        return toasciimxl(get_interpreter_info_xml())
+
+    try:
+        stream = open(cache_file, 'rb')
+        try:
+            cached_fingerprint = stream.readline().strip()
+            if cached_fingerprint == fingerprint:
+                return stream.read()
+        finally:
+            stream.close()
+    except (IOError, OSError):
+        pass
+
+    inasciixml = toasciimxl(get_interpreter_info_xml())
+    try:
+        write_cache_file(cache_dir, cache_file, fingerprint + tobytes('\n') + inasciixml)
+    except (IOError, OSError):
+        pass  # Not having the cache is not fatal.
+    return inasciixml
+
+
+def write_cache_file(cache_dir, cache_file, contents):
+    '''
+    Writes the contents to a temporary file which is then renamed to the cache file (so, a concurrent
+    process never reads a partially written cache file).
+    '''
+    import tempfile
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+
+    fd, tmp_file = tempfile.mkstemp(prefix='.interpreter_info_', dir=cache_dir)
+    try:
+        stream = os.fdopen(fd, 'wb')
+        try:
+            stream.write(contents)
+        finally:
+            stream.close()
+
+        replace = getattr(os, 'replace', None)  # Python 3.3 onwards.
+        if replace is not None:
+            replace(tmp_file, cache_file)
+        else:
+            try:
+                os.rename(tmp_file, cache_file)
+            except OSError:
+                # On Windows the rename fails if the target already exists.
+                os.remove(cache_file)
+                os.rename(tmp_file, cache_file)
+    except:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+if __name__ == '__main__':
+    if '--fast' in sys.argv:
+        cache_dir = None
+        try:
+            i = sys.argv.index('--cache-dir')
+            cache_dir = sys.argv[i + 1]  # An empty dir means that no cache should be used.
+        except (ValueError, IndexError):
+            pass
+        if cache_dir is None:
+            try:
+                cache_dir = get_default_cache_dir()
+            except:
+                cache_dir = ''
+
+        write_output(get_interpreter_info_xml_cached(cache_dir))
+        sys.stdout.flush()
+        sys.exit(0)
+
+    try:
+        # just give some time to get the reading threads attached (just in case)
+        import time
+        time.sleep(0.1)
+    except:
+        pass
+
+    unic = get_interpreter_info_xml()
+    inasciixml = toasciimxl(unic)
+    write_output(inasciixml)
+
     try:
         sys.stdout.flush()
         sys.stderr.flush()
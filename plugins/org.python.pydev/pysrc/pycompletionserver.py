@@ -33,6 +33,8 @@ else:
 
 
 from _pydev_imps._pydev_saved_modules import socket
+from _pydev_imps._pydev_saved_modules import threading
+from _pydev_imps._pydev_saved_modules import _queue
 
 import sys
 if sys.platform == "darwin":
@@ -56,6 +58,7 @@ for name, mod in sys.modules.items():
 
 
 import traceback
+import struct
 
 from _pydev_imps._pydev_saved_modules import time
 
@@ -98,6 +101,18 @@ MSG_PYTHONPATH = '@@PYTHONPATH_END@@'
 MSG_CHANGE_PYTHONPATH = '@@CHANGE_PYTHONPATH:'
 MSG_JEDI = '@@MSG_JEDI:'
 MSG_SEARCH = '@@SEARCH'
+MSG_FRAMED_PROTOCOL = '@@FRAMED_PROTOCOL_END@@'
+
+# Framed protocol (negotiated by sending MSG_FRAMED_PROTOCOL as a regular message, which is answered with MSG_OK):
+#
+# After it, each message in both directions is sent as a 4-byte (big-endian) length followed by the contents (utf-8).
+#
+# - Requests are the same messages without the MSG_END and without quoting the arguments (i.e.: '@@IMPORTS:os.path').
+#   MSG_KILL_SERVER and MSG_PYTHONPATH are sent as is (and are only recognized as the whole frame).
+# - Completions are sent as MSG_COMPLETIONS followed by the file and by 4 fields (token, description, args, type) for
+#   each completion, all separated by FRAMED_SEPARATOR (so, no quoting is needed). Other responses (i.e.: MSG_OK) are
+#   sent as is.
+FRAMED_SEPARATOR = '\0'
 
 BUFFER_SIZE = 1024
 
@@ -180,10 +195,222 @@ class Processor:
 
         return '%s(%s)%s' % (MSG_COMPLETIONS, ''.join(compMsg), MSG_END)
 
+    def format_framed_completion_message(self, defFile, completionsList):
+        '''
+        Format the completions suggestions for the framed protocol:
+        @@COMPLETIONS\0modFile\0token\0description\0args\0type\0token\0description\0args\0type...
+        '''
+        fields = [MSG_COMPLETIONS, '%s' % (defFile,)]
+        for tup in completionsList:
+            for i in (0, 1, 2, 3):
+                if i < len(tup):
+                    field = tup[i]
+                    if not isinstance(field, str):
+                        try:
+                            field = str(field)
+                        except UnicodeEncodeError:
+                            field = field.encode('utf-8')
+                    fields.append(field.replace(FRAMED_SEPARATOR, ' '))
+                else:
+                    fields.append('')
+        return FRAMED_SEPARATOR.join(fields)
+
+    def format_message(self, response, framed=False):
+        '''
+        @param response: either a tuple(defFile, completionsList) or a message to be sent as is.
+        '''
+        if isinstance(response, tuple):
+            if framed:
+                return self.format_framed_completion_message(response[0], response[1])
+            return self.format_completion_message(response[0], response[1])
+        return response
+
 class Exit(Exception):
     pass
 
+
+_MSG_END_BYTES = MSG_END.encode('ascii')
+
+
+def _to_str(data):
+    '''
+    @param data: bytearray received from the socket.
+    '''
+    if IS_PYTHON3K:
+        return data.decode('utf-8')
+    return str(data)
+
+
+#=======================================================================================================================
+# Request
+#=======================================================================================================================
+class Request:
+    '''
+    A request received from the client. Requests may be handled by different workers, but their responses are always
+    sent in the same order in which they were received (the client matches the responses by order).
+    '''
+
+    def __init__(self, data, framed=False):
+        self.data = data  # The message (without the MSG_END, unless the message is a constant ending with it).
+        self.framed = framed  # If True, the arguments aren't quoted and the response is sent in a frame.
+        self.jedi_args = None  # line, column, encoding, path, source (only for MSG_JEDI).
+        self.response = None  # tuple(defFile, completionsList) or a message to be sent as is.
+        self._lock = threading.Lock()
+        self._started = False
+        self._cancelled = False
+        self._done = threading.Event()
+
+    def start(self):
+        '''
+        @return: False if the request was cancelled (in which case it shouldn't be handled).
+        '''
+        self._lock.acquire()
+        try:
+            if self._cancelled:
+                return False
+            self._started = True
+            return True
+        finally:
+            self._lock.release()
+
+    def cancel(self):
+        '''
+        @return: True if the request was cancelled (it can only be cancelled if it still wasn't started).
+        '''
+        self._lock.acquire()
+        try:
+            if not self._started:
+                self._cancelled = True
+            return self._cancelled
+        finally:
+            self._lock.release()
+
+    def is_message(self, msg):
+        '''
+        @param msg: one of the messages without arguments (i.e.: MSG_KILL_SERVER).
+        '''
+        if self.framed:
+            # The arguments in a frame aren't quoted (so, they may contain the message).
+            return self.data == msg
+        return self.data.find(msg) != -1
+
+    def get_argument(self, prefix):
+        arg = self.data[len(prefix):]
+        if not self.framed:
+            arg = unquote_plus(arg)
+        return arg
+
+    def set_response(self, response):
+        self.response = response
+        self._done.set()
+
+    def is_done(self):
+        return self._done.isSet()
+
+    def wait(self):
+        self._done.wait()
+
+
+#=======================================================================================================================
+# Worker
+#=======================================================================================================================
+class Worker(threading.Thread):
+    '''
+    Calls handle(request) for each request put in its queue (in order) until None is put in the queue.
+    '''
+
+    def __init__(self, name, handle):
+        threading.Thread.__init__(self)
+        self.setName(name)
+        self.setDaemon(True)
+        self.handle = handle
+        self.queue = _queue.Queue()
+
+    def run(self):
+        while True:
+            request = self.queue.get()
+            if request is None:
+                return
+            self.handle(request)
+
+
+#=======================================================================================================================
+# JediCompleter
+#=======================================================================================================================
+class JediCompleter:
+    '''
+    Gets the completions with jedi (only used from the jedi worker, as jedi isn't thread-safe).
+
+    The completions of the last request for each path are kept, so, a request repeated without changes in the source
+    or position isn't computed again. Also, as the path is passed to jedi, it reuses the module it parsed for that path
+    (only reparsing what changed in the source).
+    '''
+
+    MAX_PATHS = 20
+
+    def __init__(self):
+        self._last_completions = {}  # path -> ((line, column, encoding, source), completions)
+
+    def get_completions(self, line, column, encoding, path, source):
+        '''
+        @return: list(tuple(name, doc, args, type))
+        '''
+        key = (line, column, encoding, source)
+        last = self._last_completions.get(path)
+        if last is not None and last[0] == key:
+            return last[1]
+
+        import jedi  # @UnresolvedImport
+        script = jedi.Script(
+            # Line +1 because it expects lines 1-based (and col 0-based)
+            source=source,
+            line=int(line) + 1,
+            column=int(column),
+            source_encoding=encoding,
+            path=path,
+        )
+        lst = []
+        for completion in script.completions():
+            t = completion.type
+            if t == 'class':
+                t = '1'
+
+            elif t == 'function':
+                t = '2'
+
+            elif t == 'import':
+                t = '0'
+
+            elif t == 'keyword':
+                continue  # Keywords are already handled in PyDev
+
+            elif t == 'statement':
+                t = '3'
+
+            else:
+                t = '-1'
+
+            # gen list(tuple(name, doc, args, type))
+            lst.append((completion.name, '', '', t))
+
+        if len(self._last_completions) >= self.MAX_PATHS:
+            self._last_completions.clear()
+        self._last_completions[path] = (key, lst)
+        return lst
+
+
+#=======================================================================================================================
+# CompletionServer
+#=======================================================================================================================
 class CompletionServer:
+    '''
+    Reads the requests from the socket and dispatches them: jedi requests go to the jedi worker and the imports/search
+    requests go to the tipper worker (so, they can be handled while jedi is working). Requests which change the
+    sys.path are handled after all the previous requests are done.
+
+    A jedi request which still wasn't started is cancelled when a newer request for the same path is received (its
+    response is an empty list of completions).
+    '''
 
     def __init__(self, port):
         self.ended = False
@@ -191,6 +418,14 @@ class CompletionServer:
         self.socket = None  # socket to send messages.
         self.exit_process_on_kill = True
         self.processor = Processor()
+        self.jedi_completer = JediCompleter()
+        self.framed = False
+        self._buffer = bytearray()
+        self._in_flight = []  # Requests dispatched to the workers.
+        self._jedi_requests = {}  # path -> last jedi request for the path
+        self._jedi_worker = None
+        self._tipper_worker = None
+        self._sender = None
 
 
     def connect_to_server(self):
@@ -244,134 +479,257 @@ class CompletionServer:
                 self.socket.sendall(msg)
 
 
+    def read_message(self):
+        '''
+        @return: the next message received (up to MSG_END, inclusive). Any contents received after it are kept for
+            the next message.
+        '''
+        data = self._buffer
+        search_from = 0
+        while True:
+            i = data.find(_MSG_END_BYTES, search_from)
+            if i != -1:
+                break
+            # Only search the new contents (and the end of the previous ones, where the MSG_END could start).
+            search_from = max(0, len(data) - len(_MSG_END_BYTES) + 1)
+            received = self.socket.recv(BUFFER_SIZE)
+            if len(received) == 0:
+                raise Exit()  # ok, connection ended
+            data.extend(received)
+
+        i += len(_MSG_END_BYTES)
+        self._buffer = data[i:]
+        return _to_str(data[:i])
+
+    def read_frame(self):
+        '''
+        @return: the contents of the next frame received (see: MSG_FRAMED_PROTOCOL).
+        '''
+        size = struct.unpack('>I', bytes(self._read_exactly(4)))[0]
+        return _to_str(self._read_exactly(size))
+
+    def _read_exactly(self, size):
+        '''
+        @return: bytearray with the given size (received in a buffer allocated with the needed size).
+        '''
+        buf = bytearray(size)
+        pos = min(size, len(self._buffer))
+        if pos:
+            buf[:pos] = self._buffer[:pos]
+            del self._buffer[:pos]
+
+        recv_into = getattr(self.socket, 'recv_into', None)
+        if recv_into is not None:
+            view = memoryview(buf)
+            while pos < size:
+                received = recv_into(view[pos:], size - pos)
+                if received == 0:
+                    raise Exit()  # ok, connection ended
+                pos += received
+        else:
+            while pos < size:
+                received = self.socket.recv(size - pos)
+                if len(received) == 0:
+                    raise Exit()  # ok, connection ended
+                buf[pos:pos + len(received)] = received
+                pos += len(received)
+        return buf
+
+    def read_request(self):
+        '''
+        @return: Request with the next message received.
+        '''
+        if self.framed:
+            return Request(self.read_frame(), True)
+
+        data = self.read_message()
+        for msg in (MSG_PYTHONPATH, MSG_KILL_SERVER, MSG_FRAMED_PROTOCOL):
+            if data.find(msg) != -1:
+                return Request(data)
+        return Request(data[:data.rfind(MSG_END)])
+
+    def start_workers(self):
+        self._jedi_worker = Worker('Jedi worker', self.handle_request)
+        self._tipper_worker = Worker('Tipper worker', self.handle_request)
+        self._sender = Worker('Responses sender', self.send_response)
+        for worker in (self._jedi_worker, self._tipper_worker, self._sender):
+            worker.start()
+
+    def stop_workers(self):
+        '''
+        Stops the workers after the requests already received are handled (and their responses are sent).
+        '''
+        for worker in (self._jedi_worker, self._tipper_worker, self._sender):
+            if worker is not None:
+                worker.queue.put(None)
+        if self._sender is not None:
+            self._sender.join()
+
+    def wait_in_flight(self):
+        for request in self._in_flight:
+            request.wait()
+        del self._in_flight[:]
+        self._jedi_requests.clear()
+
+    def _add_in_flight(self, request):
+        if len(self._in_flight) > 50:
+            self._in_flight = [r for r in self._in_flight if not r.is_done()]
+        self._in_flight.append(request)
+
+    def dispatch(self, request):
+        '''
+        Puts the request in the queue of responses to be sent and handles it (or gives it to a worker).
+        '''
+        self._sender.queue.put(request)
+        data = request.data
+
+        if not request.is_message(MSG_PYTHONPATH):
+            if data.startswith(MSG_JEDI):
+                request.jedi_args = request.get_argument(MSG_JEDI).split('|', 4)
+                if len(request.jedi_args) == 5:
+                    path = request.jedi_args[3]
+                    previous = self._jedi_requests.get(path)
+                    if previous is not None:
+                        previous.cancel()
+                    self._jedi_requests[path] = request
+                    self._add_in_flight(request)
+                    self._jedi_worker.queue.put(request)
+                    return
+                # Malformed request: handled below (so, its response is the error).
+
+            if data.startswith(MSG_IMPORTS) or data.startswith(MSG_SEARCH):
+                self._add_in_flight(request)
+                self._tipper_worker.queue.put(request)
+                return
+
+        # The other requests (i.e.: changing the pythonpath) are handled after the previous ones are done.
+        self.wait_in_flight()
+        self.handle_request(request)
+
+    def handle_request(self, request):
+        if not request.start():
+            # A newer request for the same path was received.
+            request.set_response(('empty', []))
+            return
+
+        from _pydev_bundle import _pydev_log
+        log = _pydev_log.Log()
+        try:
+            response = self.process_request(request, log)
+        except:
+            response = self.get_error_response(log)
+        request.set_response(response)
+
+    def get_error_response(self, log=None):
+        '''
+        @return: the response for a request whose handling raised the exception being handled.
+        '''
+        dbg(SERVER_NAME + ' exception occurred', ERROR)
+        s = StringIO.StringIO()
+        traceback.print_exc(file=s)
+
+        err = s.getvalue()
+        dbg(SERVER_NAME + ' received error: ' + str(err), ERROR)
+        if log is not None:
+            err = '%s\nLog:%s' % (err, log.get_contents())
+        return (None, [('ERROR:', err, '')])
+
+    def process_request(self, request, log):
+        '''
+        @return: the response to the given request: tuple(defFile, completionsList) or a message to be sent as is.
+        '''
+        data = request.data
+        if request.is_message(MSG_PYTHONPATH):
+            comps = []
+            for p in _sys_path:
+                comps.append((p, ' '))
+            return (None, comps)
+
+        if data.startswith(MSG_IMPORTS):
+            data = request.get_argument(MSG_IMPORTS)
+            defFile, comps = _pydev_imports_tipper.generate_tip(data, log)
+            return (defFile, comps)
+
+        elif data.startswith(MSG_CHANGE_PYTHONPATH):
+            change_python_path(request.get_argument(MSG_CHANGE_PYTHONPATH))
+            return MSG_OK
+
+        elif data.startswith(MSG_JEDI):
+            line, column, encoding, path, source = request.jedi_args
+            try:
+                import jedi  # @UnresolvedImport @UnusedImport
+            except:
+                return (None, [('Error on import jedi', 'Error importing jedi', '')])
+            else:
+                return ('empty', self.jedi_completer.get_completions(line, column, encoding, path, source))
+
+        elif data.startswith(MSG_SEARCH):
+            data = request.get_argument(MSG_SEARCH)
+            (f, line, col), foundAs = _pydev_imports_tipper.search_definition(data)
+            return (f, [(line, col, foundAs)])
+
+        elif data.startswith(MSG_CHANGE_DIR):
+            complete_from_dir(request.get_argument(MSG_CHANGE_DIR))
+            return MSG_OK
+
+        elif request.is_message(MSG_FRAMED_PROTOCOL):
+            return MSG_OK
+
+        else:
+            return MSG_INVALID_REQUEST
+
+    def send_response(self, request):
+        request.wait()
+        try:
+            msg = self.processor.format_message(request.response, request.framed)
+            if request.framed:
+                self.send_frame(msg)
+            else:
+                self.send(msg)
+        except:
+            dbg(SERVER_NAME + ' error sending response', ERROR)
+
+
+    def send_frame(self, msg):
+        if IS_PYTHON3K or not isinstance(msg, str):
+            msg = msg.encode('utf-8')
+        self.socket.sendall(struct.pack('>I', len(msg)) + msg)
+
+
     def run(self):
         # Echo server program
         try:
-            from _pydev_bundle import _pydev_log
-            log = _pydev_log.Log()
-
             dbg(SERVER_NAME + ' connecting to java server on %s (%s)' % (HOST, self.port) , INFO1)
             # after being connected, create a socket as a client.
             self.connect_to_server()
 
             dbg(SERVER_NAME + ' Connected to java server', INFO1)
 
+            self.start_workers()
+            try:
+                while not self.ended:
+                    request = self.read_request()
 
-            while not self.ended:
-                data = ''
-
-                while data.find(MSG_END) == -1:
-                    received = self.socket.recv(BUFFER_SIZE)
-                    if len(received) == 0:
-                        raise Exit()  # ok, connection ended
-                    if IS_PYTHON3K:
-                        data = data + received.decode('utf-8')
-                    else:
-                        data = data + received
+                    if request.is_message(MSG_KILL_SERVER):
+                        dbg(SERVER_NAME + ' kill message received', INFO1)
+                        # break if we received kill message.
+                        self.ended = True
+                        request.set_response((None, [('Exit:', 'SystemExit', '')]))
+                        self._sender.queue.put(request)
+                        raise Exit()
 
-                try:
                     try:
-                        if data.find(MSG_KILL_SERVER) != -1:
-                            dbg(SERVER_NAME + ' kill message received', INFO1)
-                            # break if we received kill message.
-                            self.ended = True
-                            raise Exit()
-
-                        dbg(SERVER_NAME + ' starting keep alive thread', INFO2)
-
-                        if data.find(MSG_PYTHONPATH) != -1:
-                            comps = []
-                            for p in _sys_path:
-                                comps.append((p, ' '))
-                            self.send(self.get_completions_message(None, comps))
-
-                        else:
-                            data = data[:data.rfind(MSG_END)]
-
-                            if data.startswith(MSG_IMPORTS):
-                                data = data[len(MSG_IMPORTS):]
-                                data = unquote_plus(data)
-                                defFile, comps = _pydev_imports_tipper.generate_tip(data, log)
-                                self.send(self.get_completions_message(defFile, comps))
-
-                            elif data.startswith(MSG_CHANGE_PYTHONPATH):
-                                data = data[len(MSG_CHANGE_PYTHONPATH):]
-                                data = unquote_plus(data)
-                                change_python_path(data)
-                                self.send(MSG_OK)
-
-                            elif data.startswith(MSG_JEDI):
-                                data = data[len(MSG_JEDI):]
-                                data = unquote_plus(data)
-                                line, column, encoding, path, source = data.split('|', 4)
-                                try:
-                                    import jedi  # @UnresolvedImport
-                                except:
-                                    self.send(self.get_completions_message(None, [('Error on import jedi', 'Error importing jedi', '')]))
-                                else:
-                                    script = jedi.Script(
-                                        # Line +1 because it expects lines 1-based (and col 0-based)
-                                        source=source,
-                                        line=int(line) + 1,
-                                        column=int(column),
-                                        source_encoding=encoding,
-                                        path=path,
-                                    )
-                                    lst = []
-                                    for completion in script.completions():
-                                        t = completion.type
-                                        if t == 'class':
-                                            t = '1'
-
-                                        elif t == 'function':
-                                            t = '2'
-
-                                        elif t == 'import':
-                                            t = '0'
-
-                                        elif t == 'keyword':
-                                            continue  # Keywords are already handled in PyDev
-
-                                        elif t == 'statement':
-                                            t = '3'
-
-                                        else:
-                                            t = '-1'
-
-                                        # gen list(tuple(name, doc, args, type))
-                                        lst.append((completion.name, '', '', t))
-                                    self.send(self.get_completions_message('empty', lst))
-
-                            elif data.startswith(MSG_SEARCH):
-                                data = data[len(MSG_SEARCH):]
-                                data = unquote_plus(data)
-                                (f, line, col), foundAs = _pydev_imports_tipper.search_definition(data)
-                                self.send(self.get_completions_message(f, [(line, col, foundAs)]))
-
-                            elif data.startswith(MSG_CHANGE_DIR):
-                                data = data[len(MSG_CHANGE_DIR):]
-                                data = unquote_plus(data)
-                                complete_from_dir(data)
-                                self.send(MSG_OK)
-
-                            else:
-                                self.send(MSG_INVALID_REQUEST)
-                    except Exit:
-                        self.send(self.get_completions_message(None, [('Exit:', 'SystemExit', '')]))
-                        raise
-
+                        self.dispatch(request)
                     except:
-                        dbg(SERVER_NAME + ' exception occurred', ERROR)
-                        s = StringIO.StringIO()
-                        traceback.print_exc(file=s)
-
-                        err = s.getvalue()
-                        dbg(SERVER_NAME + ' received error: ' + str(err), ERROR)
-                        self.send(self.get_completions_message(None, [('ERROR:', '%s\nLog:%s' % (err, log.get_contents()), '')]))
-
-
-                finally:
-                    log.clear_log()
+                        # The request is already in the queue of the sender: it must have a response.
+                        if not request.is_done():
+                            request.set_response(self.get_error_response())
+
+                    if not request.framed and request.is_message(MSG_FRAMED_PROTOCOL):
+                        dbg(SERVER_NAME + ' using the framed protocol', INFO1)
+                        self.framed = True
+            finally:
+                self.stop_workers()
 
             self.socket.close()
             self.ended = True
@@ -7,6 +7,19 @@ def execute():
     import sys
 
     files = None
+
+    #If --pydev-jobs=N is passed with N > 1, the combine and the report (--pydev-analyze) are done in parallel
+    #(see: _pydev_runfiles.pydev_runfiles_coverage).
+    jobs = 1
+    for arg in sys.argv[:]:
+        if arg.startswith('--pydev-jobs='):
+            sys.argv.remove(arg)
+            try:
+                jobs = int(arg[len('--pydev-jobs='):])
+            except ValueError:
+                sys.stderr.write('Invalid value for --pydev-jobs: %s (using 1 job).\n' % (arg[len('--pydev-jobs='):],))
+                jobs = 1
+
     if 'combine' not in sys.argv:
 
         if '--pydev-analyze' in sys.argv:
@@ -47,6 +60,21 @@ def execute():
     #print(coverage.__version__) TODO: Check if the version is a version we support (should be at least 3.4) -- note that maybe the attr is not there.
     from coverage.cmdline import main #@UnresolvedImport
 
+    if jobs > 1:
+        #Falls back to coverage.cmdline if the installed coverage can't be used to do it in parallel.
+        from _pydev_runfiles import pydev_runfiles_coverage
+        data_file = os.environ.get('COVERAGE_FILE', '.coverage')
+        if 'combine' in sys.argv:
+            if pydev_runfiles_coverage.can_combine_in_parallel():
+                pydev_runfiles_coverage.combine_coverage_files_in_parallel(
+                    pydev_runfiles_coverage.get_parallel_data_files(os.getcwd(), data_file), data_file, jobs)
+                return
+
+        elif files is not None and pydev_runfiles_coverage.can_report_in_parallel():
+            report = pydev_runfiles_coverage.create_coverage_report(files, data_file, jobs)
+            pydev_runfiles_coverage.write_coverage_report(report, sys.stdout)
+            return
+
     if files is not None:
         sys.argv.append('-r')
         sys.argv.append('-m')
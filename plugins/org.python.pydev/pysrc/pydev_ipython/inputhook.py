@@ -17,6 +17,9 @@ Inputhook management for GUI event loop integration.
 import sys
 import select
 
+from _pydev_imps._pydev_saved_modules import socket
+from _pydev_imps._pydev_saved_modules import time
+
 #-----------------------------------------------------------------------------
 # Constants
 #-----------------------------------------------------------------------------
@@ -34,6 +37,10 @@ GUI_PYGLET = 'pyglet'
 GUI_GTK3 = 'gtk3'
 GUI_NONE = 'none'  # i.e. disable
 
+# The maximum time an inputhook waits for a wake-up before checking return_control() again (a wake-up should
+# always be received when there's something to do, so, this is just a safety net).
+MAX_WAIT_FOR_WAKEUP = 0.5
+
 #-----------------------------------------------------------------------------
 # Utilities
 #-----------------------------------------------------------------------------
@@ -46,6 +53,104 @@ def allow_CTRL_C():
     """Take CTRL+C into account (not implemented)."""
     pass
 
+#-----------------------------------------------------------------------------
+# Wake-up channel
+#-----------------------------------------------------------------------------
+
+def _create_wakeup_sockets():
+    """Create a connected pair of non-blocking sockets (read, write) or return
+    None if that's not possible in this platform."""
+    try:
+        if hasattr(socket, 'socketpair'):
+            read_socket, write_socket = socket.socketpair()
+        else:
+            # i.e.: Python 2 on Windows.
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                server.bind(('127.0.0.1', 0))
+                server.listen(1)
+                write_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                write_socket.connect(server.getsockname())
+                read_socket = server.accept()[0]
+            finally:
+                server.close()
+        read_socket.setblocking(0)
+        write_socket.setblocking(0)
+        return read_socket, write_socket
+    except:
+        return None
+
+
+class WakeUpChannel(object):
+    """Lets other threads wake up the GUI event loop run by an inputhook.
+
+    The inputhooks don't need to poll return_control() at fixed intervals:
+    they watch the file descriptor from fileno() in the toolkit event loop
+    (so, they're woken up as soon as wakeup() is called, i.e.: when a command
+    is added to the console exec queue or a command is received by the
+    debugger) and check return_control() then.
+    """
+
+    def __init__(self):
+        self._woken = False
+        # Created right away: a wakeup() before the inputhook asks for the
+        # fileno() must still make it readable.
+        self._sockets = _create_wakeup_sockets()
+
+    def fileno(self):
+        """The file descriptor which becomes readable on a wake-up (or None if
+        it can't be created, in which case the inputhooks must poll)."""
+        if self._sockets is None:
+            return None
+        return self._sockets[0].fileno()
+
+    def wakeup(self):
+        self._woken = True
+        sockets = self._sockets
+        if sockets is not None:
+            try:
+                sockets[1].send(b'x')
+            except:
+                pass  # The buffer is full (i.e.: already readable).
+
+    def is_woken(self):
+        return self._woken
+
+    def drain(self):
+        """Make the file descriptor not readable anymore (the woken state is
+        kept until clear() is called)."""
+        sockets = self._sockets
+        if sockets is not None:
+            try:
+                while sockets[0].recv(1024):
+                    pass
+            except:
+                pass
+
+    def clear(self):
+        self._woken = False
+        self.drain()
+
+    def wait(self, timeout):
+        """Wait until woken up by a new wakeup() (or until the timeout elapses).
+
+        :return bool: whether it's in the woken state."""
+        if self._woken:
+            self.drain()
+            return True
+
+        fd = self.fileno()
+        if fd is None:
+            time.sleep(timeout)
+        else:
+            try:
+                select.select([fd], [], [], timeout)
+            except:
+                pass  # i.e.: interrupted system call.
+            self.drain()
+        return self._woken
+
+
 #-----------------------------------------------------------------------------
 # Main InputHookManager class
 #-----------------------------------------------------------------------------
@@ -60,6 +165,7 @@ class InputHookManager(object):
 
     def __init__(self):
         self._return_control_callback = None
+        self._wakeup_channel = WakeUpChannel()
         self._apps = {}
         self._reset()
         self.pyplot_imported = False
@@ -81,6 +187,9 @@ class InputHookManager(object):
     def get_inputhook(self):
         return self._callback
 
+    def get_wakeup_channel(self):
+        return self._wakeup_channel
+
     def set_inputhook(self, callback):
         """Set inputhook to callback."""
         # We don't (in the context of PyDev console) actually set PyOS_InputHook, but rather
@@ -242,7 +351,7 @@ class InputHookManager(object):
         IPython.
         """
         from pydev_ipython.inputhookgtk import create_inputhook_gtk
-        self.set_inputhook(create_inputhook_gtk(self._stdin_file))
+        self.set_inputhook(create_inputhook_gtk(self._wakeup_channel))
         self._current_gui = GUI_GTK
 
     def disable_gtk(self):
@@ -403,7 +512,7 @@ class InputHookManager(object):
         IPython.
         """
         from pydev_ipython.inputhookgtk3 import create_inputhook_gtk3
-        self.set_inputhook(create_inputhook_gtk3(self._stdin_file))
+        self.set_inputhook(create_inputhook_gtk3(self._wakeup_channel))
         self._current_gui = GUI_GTK
 
     def disable_gtk3(self):
@@ -476,6 +585,13 @@ set_return_control_callback = inputhook_manager.set_return_control_callback
 get_return_control_callback = inputhook_manager.get_return_control_callback
 get_inputhook = inputhook_manager.get_inputhook
 
+wakeup_channel = inputhook_manager.get_wakeup_channel()
+wakeup = wakeup_channel.wakeup
+is_woken = wakeup_channel.is_woken
+clear_wakeup = wakeup_channel.clear
+wait_for_wakeup = wakeup_channel.wait
+get_wakeup_fd = wakeup_channel.fileno
+
 # Convenience function to switch amongst them
 def enable_gui(gui=None, app=None):
     """Switch amongst GUI input hooks by name.
@@ -576,4 +692,10 @@ __all__ = [
     "get_return_control_callback",
     "get_inputhook",
 
+    "wakeup",
+    "is_woken",
+    "clear_wakeup",
+    "wait_for_wakeup",
+    "get_wakeup_fd",
+
     "enable_gui"]
@@ -18,6 +18,8 @@ Authors: Brian Granger
 
 import gtk, gobject  # @UnresolvedImport
 
+from pydev_ipython.inputhook import stdin_ready, MAX_WAIT_FOR_WAKEUP
+
 #-----------------------------------------------------------------------------
 # Code
 #-----------------------------------------------------------------------------
@@ -25,12 +27,22 @@ import gtk, gobject  # @UnresolvedImport
 
 def _main_quit(*args, **kwargs):
     gtk.main_quit()
-    return False
+    return True
+
 
-def create_inputhook_gtk(stdin_file):
+def create_inputhook_gtk(wakeup_channel):
     def inputhook_gtk():
-        gobject.io_add_watch(stdin_file, gobject.IO_IN, _main_quit)
-        gtk.main()
+        # The main loop runs until woken up by the inputhook manager (the timeout is just a safety net).
+        while not stdin_ready():
+            sources = [gobject.timeout_add(int(MAX_WAIT_FOR_WAKEUP * 1000), _main_quit)]
+            fd = wakeup_channel.fileno()
+            if fd is not None:
+                sources.append(gobject.io_add_watch(fd, gobject.IO_IN, _main_quit))
+            try:
+                gtk.main()
+            finally:
+                for source in sources:
+                    gobject.source_remove(source)
+            wakeup_channel.drain()
         return 0
     return inputhook_gtk
-
@@ -18,18 +18,30 @@ Authors: Thomi Richards
 
 from gi.repository import Gtk, GLib  # @UnresolvedImport
 
+from pydev_ipython.inputhook import stdin_ready, MAX_WAIT_FOR_WAKEUP
+
 #-----------------------------------------------------------------------------
 # Code
 #-----------------------------------------------------------------------------
 
 def _main_quit(*args, **kwargs):
     Gtk.main_quit()
-    return False
+    return True
 
 
-def create_inputhook_gtk3(stdin_file):
+def create_inputhook_gtk3(wakeup_channel):
     def inputhook_gtk3():
-        GLib.io_add_watch(stdin_file, GLib.IO_IN, _main_quit)
-        Gtk.main()
+        # The main loop runs until woken up by the inputhook manager (the timeout is just a safety net).
+        while not stdin_ready():
+            sources = [GLib.timeout_add(int(MAX_WAIT_FOR_WAKEUP * 1000), _main_quit)]
+            fd = wakeup_channel.fileno()
+            if fd is not None:
+                sources.append(GLib.io_add_watch(fd, GLib.IO_IN, _main_quit))
+            try:
+                Gtk.main()
+            finally:
+                for source in sources:
+                    GLib.source_remove(source)
+            wakeup_channel.drain()
         return 0
     return inputhook_gtk3
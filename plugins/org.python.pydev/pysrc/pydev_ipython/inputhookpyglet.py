@@ -22,10 +22,9 @@ Authors
 
 import os
 import sys
-from _pydev_imps._pydev_saved_modules import time
 from timeit import default_timer as clock
 import pyglet  # @UnresolvedImport
-from pydev_ipython.inputhook import stdin_ready
+from pydev_ipython.inputhook import stdin_ready, wait_for_wakeup
 
 
 # On linux only, window.flip() has a bug that causes an AttributeError on
@@ -50,7 +49,7 @@ def inputhook_pyglet():
     """Run the pyglet event loop by processing pending events only.
 
     This keeps processing pending events until stdin is ready.  After
-    processing all pending events, a call to time.sleep is inserted.  This is
+    processing all pending events, a call to wait_for_wakeup is inserted.  This is
     needed, otherwise, CPU usage is at 100%.  This sleep time should be tuned
     though for best performance.
     """
@@ -67,7 +66,8 @@ def inputhook_pyglet():
                 flip(window)
 
             # We need to sleep at this point to keep the idle CPU load
-            # low.  However, if sleep to long, GUI response is poor.  As
+            # low (the sleep is interrupted by a wake-up from the inputhook
+            # manager, so, the latency doesn't depend on it).  However, if sleep to long, GUI response is poor.  As
             # a compromise, we watch how often GUI events are being processed
             # and switch between a short and long sleep time.  Here are some
             # stats useful in helping to tune this.
@@ -79,14 +79,14 @@ def inputhook_pyglet():
             used_time = clock() - t
             if used_time > 10.0:
                 # print 'Sleep for 1 s'  # dbg
-                time.sleep(1.0)
+                wait_for_wakeup(1.0)
             elif used_time > 0.1:
                 # Few GUI events coming in, so we can sleep longer
                 # print 'Sleep for 0.05 s'  # dbg
-                time.sleep(0.05)
+                wait_for_wakeup(0.05)
             else:
                 # Many GUI events coming in, so sleep only very little
-                time.sleep(0.001)
+                wait_for_wakeup(0.001)
     except KeyboardInterrupt:
         pass
     return 0
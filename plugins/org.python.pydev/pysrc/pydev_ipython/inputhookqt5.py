@@ -23,7 +23,7 @@ import threading
 
 
 from pydev_ipython.qt_for_kernel import QtCore, QtGui
-from pydev_ipython.inputhook import allow_CTRL_C, ignore_CTRL_C, stdin_ready
+from pydev_ipython.inputhook import allow_CTRL_C, ignore_CTRL_C, stdin_ready, MAX_WAIT_FOR_WAKEUP
 
 # To minimise future merging complexity, rather than edit the entire code base below
 # we fake InteractiveShell here
@@ -96,8 +96,8 @@ def create_inputhook_qt5(mgr, app=None):
         """PyOS_InputHook python hook for Qt5.
 
         Process pending Qt events and if there's no pending keyboard
-        input, spend a short slice of time (50ms) running the Qt event
-        loop.
+        input, run the Qt event loop until woken up by the inputhook
+        manager.
 
         As a Python ctypes callback can't raise an exception, we catch
         the KeyboardInterrupt and temporarily deactivate the hook,
@@ -132,13 +132,28 @@ def create_inputhook_qt5(mgr, app=None):
                 # used anywhere, the only thing QCoreApplication adds is
                 # the aboutToQuit signal which is precisely what we are
                 # trying to avoid.
+                #
+                # Instead of quitting the event loop at fixed intervals to
+                # poll stdin_ready(), it's quit when the inputhook manager
+                # wakes us up (the timer is just a safety net).
                 timer = QtCore.QTimer()
                 event_loop = QtCore.QEventLoop()
                 timer.timeout.connect(event_loop.quit)
-                while not stdin_ready():
-                    timer.start(50)
-                    event_loop.exec_()
-                    timer.stop()
+                wakeup_channel = mgr.get_wakeup_channel()
+                notifier = None
+                fd = wakeup_channel.fileno()
+                if fd is not None:
+                    notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read)
+                    notifier.activated.connect(event_loop.quit)
+                try:
+                    while not stdin_ready():
+                        timer.start(int(MAX_WAIT_FOR_WAKEUP * 1000))
+                        event_loop.exec_()
+                        timer.stop()
+                        wakeup_channel.drain()
+                finally:
+                    if notifier is not None:
+                        notifier.setEnabled(False)
         except KeyboardInterrupt:
             global got_kbdint, sigint_timer
 
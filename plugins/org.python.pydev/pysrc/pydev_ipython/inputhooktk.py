@@ -6,18 +6,43 @@
 # Imports
 #-----------------------------------------------------------------------------
 
-from pydev_ipython.inputhook import stdin_ready
+from pydev_ipython.inputhook import stdin_ready, get_wakeup_fd, wait_for_wakeup, wakeup_channel, \
+    MAX_WAIT_FOR_WAKEUP
 
 #-----------------------------------------------------------------------------
 # Code
 #-----------------------------------------------------------------------------
 
 TCL_DONT_WAIT = 1 << 1
+TCL_READABLE = 1 << 1
 
 def create_inputhook_tk(app):
+    def _on_wakeup(*args):
+        wakeup_channel.drain()
+
+    def _noop():
+        pass
+
     def inputhook_tk():
-        while app.dooneevent(TCL_DONT_WAIT) == 1:
-            if stdin_ready():
-                break
+        fd = get_wakeup_fd()
+        # File handlers aren't available on Windows: poll (waiting for a wake-up between the polls) in that case.
+        use_file_handler = fd is not None and hasattr(app, 'createfilehandler')
+        if use_file_handler:
+            app.createfilehandler(fd, TCL_READABLE, _on_wakeup)
+        try:
+            while not stdin_ready():
+                if use_file_handler:
+                    # Blocks until an event is available (a GUI event, the wake-up or the timer).
+                    timer = app.after(int(MAX_WAIT_FOR_WAKEUP * 1000), _noop)
+                    app.dooneevent(0)
+                    app.after_cancel(timer)
+                else:
+                    while app.dooneevent(TCL_DONT_WAIT) == 1:
+                        if stdin_ready():
+                            return 0
+                    wait_for_wakeup(0.01)
+        finally:
+            if use_file_handler:
+                app.deletefilehandler(fd)
         return 0
     return inputhook_tk
@@ -18,11 +18,10 @@ Authors:  Robin Dunn, Brian Granger, Ondrej Certik
 
 import sys
 import signal
-from _pydev_imps._pydev_saved_modules import time
 from timeit import default_timer as clock
 import wx
 
-from pydev_ipython.inputhook import stdin_ready
+from pydev_ipython.inputhook import stdin_ready, wait_for_wakeup
 
 
 #-----------------------------------------------------------------------------
@@ -106,7 +105,7 @@ def inputhook_wx3():
 
     This is like inputhook_wx1, but it keeps processing pending events
     until stdin is ready.  After processing all pending events, a call to
-    time.sleep is inserted.  This is needed, otherwise, CPU usage is at 100%.
+    wait_for_wakeup is inserted.  This is needed, otherwise, CPU usage is at 100%.
     This sleep time should be tuned though for best performance.
     """
     # We need to protect against a user pressing Control-C when IPython is
@@ -131,7 +130,8 @@ def inputhook_wx3():
                     evtloop.Dispatch()
                 app.ProcessIdle()
                 # We need to sleep at this point to keep the idle CPU load
-                # low.  However, if sleep to long, GUI response is poor.  As
+                # low (the sleep is interrupted by a wake-up from the inputhook
+                # manager, so, the latency doesn't depend on it).  However, if sleep to long, GUI response is poor.  As
                 # a compromise, we watch how often GUI events are being processed
                 # and switch between a short and long sleep time.  Here are some
                 # stats useful in helping to tune this.
@@ -143,14 +143,14 @@ def inputhook_wx3():
                 used_time = clock() - t
                 if used_time > 10.0:
                     # print 'Sleep for 1 s'  # dbg
-                    time.sleep(1.0)
+                    wait_for_wakeup(1.0)
                 elif used_time > 0.1:
                     # Few GUI events coming in, so we can sleep longer
                     # print 'Sleep for 0.05 s'  # dbg
-                    time.sleep(0.05)
+                    wait_for_wakeup(0.05)
                 else:
                     # Many GUI events coming in, so sleep only very little
-                    time.sleep(0.001)
+                    wait_for_wakeup(0.001)
             del ea
     except KeyboardInterrupt:
         pass
@@ -17,6 +17,7 @@ import os
 import sys
 
 from _pydev_imps._pydev_saved_modules import threading
+from _pydev_imps._pydev_saved_modules import time
 
 import traceback
 from _pydev_bundle import fix_getpass
@@ -56,6 +57,11 @@ except:
     pass
 
 
+# (code, symbol, compiler flags) -> compiled code (so that fragments executed many times are compiled only once).
+_compiled_fragments = {}
+MAX_COMPILED_FRAGMENTS = 500
+
+
 class Command:
     def __init__(self, interpreter, code_fragment):
         """
@@ -82,7 +88,33 @@ class Command:
         text = self.code_fragment.text
         symbol = self.symbol_for_fragment(self.code_fragment)
 
-        self.more = self.interpreter.runsource(text, '<input>', symbol)
+        compile_fragment = getattr(self.interpreter, 'compile', None)
+        flags = getattr(getattr(compile_fragment, 'compiler', None), 'flags', None)
+        if flags is None:
+            self.more = self.interpreter.runsource(text, '<input>', symbol)
+            return
+
+        # Same as InteractiveInterpreter.runsource, but reusing the compiled code.
+        key = (text, symbol, flags)
+        code = _compiled_fragments.get(key)
+        if code is None:
+            try:
+                code = compile_fragment(text, '<input>', symbol)
+            except (OverflowError, SyntaxError, ValueError):
+                self.interpreter.showsyntaxerror('<input>')
+                self.more = False
+                return
+
+            if code is None:
+                self.more = True
+                return
+
+            if len(_compiled_fragments) >= MAX_COMPILED_FRAGMENTS:
+                _compiled_fragments.clear()
+            _compiled_fragments[key] = code
+
+        self.interpreter.runcode(code)
+        self.more = False
 
 try:
     try:
@@ -135,7 +167,7 @@ class InterpreterInterface(BaseInterpreterInterface):
         try:
             from _pydev_bundle._pydev_completer import Completer
 
-            completer = Completer(self.namespace, None)
+            completer = Completer(self.namespace, None, self.namespace_version)
             return completer.complete(act_tok)
         except:
             import traceback
@@ -152,7 +184,7 @@ class InterpreterInterface(BaseInterpreterInterface):
 
 class _ProcessExecQueueHelper:
     _debug_hook = None
-    _return_control_osc = False
+    _last_debug_hook_call = 0
 
 def set_debug_hook(debug_hook):
     _ProcessExecQueueHelper._debug_hook = debug_hook
@@ -160,20 +192,21 @@ def set_debug_hook(debug_hook):
 
 def process_exec_queue(interpreter):
 
-    from pydev_ipython.inputhook import get_inputhook, set_return_control_callback
+    from pydev_ipython.inputhook import get_inputhook, set_return_control_callback, is_woken, clear_wakeup, \
+        MAX_WAIT_FOR_WAKEUP
 
     def return_control():
         ''' A function that the inputhooks can call (via inputhook.stdin_ready()) to find
-            out if they should cede control and return '''
+            out if they should cede control and return.
+
+            The inputhooks are woken up when something is added to the exec queue (and when
+            the debugger receives a command), so, they don't need to poll this function at
+            fixed intervals.
+        '''
         if _ProcessExecQueueHelper._debug_hook:
-            # Some of the input hooks check return control without doing
-            # a single operation, so we don't return True on every
-            # call when the debug hook is in place to allow the GUI to run
-            # XXX: Eventually the inputhook code will have diverged enough
-            # from the IPython source that it will be worthwhile rewriting
-            # it rather than pretending to maintain the old API
-            _ProcessExecQueueHelper._return_control_osc = not _ProcessExecQueueHelper._return_control_osc
-            if _ProcessExecQueueHelper._return_control_osc:
+            # Return control to run the debug hook when the debugger received some command (which
+            # wakes up the inputhook) and also from time to time (i.e.: to notify new threads).
+            if is_woken() or time.time() - _ProcessExecQueueHelper._last_debug_hook_call > MAX_WAIT_FOR_WAKEUP:
                 return True
 
         if not interpreter.exec_queue.empty():
@@ -194,7 +227,11 @@ def process_exec_queue(interpreter):
         # Running the request may have changed the inputhook in use
         inputhook = get_inputhook()
 
+        # Any wake-up from now on makes the inputhook return.
+        clear_wakeup()
+
         if _ProcessExecQueueHelper._debug_hook:
+            _ProcessExecQueueHelper._last_debug_hook_call = time.time()
             _ProcessExecQueueHelper._debug_hook()
 
         if inputhook:
@@ -205,7 +242,15 @@ def process_exec_queue(interpreter):
                 import traceback;traceback.print_exc()
         try:
             try:
-                code_fragment = interpreter.exec_queue.get(block=True, timeout=1/20.) # 20 calls/second
+                if inputhook or _ProcessExecQueueHelper._debug_hook or not IS_PYTHON_3K:
+                    # Note: the inputhooks only return when there's something in the queue (or to run the
+                    # debug hook), so, the timeout is only reached by inputhooks which don't block.
+                    code_fragment = interpreter.exec_queue.get(block=True, timeout=1/20.)
+                else:
+                    # Nothing to do until something is added to the queue (the inputhook and the debug hook are
+                    # only changed by callables in the queue). Note: on Python 2 a wait without a timeout can't be
+                    # interrupted.
+                    code_fragment = interpreter.exec_queue.get(block=True)
             except _queue.Empty:
                 continue
 
@@ -213,6 +258,9 @@ def process_exec_queue(interpreter):
                 # It can be a callable (i.e.: something that must run in the main
                 # thread can be put in the queue for later execution).
                 code_fragment()
+            elif isinstance(code_fragment, list):
+                # A batch of fragments (see: execBatch).
+                more = interpreter.add_exec_fragments(code_fragment)
             else:
                 more = interpreter.add_exec(code_fragment)
         except KeyboardInterrupt:
@@ -300,6 +348,7 @@ def start_console_server(host, port, interpreter):
 
     server.register_function(interpreter.execLine)
     server.register_function(interpreter.execMultipleLines)
+    server.register_function(interpreter.execBatch)
     server.register_function(interpreter.getCompletions)
     server.register_function(interpreter.getFrame)
     server.register_function(interpreter.getVariable)
@@ -33,13 +33,13 @@ from _pydevd_bundle.pydevd_comm import CMD_SET_BREAK, CMD_SET_NEXT_STATEMENT, CM
     set_global_debugger, WriterThread, pydevd_find_thread_by_id, pydevd_log, \
     start_client, start_server, InternalGetBreakpointException, InternalSendCurrExceptionTrace, \
     InternalSendCurrExceptionTraceProceeded
-from _pydevd_bundle.pydevd_custom_frames import CustomFramesContainer, custom_frames_container_init
+from _pydevd_bundle.pydevd_custom_frames import CustomFramesContainer, custom_frames_container_init, \
+    get_custom_frames_for_thread, get_custom_frames
 from _pydevd_bundle.pydevd_frame_utils import add_exception_to_frame
 from _pydevd_bundle.pydevd_kill_all_pydevd_threads import kill_all_pydev_threads
+from _pydevd_bundle.pydevd_relay import get_relay_address, connect_to_relay, start_relay
 from _pydevd_bundle.pydevd_trace_dispatch import trace_dispatch as _trace_dispatch
 from _pydevd_bundle.pydevd_utils import save_main_module
-from pydevd_concurrency_analyser.pydevd_concurrency_logger import ThreadingLogger, AsyncioLogger, send_message, cur_time
-from pydevd_concurrency_analyser.pydevd_thread_wrappers import wrap_threads
 
 
 __version_info__ = (0, 0, 6)
@@ -57,10 +57,9 @@ __version__ = '.'.join(__version_info_str__)
 
 
 
+# Note: the plugins, console, resolvers, matplotlib integration and concurrency analyser aren't imported here:
+# they're only imported when used (so that the startup -- which is also done in every child process -- is faster).
 SUPPORT_PLUGINS = not IS_JYTH_LESS25
-PluginManager = None
-if SUPPORT_PLUGINS:
-    from _pydevd_bundle.pydevd_plugin_utils import PluginManager
 
 
 threadingEnumerate = threading.enumerate
@@ -127,8 +126,14 @@ class CheckOutputThread(PyDBDaemonThread):
         self.py_db = py_db
         self.setName('pydevd.CheckAliveThread')
         self.daemon = False
+        self._wake_up_event = threading.Event()
         py_db.output_checker = self
 
+    def wake_up(self):
+        '''Called when some output is written to an empty redirection buffer (so that it's sent right away).
+        '''
+        self._wake_up_event.set()
+
     def _on_run(self):
         if self.pydev_do_not_trace:
 
@@ -145,7 +150,10 @@ class CheckOutputThread(PyDBDaemonThread):
                 pydevd_tracing.SetTrace(None)  # no debugging on this thread
 
         while not self.killReceived:
-            time.sleep(0.3)
+            self._wake_up_event.wait(0.3)
+            self._wake_up_event.clear()
+            self.py_db.flush_concurrency_events()
+            self.py_db.flush_signatures()
             if not self.py_db.has_threads_alive() and self.py_db.writer.empty() \
                     and not has_data_to_redirect():
                 try:
@@ -256,6 +264,7 @@ class PyDB:
 
     def get_plugin_lazy_init(self):
         if self.plugin is None and SUPPORT_PLUGINS:
+            from _pydevd_bundle.pydevd_plugin_utils import PluginManager
             self.plugin = PluginManager(self)
         return self.plugin
 
@@ -313,7 +322,12 @@ class PyDB:
 
     def connect(self, host, port):
         if host:
-            s = start_client(host, port)
+            relay_address = get_relay_address()
+            if relay_address:
+                # A process started with --multiprocess-relay is relaying the connection to the ide.
+                s = connect_to_relay(relay_address)
+            else:
+                s = start_client(host, port)
         else:
             s = start_server(port)
 
@@ -372,6 +386,26 @@ class PyDB:
             traceback.print_exc()
 
 
+    def flush_concurrency_events(self):
+        '''Sends the events buffered by the concurrency analysers (if any) to the debug server.
+        '''
+        if self.thread_analyser is not None or self.asyncio_analyser is not None:
+            try:
+                from pydevd_concurrency_analyser.pydevd_concurrency_logger import flush_events
+                flush_events(self)
+            except:
+                traceback.print_exc()
+
+    def flush_signatures(self):
+        '''Sends the call signatures collected in the sampled mode (if any) to the debug server.
+        '''
+        if self.signature_factory is not None and self.signature_factory.sampled:
+            try:
+                from _pydevd_bundle.pydevd_signature import flush_signatures
+                flush_signatures(self)
+            except:
+                traceback.print_exc()
+
     def init_matplotlib_in_debug_console(self):
         # import hook and patches for matplotlib support in debug console
         from _pydev_bundle.pydev_import_hook import import_hook_manager
@@ -384,17 +418,21 @@ class PyDB:
         # enable_gui_function in activate_matplotlib should be called in main thread. Unlike integrated console,
         # in the debug console we have no interpreter instance with exec_queue, but we run this code in the main
         # thread and can call it directly.
+        from pydev_ipython.inputhook import set_return_control_callback, is_woken, MAX_WAIT_FOR_WAKEUP
+
         class _MatplotlibHelper:
-            _return_control_osc = False
+            _last_return_control = 0
 
         def return_control():
-            # Some of the input hooks (e.g. Qt4Agg) check return control without doing
-            # a single operation, so we don't return True on every
-            # call when the debug hook is in place to allow the GUI to run
-            _MatplotlibHelper._return_control_osc = not _MatplotlibHelper._return_control_osc
-            return _MatplotlibHelper._return_control_osc
+            # The input hooks block until they're woken up (the reader thread does it when a command is
+            # received) or until some time passes (so that the debugger is still able to notice that the
+            # debug session finished).
+            now = time.time()
+            if is_woken() or now - _MatplotlibHelper._last_return_control > MAX_WAIT_FOR_WAKEUP:
+                _MatplotlibHelper._last_return_control = now
+                return True
+            return False
 
-        from pydev_ipython.inputhook import set_return_control_callback
         set_return_control_callback(return_control)
 
         self.mpl_modules_for_patching = {"matplotlib": lambda: activate_matplotlib(do_enable_gui),
@@ -702,20 +740,14 @@ class PyDB:
         cmd = self.cmd_factory.make_thread_suspend_message(get_thread_id(thread), frame, thread.stop_reason, message)
         self.writer.add_command(cmd)
 
-        CustomFramesContainer.custom_frames_lock.acquire()  # @UndefinedVariable
-        try:
-            from_this_thread = []
-
-            for frame_id, custom_frame in dict_iter_items(CustomFramesContainer.custom_frames):
-                if custom_frame.thread_id == thread.ident:
-                    # print >> sys.stderr, 'Frame created: ', frame_id
-                    self.writer.add_command(self.cmd_factory.make_custom_frame_created_message(frame_id, custom_frame.name))
-                    self.writer.add_command(self.cmd_factory.make_thread_suspend_message(frame_id, custom_frame.frame, CMD_THREAD_SUSPEND, ""))
+        from_this_thread = []
 
-                from_this_thread.append(frame_id)
+        for frame_id, custom_frame in get_custom_frames_for_thread(thread.ident):
+            # print >> sys.stderr, 'Frame created: ', frame_id
+            self.writer.add_command(self.cmd_factory.make_custom_frame_created_message(frame_id, custom_frame.name))
+            self.writer.add_command(self.cmd_factory.make_thread_suspend_message(frame_id, custom_frame.frame, CMD_THREAD_SUSPEND, ""))
 
-        finally:
-            CustomFramesContainer.custom_frames_lock.release()  # @UndefinedVariable
+            from_this_thread.append(frame_id)
 
         imported = False
         info = thread.additional_info
@@ -734,11 +766,17 @@ class PyDB:
                 # call input hooks if only matplotlib is in use
                 try:
                     if not imported:
-                        from pydev_ipython.inputhook import get_inputhook
+                        from pydev_ipython.inputhook import get_inputhook, is_woken, clear_wakeup
                         imported = True
                     inputhook = get_inputhook()
                     if inputhook:
                         inputhook()
+                        # The inputhook already waited for a command, so, there's no need to sleep.
+                        woken = is_woken()
+                        clear_wakeup()
+                        if woken:
+                            self.process_internal_commands()
+                            continue
                 except:
                     pass
 
@@ -808,15 +846,10 @@ class PyDB:
         cmd = self.cmd_factory.make_thread_run_message(get_thread_id(thread), info.pydev_step_cmd)
         self.writer.add_command(cmd)
 
-        CustomFramesContainer.custom_frames_lock.acquire()  # @UndefinedVariable
-        try:
-            # The ones that remained on last_running must now be removed.
-            for frame_id in from_this_thread:
-                # print >> sys.stderr, 'Removing created frame: ', frame_id
-                self.writer.add_command(self.cmd_factory.make_thread_killed_message(frame_id))
-
-        finally:
-            CustomFramesContainer.custom_frames_lock.release()  # @UndefinedVariable
+        # The ones that remained on last_running must now be removed.
+        for frame_id in from_this_thread:
+            # print >> sys.stderr, 'Removing created frame: ', frame_id
+            self.writer.add_command(self.cmd_factory.make_thread_killed_message(frame_id))
 
     def handle_post_mortem_stop(self, thread, frame, frames_byid, exception):
         pydev_log.debug("We are stopping in post-mortem\n")
@@ -956,13 +989,20 @@ class PyDB:
             while not self.ready_to_run:
                 time.sleep(0.1)  # busy wait until we receive run command
 
+        if self.thread_analyser is not None or self.asyncio_analyser is not None:
+            from pydevd_concurrency_analyser.pydevd_concurrency_logger import send_message, cur_time
+
         if self.thread_analyser is not None:
-            wrap_threads()
+            from pydevd_concurrency_analyser.pydevd_thread_wrappers import wrap_threads
+            wrap_threads(self.thread_analyser)
             t = threadingCurrentThread()
             self.thread_analyser.set_start_time(cur_time())
             send_message("threading_event", 0, t.getName(), get_thread_id(t), "thread", "start", file, 1, None, parent=get_thread_id(t))
 
         if self.asyncio_analyser is not None:
+            from pydevd_concurrency_analyser.pydevd_asyncio_wrappers import wrap_asyncio
+            wrap_asyncio(self.asyncio_analyser)
+            self.asyncio_analyser.set_start_time(cur_time())
             # we don't have main thread in asyncio graph, so we should add a fake event
             send_message("asyncio_event", 0, "Task", "Task", "thread", "stop", file, 1, frame=None, parent=None)
 
@@ -988,6 +1028,8 @@ class PyDB:
         sys.stdout.flush()
         sys.stderr.flush()
         self.check_output_redirect()
+        self.flush_concurrency_events()
+        self.flush_signatures()
         cmd = self.cmd_factory.make_exit_message()
         self.writer.add_command(cmd)
 
@@ -1027,15 +1069,29 @@ def usage(doExit=0):
         sys.exit(0)
 
 
+def _wake_up_output_checker():
+    output_checker = getattr(get_global_debugger(), 'output_checker', None)
+    if output_checker is not None:
+        output_checker.wake_up()
+
+
+def _create_redirect_buffer():
+    return pydevd_io.IOBuf(
+        max_size=pydevd_io.IO_BUFFER_MAX_SIZE,
+        overflow_policy=pydevd_io.IO_BUFFER_OVERFLOW_POLICY,
+        on_first_write=_wake_up_output_checker,
+    )
+
+
 def init_stdout_redirect():
     if not getattr(sys, 'stdoutBuf', None):
-        sys.stdoutBuf = pydevd_io.IOBuf()
+        sys.stdoutBuf = _create_redirect_buffer()
         sys.stdout_original = sys.stdout
         sys.stdout = pydevd_io.IORedirector(sys.stdout, sys.stdoutBuf) #@UndefinedVariable
 
 def init_stderr_redirect():
     if not getattr(sys, 'stderrBuf', None):
-        sys.stderrBuf = pydevd_io.IOBuf()
+        sys.stderrBuf = _create_redirect_buffer()
         sys.stderr_original = sys.stderr
         sys.stderr = pydevd_io.IORedirector(sys.stderr, sys.stderrBuf) #@UndefinedVariable
 
@@ -1161,12 +1217,8 @@ def _locked_settrace(
         debugger.set_trace_for_frame_and_parents(get_frame(), False, overwrite_prev_trace=overwrite_prev_trace)
 
 
-        CustomFramesContainer.custom_frames_lock.acquire()  # @UndefinedVariable
-        try:
-            for _frameId, custom_frame in dict_iter_items(CustomFramesContainer.custom_frames):
-                debugger.set_trace_for_frame_and_parents(custom_frame.frame, False)
-        finally:
-            CustomFramesContainer.custom_frames_lock.release()  # @UndefinedVariable
+        for custom_frame in get_custom_frames():
+            debugger.set_trace_for_frame_and_parents(custom_frame.frame, False)
 
 
         t = threadingCurrentThread()
@@ -1310,6 +1362,26 @@ def settrace_forked():
     '''
     When creating a fork from a process in the debugger, we need to reset the whole debugger environment!
     '''
+    setup = SetupHolder.setup
+    if setup is not None and setup.get('lazy-attach'):
+        from _pydevd_bundle import pydevd_lazy_attach
+        info = pydevd_lazy_attach.get_lazy_attach_info(get_global_debugger())
+        if pydevd_lazy_attach.install_lazy_attach(info, _settrace_forked):
+            # Don't keep on tracing with the debugger of the parent until we attach.
+            pydevd_tracing.restore_sys_set_trace_func()
+            sys.settrace(None)
+            try:
+                threading.settrace(None)
+            except:
+                pass
+            from _pydev_bundle.pydev_monkey import undo_patch_thread_modules
+            undo_patch_thread_modules()
+            return
+
+    _settrace_forked()
+
+
+def _settrace_forked():
     host, port = dispatch()
 
     import pydevd_tracing
@@ -1330,6 +1402,39 @@ def settrace_forked():
                 patch_multiprocessing=True,
         )
 
+def settrace_lazy(host=None, port=5678, lazy_attach_info=None):
+    '''
+    Used in children processes started with --lazy-attach: the same as
+    settrace(host, port, suspend=False, trace_only_current_thread=False, patch_multiprocessing=True), but
+    the debugger is only attached if a breakpoint may be hit in this process (see: pydevd_lazy_attach).
+
+    @param lazy_attach_info: the dict from pydevd_lazy_attach.get_lazy_attach_info() in the parent.
+    '''
+    if host is None:
+        from _pydev_bundle import pydev_localhost
+        host = pydev_localhost.get_localhost()
+
+    if SetupHolder.setup is None:
+        SetupHolder.setup = {
+            'client': host,
+            'server': False,
+            'port': int(port),
+            'multiprocess': True,
+            'lazy-attach': True,
+        }
+
+    def attach():
+        settrace(host, port=port, suspend=False, trace_only_current_thread=False, patch_multiprocessing=True)
+
+    from _pydevd_bundle import pydevd_lazy_attach
+    if pydevd_lazy_attach.install_lazy_attach(lazy_attach_info or {}, attach):
+        # Processes created before attaching must still be handled.
+        from _pydev_bundle import pydev_monkey
+        pydev_monkey.patch_new_process_functions()
+    else:
+        attach()
+
+
 #=======================================================================================================================
 # SetupHolder
 #=======================================================================================================================
@@ -1343,18 +1448,18 @@ def apply_debugger_options(setup_options):
 
     :type setup_options: dict[str, bool]
     """
-    default_options = {'save-signatures': False, 'qt-support': False}
+    default_options = {'save-signatures': False, 'sample-signatures': False, 'qt-support': False}
     default_options.update(setup_options)
     setup_options = default_options
 
     debugger = GetGlobalDebugger()
-    if setup_options['save-signatures']:
+    if setup_options['save-signatures'] or setup_options['sample-signatures']:
         if pydevd_vm_type.get_vm_type() == pydevd_vm_type.PydevdVmType.JYTHON:
             sys.stderr.write("Collecting run-time type information is not supported for Jython\n")
         else:
             # Only import it if we're going to use it!
             from _pydevd_bundle.pydevd_signature import SignatureFactory
-            debugger.signature_factory = SignatureFactory()
+            debugger.signature_factory = SignatureFactory(sampled=setup_options['sample-signatures'])
 
     if setup_options['qt-support']:
         enable_qt_support()
@@ -1518,9 +1623,11 @@ if __name__ == '__main__':
         debugger.run(setup['file'], None, None, is_module, set_trace=False)
     else:
         if setup['save-threading']:
+            from pydevd_concurrency_analyser.pydevd_concurrency_logger import ThreadingLogger
             debugger.thread_analyser = ThreadingLogger()
         if setup['save-asyncio']:
             if IS_PY34_OLDER:
+                from pydevd_concurrency_analyser.pydevd_concurrency_logger import AsyncioLogger
                 debugger.asyncio_analyser = AsyncioLogger()
 
         apply_debugger_options(setup)
@@ -1534,6 +1641,10 @@ if __name__ == '__main__':
 
         connected = True  # Mark that we're connected when started from inside ide.
 
+        if setup['multiprocess'] and setup['multiprocess-relay']:
+            # Children will connect to the ide through this process (it's a no-op if we're already a child).
+            start_relay(host, port)
+
         globals = debugger.run(setup['file'], None, None, is_module)
 
         if setup['cmd-line']:
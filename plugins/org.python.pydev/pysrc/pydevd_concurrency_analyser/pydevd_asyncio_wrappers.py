@@ -0,0 +1,179 @@
+import os
+import sys
+
+# The object notified about asyncio task, lock and queue operations (an AsyncioLogger). It's set in
+# wrap_asyncio() and the wrappers below call it directly (so, the tracer doesn't need to inspect every
+# frame to discover the tasks and the task in which an operation is done).
+_listener = None
+
+_asyncio_dir = None
+_this_file = None
+
+
+def _get_caller_frame():
+    '''
+    :return frame: the frame which called the wrapped method (skipping the frames of the asyncio package and
+        of this module, i.e.: Lock.__aenter__ calling Lock.acquire).
+    '''
+    frame = sys._getframe(2)
+    caller = frame
+    while caller is not None and (
+            caller.f_code.co_filename.startswith(_asyncio_dir) or caller.f_code.co_filename == _this_file):
+        caller = caller.f_back
+    if caller is None:
+        return frame
+    return caller
+
+
+def _notify(method_name, *args):
+    listener = _listener
+    if listener is not None:
+        getattr(listener, method_name)(*args)
+
+
+def get_current_task():
+    '''
+    :return: the task running in the current thread or None.
+    '''
+    import asyncio  # @UnresolvedImport
+    try:
+        current_task = asyncio.current_task
+    except AttributeError:
+        current_task = asyncio.Task.current_task  # Python < 3.7
+    try:
+        return current_task()
+    except RuntimeError:
+        return None  # No running loop.
+
+
+#=======================================================================================================================
+# AwaitableWrapper
+#=======================================================================================================================
+class AwaitableWrapper(object):
+    '''
+    Wraps the coroutine returned by a method, calling on_done() when it finishes (it's an iterator which
+    delegates to the coroutine, as coroutines can't be created with a syntax which is also valid in Python 2).
+    '''
+
+    def __init__(self, coro, on_done):
+        self._coro = coro
+        self._iterator = None
+        self._on_done = on_done
+
+    def _get_iterator(self):
+        if self._iterator is None:
+            coro = self._coro
+            if hasattr(coro, '__await__'):
+                self._iterator = coro.__await__()
+            else:
+                self._iterator = iter(coro)  # Generator-based coroutine (Python 3.4).
+        return self._iterator
+
+    def __await__(self):
+        return self
+
+    __iter__ = __await__
+
+    def __next__(self):
+        return self.send(None)
+
+    next = __next__
+
+    def send(self, value):
+        try:
+            return self._get_iterator().send(value)
+        except StopIteration:
+            self._on_done()
+            raise
+
+    def throw(self, *args):
+        try:
+            return self._get_iterator().throw(*args)
+        except StopIteration:
+            self._on_done()
+            raise
+
+    def close(self):
+        if self._iterator is not None:
+            self._iterator.close()
+        else:
+            self._coro.close()
+
+
+def _wrap_coroutine_method(cls, method_name, begin_event, end_events):
+    original = getattr(cls, method_name)
+
+    def method(self, *args, **kwargs):
+        if _listener is None:
+            return original(self, *args, **kwargs)
+
+        frame = _get_caller_frame()
+        _notify('on_lock_event', self, begin_event, frame)
+
+        def on_done():
+            for event in end_events:
+                _notify('on_lock_event', self, event, frame)
+
+        return AwaitableWrapper(original(self, *args, **kwargs), on_done)
+
+    setattr(cls, method_name, method)
+
+
+def _wrap_method(cls, method_name, events):
+    original = getattr(cls, method_name)
+
+    def method(self, *args, **kwargs):
+        ret = original(self, *args, **kwargs)
+        if _listener is not None:
+            frame = _get_caller_frame()
+            for event in events:
+                _notify('on_lock_event', self, event, frame)
+        return ret
+
+    setattr(cls, method_name, method)
+
+
+def _patch_asyncio():
+    import asyncio  # @UnresolvedImport
+    from asyncio import base_events  # @UnresolvedImport
+
+    global _asyncio_dir
+    global _this_file
+    _asyncio_dir = os.path.dirname(asyncio.__file__)
+    _this_file = _get_caller_frame.__code__.co_filename
+
+    BaseEventLoop = base_events.BaseEventLoop
+    if getattr(BaseEventLoop, '_pydev_concurrency_patched', False):
+        return
+
+    if hasattr(BaseEventLoop, 'create_task'):  # Python 3.4.2 onwards.
+        original_create_task = BaseEventLoop.create_task
+
+        def create_task(self, *args, **kwargs):
+            task = original_create_task(self, *args, **kwargs)
+            if _listener is not None:
+                _notify('on_task_start', task, _get_caller_frame())
+            return task
+
+        BaseEventLoop.create_task = create_task
+
+    _wrap_coroutine_method(asyncio.Lock, 'acquire', 'acquire_begin', ('acquire_end',))
+    _wrap_method(asyncio.Lock, 'release', ('release_end',))
+
+    # Note: put() and get() finish with put_nowait() and get_nowait().
+    _wrap_coroutine_method(asyncio.Queue, 'put', 'acquire_begin', ())
+    _wrap_coroutine_method(asyncio.Queue, 'get', 'acquire_begin', ())
+    _wrap_method(asyncio.Queue, 'put_nowait', ('acquire_end', 'release'))
+    _wrap_method(asyncio.Queue, 'get_nowait', ('acquire_end', 'release'))
+
+    BaseEventLoop._pydev_concurrency_patched = True
+
+
+def wrap_asyncio(listener=None):
+    '''
+    :param listener: the object which should be notified of asyncio task, lock and queue operations
+        (see: pydevd_concurrency_logger.AsyncioLogger).
+    '''
+    global _listener
+    _listener = listener
+    _patch_asyncio()
@@ -1,10 +1,29 @@
-import time
-from pydevd_concurrency_analyser.pydevd_thread_wrappers import ObjectWrapper, wrap_attr
+'''
+Concurrency events (threads, locks, queues and asyncio tasks) for the concurrency visualizer.
+
+Events aren't sent to the IDE as they happen: they're packed as binary records in a fixed-size
+ring buffer (strings and stacks are interned to small integer ids) and flushed in batches by
+flush_events() (called periodically from the CheckOutputThread and when the debugger is exiting).
+
+Each batch is a single CMD_GET_CONCURRENCY_EVENT message with the format:
+
+    <xml>
+        <frame id="1" name="..." file="..." line="..."></frame>  (only for frames not sent before)
+        <stack id="1" frames="3,2,1"></stack>  (only for stacks not sent before)
+        <threading_event time="..." name="..." ... stack_id="1"></threading_event>
+        <asyncio_event ...></asyncio_event>
+        <dropped count="N"></dropped>  (only if the buffer overflowed since the last flush)
+    </xml>
+'''
+import struct
+import weakref
 
 import pydevd_file_utils
 from _pydevd_bundle import pydevd_xml
 from _pydev_bundle._pydev_filesystem_encoding import getfilesystemencoding
-from _pydevd_bundle.pydevd_constants import dict_contains, get_thread_id, IS_PY3K
+from _pydevd_bundle.pydevd_constants import get_thread_id, IS_PY3K
+from _pydevd_bundle.pydevd_dont_trace_files import DONT_TRACE, PYDEV_FILE
+from pydevd_concurrency_analyser.pydevd_asyncio_wrappers import get_current_task
 
 file_system_encoding = getfilesystemencoding()
 
@@ -14,6 +33,7 @@ except:
     from urllib.parse import quote  # @UnresolvedImport
 
 from _pydev_imps._pydev_saved_modules import threading
+from _pydev_imps._pydev_saved_modules import thread
 threadingCurrentThread = threading.currentThread
 
 
@@ -24,92 +44,277 @@ THREAD_METHODS = ['start', '_stop', 'join']
 LOCK_METHODS = ['__init__', 'acquire', 'release', '__enter__', '__exit__']
 QUEUE_METHODS = ['put', 'get']
 
-from _pydevd_bundle.pydevd_comm import GlobalDebuggerHolder, NetCommand
+_LOGGED_LOCK_METHODS = frozenset(LOCK_METHODS + QUEUE_METHODS)
+
+from _pydevd_bundle.pydevd_comm import GlobalDebuggerHolder, NetCommand, CMD_GET_CONCURRENCY_EVENT
 import traceback
 
 import time
 # return time since epoch in milliseconds
 cur_time = lambda: int(round(time.time() * 1000000))
 
+# Max number of events kept in memory (when full, the oldest events are overwritten).
+EVENTS_BUFFER_SIZE = 32 * 1024
 
-try:
-    import asyncio  # @UnresolvedImport
-except:
-    pass
+# Max number of events sent in a single message.
+EVENTS_PER_MESSAGE = 1000
+
+# Max number of interned strings, frames and stacks (when exceeded, they're forgotten after a flush and are interned
+# again with new ids, so that code objects aren't kept alive for the whole session).
+MAX_INTERNED = 10000
 
 
-def get_text_list_for_frame(frame):
+def get_text_for_frame(frame, frame_id):
     # partial copy-paste from make_thread_suspend_str
-    curFrame = frame
-    cmdTextList = []
-    try:
-        while curFrame:
-            #print cmdText
-            myId = str(id(curFrame))
-            #print "id is ", myId
+    myName = frame.f_code.co_name #method name (if in method) or ? if global
 
-            if curFrame.f_code is None:
-                break #Iron Python sometimes does not have it!
+    filename = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(frame)[1]
 
-            myName = curFrame.f_code.co_name #method name (if in method) or ? if global
-            if myName is None:
-                break #Iron Python sometimes does not have it!
+    myFile = pydevd_file_utils.norm_file_to_client(filename)
+    if file_system_encoding.lower() != "utf-8" and hasattr(myFile, "decode"):
+        # myFile is a byte string encoded using the file system encoding
+        # convert it to utf8
+        myFile = myFile.decode(file_system_encoding).encode("utf-8")
 
-            #print "name is ", myName
+    myLine = str(frame.f_lineno)
 
-            filename = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(curFrame)[1]
+    return '<frame id="%s" name="%s" file="%s" line="%s"></frame>' % (
+        frame_id, pydevd_xml.make_valid_xml_value(myName), quote(myFile, '/>_= \t'), myLine)
 
-            myFile = pydevd_file_utils.norm_file_to_client(filename)
-            if file_system_encoding.lower() != "utf-8" and hasattr(myFile, "decode"):
-                # myFile is a byte string encoded using the file system encoding
-                # convert it to utf8
-                myFile = myFile.decode(file_system_encoding).encode("utf-8")
 
-            #print "file is ", myFile
-            #myFile = inspect.getsourcefile(curFrame) or inspect.getfile(frame)
+#=======================================================================================================================
+# ConcurrencyEventsBuffer
+#=======================================================================================================================
+class ConcurrencyEventsBuffer:
+    '''
+    Fixed-size ring buffer with the events which still have to be sent to the IDE.
 
-            myLine = str(curFrame.f_lineno)
-            #print "line is ", myLine
+    Each event is a binary record: the strings in it (names, thread ids, event names, files) are
+    interned (each unique string gets an index in self._strings) and the stack is interned: each
+    unique (code, line) tuple gets a frame id and each unique stack of frame ids gets a stack id
+    (frames and stacks are sent to the IDE only once and the events just refer to the stack id).
 
-            #the variables are all gotten 'on-demand'
-            #variables = pydevd_xml.frame_vars_to_xml(curFrame.f_locals)
+    The interned entries are forgotten in pop_all() when there are more than max_interned of them
+    (frame and stack ids are never reused, so, ids already sent to the IDE stay valid).
+    '''
 
-            variables = ''
-            cmdTextList.append('<frame id="%s" name="%s" ' % (myId , pydevd_xml.make_valid_xml_value(myName)))
-            cmdTextList.append('file="%s" line="%s">' % (quote(myFile, '/>_= \t'), myLine))
-            cmdTextList.append(variables)
-            cmdTextList.append("</frame>")
-            curFrame = curFrame.f_back
-    except :
-        traceback.print_exc()
+    # time, event class, name, thread id, type, event, parent, file, line, stack id, lock id
+    _record = struct.Struct('<qiiiiiiiiiQ')
 
-    return cmdTextList
+    def __init__(self, size=EVENTS_BUFFER_SIZE, max_interned=MAX_INTERNED):
+        self._lock = thread.allocate_lock()
+        self._size = size
+        self._max_interned = max_interned
+        self._data = bytearray(size * self._record.size)
+        self._next = 0  # index of the next record to be written
+        self._count = 0  # number of records not sent yet
+        self._dropped = 0
 
+        self._strings = []
+        self._string_to_index = {}
 
-def send_message(event_class, time, name, thread_id, type, event, file, line, frame, lock_id=0, parent=None):
-    dbg = GlobalDebuggerHolder.global_dbg
-    cmdTextList = ['<xml>']
+        self._frame_to_id = {}
+        self._last_frame_id = 0
+        self._frames_to_send = []  # list(xml text)
+
+        self._stack_to_id = {}
+        self._last_stack_id = 0
+        self._stacks_to_send = []  # list(tuple(stack id, tuple(frame id)))
 
-    cmdTextList.append('<' + event_class)
-    cmdTextList.append(' time="%s"' % pydevd_xml.make_valid_xml_value(str(time)))
-    cmdTextList.append(' name="%s"' % pydevd_xml.make_valid_xml_value(name))
-    cmdTextList.append(' thread_id="%s"' % pydevd_xml.make_valid_xml_value(thread_id))
-    cmdTextList.append(' type="%s"' % pydevd_xml.make_valid_xml_value(type))
+    def _intern(self, s):
+        # Note: must be called with the lock held.
+        try:
+            return self._string_to_index[s]
+        except KeyError:
+            index = self._string_to_index[s] = len(self._strings)
+            self._strings.append(s)
+            return index
+
+    def _intern_frame(self, frame):
+        # Note: must be called with the lock held.
+        key = (frame.f_code, frame.f_lineno)
+        try:
+            return self._frame_to_id[key]
+        except KeyError:
+            self._last_frame_id += 1
+            frame_id = self._frame_to_id[key] = self._last_frame_id
+            self._frames_to_send.append(get_text_for_frame(frame, frame_id))
+            return frame_id
+
+    def _intern_stack(self, frame):
+        # Note: must be called with the lock held.
+        frame_to_id = self._frame_to_id
+        key = []
+        f = frame
+        while f is not None:
+            try:
+                key.append(frame_to_id[(f.f_code, f.f_lineno)])
+            except KeyError:
+                key.append(self._intern_frame(f))
+            f = f.f_back
+        key = tuple(key)
+
+        try:
+            return self._stack_to_id[key]
+        except KeyError:
+            self._last_stack_id += 1
+            stack_id = self._stack_to_id[key] = self._last_stack_id
+            self._stacks_to_send.append((stack_id, key))
+            return stack_id
+
+    def add(self, event_class, time, name, thread_id, type, event, file, line, frame, lock_id, parent):
+        intern = self._intern
+        self._lock.acquire()
+        try:
+            if frame is not None:
+                stack_id = self._intern_stack(frame)
+            else:
+                stack_id = 0
+
+            self._record.pack_into(
+                self._data,
+                self._next * self._record.size,
+                time,
+                intern(event_class),
+                intern(name),
+                intern(thread_id),
+                intern(type),
+                intern(event),
+                -1 if parent is None else intern(parent),
+                intern(file),
+                line,
+                stack_id,
+                lock_id,
+            )
+            self._next = (self._next + 1) % self._size
+            if self._count == self._size:
+                self._dropped += 1  # We've just overwritten the oldest one.
+            else:
+                self._count += 1
+        finally:
+            self._lock.release()
+
+    def pop_all(self):
+        '''
+        :return tuple(list(tuple), list(str), list(tuple(int, tuple(int))), int):
+            the records (as tuples, with the strings already resolved), the frames and stacks which weren't
+            sent yet and the number of dropped events.
+        '''
+        self._lock.acquire()
+        try:
+            count = self._count
+            start = (self._next - count) % self._size
+            unpack_from = self._record.unpack_from
+            record_size = self._record.size
+            data = self._data
+            strings = self._strings
+
+            records = []
+            for i in range(count):
+                (time, event_class, name, thread_id, type, event, parent, file, line, stack_id, lock_id) = \
+                    unpack_from(data, ((start + i) % self._size) * record_size)
+                records.append((
+                    time,
+                    strings[event_class],
+                    strings[name],
+                    strings[thread_id],
+                    strings[type],
+                    strings[event],
+                    None if parent == -1 else strings[parent],
+                    strings[file],
+                    line,
+                    stack_id,
+                    lock_id,
+                ))
+
+            frames = self._frames_to_send
+            self._frames_to_send = []
+            stacks = self._stacks_to_send
+            self._stacks_to_send = []
+            dropped = self._dropped
+
+            self._count = 0
+            self._dropped = 0
+
+            # No record refers to the interned strings anymore and the frames and stacks were already taken
+            # to be sent, so, they can be forgotten.
+            if len(strings) > self._max_interned:
+                self._strings = []
+                self._string_to_index = {}
+            if len(self._frame_to_id) > self._max_interned or len(self._stack_to_id) > self._max_interned:
+                self._frame_to_id = {}
+                self._stack_to_id = {}
+            return records, frames, stacks, dropped
+        finally:
+            self._lock.release()
+
+
+_events_buffer = ConcurrencyEventsBuffer()
+
+
+def _event_to_xml(record):
+    make_valid_xml_value = pydevd_xml.make_valid_xml_value
+    time, event_class, name, thread_id, type, event, parent, file, line, stack_id, lock_id = record
+
+    cmdTextList = ['<' + event_class]
+    cmdTextList.append(' time="%s"' % make_valid_xml_value(str(time)))
+    cmdTextList.append(' name="%s"' % make_valid_xml_value(name))
+    cmdTextList.append(' thread_id="%s"' % make_valid_xml_value(thread_id))
+    cmdTextList.append(' type="%s"' % make_valid_xml_value(type))
     if type == "lock":
-        cmdTextList.append(' lock_id="%s"' % pydevd_xml.make_valid_xml_value(str(lock_id)))
+        cmdTextList.append(' lock_id="%s"' % make_valid_xml_value(str(lock_id)))
     if parent is not None:
-        cmdTextList.append(' parent="%s"' % pydevd_xml.make_valid_xml_value(parent))
-    cmdTextList.append(' event="%s"' % pydevd_xml.make_valid_xml_value(event))
-    cmdTextList.append(' file="%s"' % pydevd_xml.make_valid_xml_value(file))
-    cmdTextList.append(' line="%s"' % pydevd_xml.make_valid_xml_value(str(line)))
+        cmdTextList.append(' parent="%s"' % make_valid_xml_value(parent))
+    cmdTextList.append(' event="%s"' % make_valid_xml_value(event))
+    cmdTextList.append(' file="%s"' % make_valid_xml_value(file))
+    cmdTextList.append(' line="%s"' % make_valid_xml_value(str(line)))
+    if stack_id:
+        cmdTextList.append(' stack_id="%s"' % (stack_id,))
     cmdTextList.append('></' + event_class + '>')
+    return ''.join(cmdTextList)
+
+
+def flush_events(dbg):
+    '''
+    Sends the events collected so far to the IDE (in as few messages as possible).
+    '''
+    if dbg is None or dbg.writer is None:
+        return
+
+    records, frames, stacks, dropped = _events_buffer.pop_all()
+    if not records and not stacks and not dropped:
+        return
+
+    cmdTextList = ['<xml>']
+    cmdTextList.extend(frames)
+    for stack_id, frame_ids in stacks:
+        cmdTextList.append('<stack id="%s" frames="%s"></stack>' % (stack_id, ','.join(str(x) for x in frame_ids)))
+
+    if dropped:
+        cmdTextList.append('<dropped count="%s"></dropped>' % (dropped,))
+
+    in_message = 0
+    for record in records:
+        if in_message == EVENTS_PER_MESSAGE:
+            cmdTextList.append('</xml>')
+            dbg.writer.add_command(NetCommand(CMD_GET_CONCURRENCY_EVENT, 0, ''.join(cmdTextList)))
+            cmdTextList = ['<xml>']
+            in_message = 0
+        cmdTextList.append(_event_to_xml(record))
+        in_message += 1
 
-    cmdTextList += get_text_list_for_frame(frame)
     cmdTextList.append('</xml>')
+    dbg.writer.add_command(NetCommand(CMD_GET_CONCURRENCY_EVENT, 0, ''.join(cmdTextList)))
 
-    text = ''.join(cmdTextList)
-    if dbg.writer is not None:
-        dbg.writer.add_command(NetCommand(145, 0, text))
+
+def send_message(event_class, time, name, thread_id, type, event, file, line, frame, lock_id=0, parent=None):
+    '''
+    Adds an event to be sent to the IDE in the next flush_events().
+    '''
+    try:
+        _events_buffer.add(event_class, time, name, thread_id, type, event, file, line, frame, lock_id, parent)
+    except:
+        traceback.print_exc()
 
 
 def log_new_thread(global_debugger):
@@ -119,225 +324,181 @@ def log_new_thread(global_debugger):
              "start", "code_name", 0, None, parent=get_thread_id(t))
 
 
+def _is_internal_frame(frame):
+    # Operations done by the threading module or by pydevd itself aren't interesting.
+    if frame is None:
+        return True
+    base = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(frame)[-1]
+    return base in DONT_TRACE_THREADING or DONT_TRACE.get(base) == PYDEV_FILE
+
+
 class ThreadingLogger:
+    '''
+    Receives the notifications from the wrappers installed by pydevd_thread_wrappers.wrap_threads()
+    (so, no frame inspection is needed to detect thread, lock and queue operations).
+    '''
+
     def __init__(self):
         self.start_time = cur_time()
 
     def set_start_time(self, time):
         self.start_time = time
 
-    def log_event(self, frame):
-        write_log = False
-        self_obj = None
-        if dict_contains(frame.f_locals, "self"):
-            self_obj = frame.f_locals["self"]
-            if isinstance(self_obj, threading.Thread) or self_obj.__class__ == ObjectWrapper:
-                write_log = True
-        if hasattr(frame, "f_back") and frame.f_back is not None:
-            back = frame.f_back
-            if hasattr(back, "f_back") and back.f_back is not None:
-                back = back.f_back
-                if dict_contains(back.f_locals, "self"):
-                    if isinstance(back.f_locals["self"], threading.Thread):
-                        write_log = True
+    def _send_thread_event(self, name, thread_id, event, frame, parent=None):
+        send_message("threading_event", cur_time() - self.start_time, name, thread_id, "thread",
+                     event, frame.f_code.co_filename, frame.f_lineno, frame, parent=parent)
+
+    def on_thread_start(self, thread_obj, frame):
+        try:
+            if _is_internal_frame(frame):
+                return
+            self._send_thread_event(thread_obj.getName(), get_thread_id(thread_obj), "start", frame,
+                                    parent=get_thread_id(threadingCurrentThread()))
+        except Exception:
+            traceback.print_exc()
+
+    def on_thread_join(self, thread_obj, frame):
+        try:
+            if _is_internal_frame(frame):
+                return
+            # join called in the current thread, not in the joined thread
+            t = threadingCurrentThread()
+            self._send_thread_event(t.getName(), get_thread_id(t), "join", frame)
+        except Exception:
+            traceback.print_exc()
+
+    def on_thread_joined(self, thread_obj, frame):
         try:
-            if write_log:
-                t = threadingCurrentThread()
-                back = frame.f_back
-                if not back:
+            if _is_internal_frame(frame):
+                return
+            self._send_thread_event(thread_obj.getName(), get_thread_id(thread_obj), "stop", frame,
+                                    parent=get_thread_id(threadingCurrentThread()))
+        except Exception:
+            traceback.print_exc()
+
+    def on_thread_run_finished(self, thread_obj, frame):
+        try:
+            if IS_PY3K and getattr(thread_obj, "_pydev_join_called", False):
+                # The stop is reported by the join
+                # (we can't detect stop after join in Python 2 yet).
+                return
+            self._send_thread_event("Thread", get_thread_id(thread_obj), "stop", frame)
+        except Exception:
+            traceback.print_exc()
+
+    def _send_lock_event(self, lock, event, frame):
+        t = threadingCurrentThread()
+        send_message("threading_event", cur_time() - self.start_time, t.getName(), get_thread_id(t), "lock",
+                     event, frame.f_code.co_filename, frame.f_lineno, frame, lock_id=id(lock))
+
+    def on_lock_created(self, lock, frame):
+        try:
+            if _is_internal_frame(frame) or getattr(threadingCurrentThread(), 'is_pydev_daemon_thread', False):
+                return
+            self._send_lock_event(lock, "__init__", frame)
+        except Exception:
+            traceback.print_exc()
+
+    def on_lock_call(self, lock, attr, begin, frame):
+        if attr not in _LOGGED_LOCK_METHODS:
+            return
+        try:
+            if _is_internal_frame(frame) or getattr(threadingCurrentThread(), 'is_pydev_daemon_thread', False):
+                return
+            if begin:
+                real_method = attr + "_begin"
+            else:
+                if attr == "release":
+                    # do not log release end. Maybe use it later
                     return
-                _, name, back_base = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(back)
-                event_time = cur_time() - self.start_time
-                method_name = frame.f_code.co_name
-
-                if isinstance(self_obj, threading.Thread):
-                    if not hasattr(self_obj, "_pydev_run_patched"):
-                        wrap_attr(self_obj, "run")
-                    if (method_name in THREAD_METHODS) and (back_base not in DONT_TRACE_THREADING or \
-                            (method_name in INNER_METHODS and back_base in INNER_FILES)):
-                        thread_id = get_thread_id(self_obj)
-                        name = self_obj.getName()
-                        real_method = frame.f_code.co_name
-                        parent = None
-                        if real_method == "_stop":
-                            if back_base in INNER_FILES and \
-                                            back.f_code.co_name == "_wait_for_tstate_lock":
-                                back = back.f_back.f_back
-                            real_method = "stop"
-                            if hasattr(self_obj, "_pydev_join_called"):
-                                parent = get_thread_id(t)
-                        elif real_method == "join":
-                            # join called in the current thread, not in self object
-                            if not self_obj.is_alive():
-                                return
-                            thread_id = get_thread_id(t)
-                            name = t.getName()
-                            setattr(self_obj, "_pydev_join_called", True)
-
-                        if real_method == "start":
-                            parent = get_thread_id(t)
-                        send_message("threading_event", event_time, name, thread_id, "thread",
-                        real_method, back.f_code.co_filename, back.f_lineno, back, parent=parent)
-                        # print(event_time, self_obj.getName(), thread_id, "thread",
-                        #       real_method, back.f_code.co_filename, back.f_lineno)
-
-                if method_name == "pydev_after_run_call":
-                    if hasattr(frame, "f_back") and frame.f_back is not None:
-                        back = frame.f_back
-                        if hasattr(back, "f_back") and back.f_back is not None:
-                            back = back.f_back
-                        if dict_contains(back.f_locals, "self"):
-                            if isinstance(back.f_locals["self"], threading.Thread):
-                                my_self_obj = frame.f_back.f_back.f_locals["self"]
-                                my_back = frame.f_back.f_back
-                                my_thread_id = get_thread_id(my_self_obj)
-                                send_massage = True
-                                if IS_PY3K and hasattr(my_self_obj, "_pydev_join_called"):
-                                    send_massage = False
-                                    # we can't detect stop after join in Python 2 yet
-                                if send_massage:
-                                    send_message("threading_event", event_time, "Thread", my_thread_id, "thread",
-                                                 "stop", my_back.f_code.co_filename, my_back.f_lineno, my_back, parent=None)
-
-                if self_obj.__class__ == ObjectWrapper:
-                    if back_base in DONT_TRACE_THREADING:
-                        # do not trace methods called from threading
-                        return
-                    back_back_base = pydevd_file_utils.get_abs_path_real_path_and_base_from_frame(back.f_back)[-1]
-                    back = back.f_back
-                    if back_back_base in DONT_TRACE_THREADING:
-                        # back_back_base is the file, where the method was called froms
-                        return
-                    if method_name == "__init__":
-                        send_message("threading_event", event_time, t.getName(), get_thread_id(t), "lock",
-                                     method_name, back.f_code.co_filename, back.f_lineno, back, lock_id=str(id(frame.f_locals["self"])))
-                    if dict_contains(frame.f_locals, "attr") and \
-                            (frame.f_locals["attr"] in LOCK_METHODS or
-                            frame.f_locals["attr"] in QUEUE_METHODS):
-                        real_method = frame.f_locals["attr"]
-                        if method_name == "call_begin":
-                            real_method += "_begin"
-                        elif method_name == "call_end":
-                            real_method += "_end"
-                        else:
-                            return
-                        if real_method == "release_end":
-                            # do not log release end. Maybe use it later
-                            return
-                        send_message("threading_event", event_time, t.getName(), get_thread_id(t), "lock",
-                        real_method, back.f_code.co_filename, back.f_lineno, back, lock_id=str(id(self_obj)))
-
-                        if real_method in ("put_end", "get_end"):
-                            # fake release for queue, cause we don't call it directly
-                            send_message("threading_event", event_time, t.getName(), get_thread_id(t), "lock",
-                                         "release", back.f_code.co_filename, back.f_lineno, back, lock_id=str(id(self_obj)))
-                        # print(event_time, t.getName(), get_thread_id(t), "lock",
-                        #       real_method, back.f_code.co_filename, back.f_lineno)
+                real_method = attr + "_end"
 
+            self._send_lock_event(lock, real_method, frame)
 
+            if real_method in ("put_end", "get_end"):
+                # fake release for queue, cause we don't call it directly
+                self._send_lock_event(lock, "release", frame)
         except Exception:
             traceback.print_exc()
 
 
 class NameManager:
+    '''
+    Gives sequential names to objects (i.e.: Task-1, Task-2). The objects are weakly referenced, so, the
+    entries are removed when they're garbage-collected.
+    '''
+
     def __init__(self, name_prefix):
-        self.tasks = {}
+        self.tasks = weakref.WeakKeyDictionary()
         self.last = 0
         self.prefix = name_prefix
 
-    def get(self, id):
-        if id not in self.tasks:
+    def get(self, obj):
+        try:
+            return self.tasks[obj]
+        except KeyError:
             self.last += 1
-            self.tasks[id] = self.prefix + "-" + str(self.last)
-        return self.tasks[id]
+            name = self.tasks[obj] = self.prefix + "-" + str(self.last)
+            return name
+
+
+def _get_coroutine_code(task):
+    get_coro = getattr(task, 'get_coro', None)
+    if get_coro is not None:
+        coro = get_coro()
+    else:
+        coro = getattr(task, '_coro', None)
+    return getattr(coro, 'cr_code', None) or getattr(coro, 'gi_code', None)
 
 
 class AsyncioLogger:
+    '''
+    Receives the notifications from the wrappers installed by pydevd_asyncio_wrappers.wrap_asyncio()
+    (tasks are notified when created by the event loop and when done and the task of a lock/queue operation
+    is the current task of the loop, so, no frame inspection is needed).
+    '''
+
+    # Name used for the operations done outside of a task (see: the fake event sent in PyDB.run).
+    NO_TASK_NAME = "Task"
+
     def __init__(self):
         self.task_mgr = NameManager("Task")
-        self.coro_mgr = NameManager("Coro")
         self.start_time = cur_time()
 
-    def get_task_id(self, frame):
-        while frame is not None:
-            if dict_contains(frame.f_locals, "self"):
-                self_obj = frame.f_locals["self"]
-                if isinstance(self_obj,  asyncio.Task):
-                    method_name = frame.f_code.co_name
-                    if method_name == "_step":
-                        return id(self_obj)
-            frame = frame.f_back
-        return None
-
-    def log_event(self, frame):
-        event_time = cur_time() - self.start_time
-
-        # Debug loop iterations
-        # if isinstance(self_obj, asyncio.base_events.BaseEventLoop):
-        #     if method_name == "_run_once":
-        #         print("Loop iteration")
-
-        if not hasattr(frame, "f_back") or frame.f_back is None:
-            return
-        back = frame.f_back
-
-        if dict_contains(frame.f_locals, "self"):
-            self_obj = frame.f_locals["self"]
-            if isinstance(self_obj, asyncio.Task):
-                method_name = frame.f_code.co_name
-                if method_name == "set_result":
-                    task_id = id(self_obj)
-                    task_name = self.task_mgr.get(str(task_id))
-                    send_message("asyncio_event", event_time, task_name, task_name, "thread", "stop", frame.f_code.co_filename,
-                                 frame.f_lineno, frame)
-
-                method_name = back.f_code.co_name
-                if method_name == "__init__":
-                    task_id = id(self_obj)
-                    task_name = self.task_mgr.get(str(task_id))
-                    send_message("asyncio_event", event_time, task_name, task_name, "thread", "start", frame.f_code.co_filename,
-                                 frame.f_lineno, frame)
-
-            method_name = frame.f_code.co_name
-            if isinstance(self_obj, asyncio.Lock):
-                if method_name in ("acquire", "release"):
-                    task_id = self.get_task_id(frame)
-                    task_name = self.task_mgr.get(str(task_id))
-
-                    if method_name == "acquire":
-                        if not self_obj._waiters and not self_obj.locked():
-                            send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                         method_name+"_begin", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-                        if self_obj.locked():
-                            method_name += "_begin"
-                        else:
-                            method_name += "_end"
-                    elif method_name == "release":
-                        method_name += "_end"
-
-                    send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                 method_name, frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-
-            if isinstance(self_obj, asyncio.Queue):
-                if method_name in ("put", "get", "_put", "_get"):
-                    task_id = self.get_task_id(frame)
-                    task_name = self.task_mgr.get(str(task_id))
-
-                    if method_name == "put":
-                        send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                     "acquire_begin", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-                    elif method_name == "_put":
-                        send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                     "acquire_end", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-                        send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                     "release", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-                    elif method_name == "get":
-                        back = frame.f_back
-                        if back.f_code.co_name != "send":
-                            send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                         "acquire_begin", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-                        else:
-                            send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                         "acquire_end", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
-                            send_message("asyncio_event", event_time, task_name, task_name, "lock",
-                                         "release", frame.f_code.co_filename, frame.f_lineno, frame, lock_id=str(id(self_obj)))
+    def set_start_time(self, time):
+        self.start_time = time
+
+    def get_task_name(self, task):
+        if task is None:
+            return self.NO_TASK_NAME
+        return self.task_mgr.get(task)
+
+    def on_task_start(self, task, frame):
+        try:
+            task_name = self.get_task_name(task)
+            send_message("asyncio_event", cur_time() - self.start_time, task_name, task_name, "thread", "start",
+                         frame.f_code.co_filename, frame.f_lineno, frame)
+            task.add_done_callback(self.on_task_stop)
+        except Exception:
+            traceback.print_exc()
+
+    def on_task_stop(self, task):
+        try:
+            task_name = self.get_task_name(task)
+            code = _get_coroutine_code(task)
+            if code is not None:
+                filename, line = code.co_filename, code.co_firstlineno
+            else:
+                filename, line = '', 0
+            send_message("asyncio_event", cur_time() - self.start_time, task_name, task_name, "thread", "stop",
+                         filename, line, None)
+        except Exception:
+            traceback.print_exc()
+
+    def on_lock_event(self, obj, event, frame):
+        try:
+            task_name = self.get_task_name(get_current_task())
+            send_message("asyncio_event", cur_time() - self.start_time, task_name, task_name, "lock",
+                         event, frame.f_code.co_filename, frame.f_lineno, frame, lock_id=id(obj))
+        except Exception:
+            traceback.print_exc()
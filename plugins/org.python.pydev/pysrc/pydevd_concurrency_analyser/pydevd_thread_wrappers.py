@@ -1,20 +1,76 @@
+import sys
+
 from _pydev_imps._pydev_saved_modules import threading
+from _pydev_imps._pydev_saved_modules import thread
+
+# The object notified about thread/lock/queue operations (a ThreadingLogger). It's
+# set in wrap_threads() and the wrappers below call it directly (so, the tracer
+# doesn't need to inspect every frame to discover those operations).
+_listener = None
+
+# Thread idents currently inside a listener call (the listener itself may end up
+# creating locks, i.e.: when creating the dummy thread for a thread not started
+# through the threading module, and those must not be notified again).
+_notifying = {}
+
+
+def _notify(method_name, *args):
+    listener = _listener
+    if listener is None:
+        return
+    ident = thread.get_ident()
+    if ident in _notifying:
+        return
+    _notifying[ident] = True
+    try:
+        getattr(listener, method_name)(*args)
+    finally:
+        del _notifying[ident]
 
 
-def wrapper(fun):
-    def pydev_after_run_call():
-        pass
+def _wrap_run(thread_obj):
+    original_run = thread_obj.run
 
-    def inner(*args, **kwargs):
-        fun(*args, **kwargs)
-        pydev_after_run_call()
-    return inner
+    def run(*args, **kwargs):
+        try:
+            original_run(*args, **kwargs)
+        finally:
+            _notify('on_thread_run_finished', thread_obj, sys._getframe(1))
+
+    thread_obj.run = run
+    thread_obj._pydev_run_patched = True
 
 
-def wrap_attr(obj, attr):
-    t_save_start = getattr(obj, attr)
-    setattr(obj, attr, wrapper(t_save_start))
-    setattr(obj, "_pydev_run_patched", True)
+def _patch_thread_class():
+    Thread = threading.Thread
+    if getattr(Thread, '_pydev_concurrency_patched', False):
+        return
+
+    original_start = Thread.start
+    original_join = Thread.join
+
+    def start(self, *args, **kwargs):
+        if _listener is not None and not getattr(self, 'is_pydev_daemon_thread', False):
+            if not getattr(self, '_pydev_run_patched', False):
+                _wrap_run(self)
+            _notify('on_thread_start', self, sys._getframe(1))
+        return original_start(self, *args, **kwargs)
+
+    def join(self, *args, **kwargs):
+        if _listener is None or getattr(self, 'is_pydev_daemon_thread', False) or not self.is_alive():
+            return original_join(self, *args, **kwargs)
+
+        frame = sys._getframe(1)
+        self._pydev_join_called = True
+        _notify('on_thread_join', self, frame)
+        ret = original_join(self, *args, **kwargs)
+        if not self.is_alive():
+            _notify('on_thread_joined', self, frame)
+        return ret
+
+    Thread.start = start
+    Thread.join = join
+    Thread._pydev_concurrency_patched = True
 
 
 class ObjectWrapper(object):
@@ -25,6 +81,8 @@ class ObjectWrapper(object):
             functools.update_wrapper(self, obj)
         except:
             pass
+        if _listener is not None:
+            _notify('on_lock_created', self, sys._getframe(2))
 
     def __getattr__(self, attr):
         orig_attr = getattr(self.wrapped_object, attr) #.__getattribute__(attr)
@@ -41,10 +99,12 @@ class ObjectWrapper(object):
             return orig_attr
 
     def call_begin(self, attr):
-        pass
+        if _listener is not None:
+            _notify('on_lock_call', self, attr, True, sys._getframe(2))
 
     def call_end(self, attr):
-        pass
+        if _listener is not None:
+            _notify('on_lock_call', self, attr, False, sys._getframe(2))
 
     def __enter__(self):
         self.call_begin("__enter__")
@@ -63,7 +123,13 @@ def factory_wrapper(fun):
     return inner
 
 
-def wrap_threads():
+def wrap_threads(listener=None):
+    '''
+    :param listener: the object which should be notified of thread, lock and queue operations
+        (see: pydevd_concurrency_logger.ThreadingLogger).
+    '''
+    global _listener
+    _listener = listener
     # TODO: add wrappers for thread and _thread
     # import _thread as mod
     # print("Thread imported")
@@ -71,6 +137,7 @@ def wrap_threads():
     import threading
     threading.Lock = factory_wrapper(threading.Lock)
     threading.RLock = factory_wrapper(threading.RLock)
+    _patch_thread_class()
 
     # queue patching
     try:
@@ -79,4 +146,3 @@ def wrap_threads():
     except:
         import Queue
         Queue.Queue = factory_wrapper(Queue.Queue)
-
@@ -1,5 +1,7 @@
 from _pydevd_bundle.pydevd_comm import CMD_SET_BREAK, CMD_ADD_EXCEPTION_BREAK
+import bisect
 import inspect
+import os
 from _pydevd_bundle.pydevd_constants import STATE_SUSPEND, get_thread_id, dict_contains, dict_iter_items, DJANGO_SUSPEND, IS_PY2
 from pydevd_file_utils import get_abs_path_real_path_and_base_from_file, normcase
 from _pydevd_bundle.pydevd_breakpoints import LineBreakpoint, get_exception_name
@@ -20,6 +22,9 @@ try:
 except:
     pass
 
+# Line breakpoints are only checked in frames with these names (see: pydevd_plugin_utils.CodeNameFilter).
+LINE_BREAKPOINT_CODE_NAMES = ('render',)
+
 
 class DjangoLineBreakpoint(LineBreakpoint):
     def __init__(self, file, line, condition, func_name, expression):
@@ -68,17 +73,43 @@ def get_breakpoints(plugin, pydb, type):
         return pydb.django_breakpoints
     return None
 
+# (cls, names) -> whether the class inherits from a class with one of the names.
+_cls_inherits_cache = {}
+
+
 def _inherits(cls, *names):
-    if cls.__name__ in names:
-        return True
+    key = (cls, names)
+    try:
+        return _cls_inherits_cache[key]
+    except KeyError:
+        pass
+
     inherits_node = False
-    for base in inspect.getmro(cls):
-        if base.__name__ in names:
-            inherits_node = True
-            break
+    if cls.__name__ in names:
+        inherits_node = True
+    else:
+        for base in inspect.getmro(cls):
+            if base.__name__ in names:
+                inherits_node = True
+                break
+    _cls_inherits_cache[key] = inherits_node
     return inherits_node
 
 
+# cls -> whether a render() call in an instance of the class should be considered a template render call.
+_cls_is_render_node_cache = {}
+
+
+def _is_render_node_class(cls):
+    try:
+        return _cls_is_render_node_cache[cls]
+    except KeyError:
+        clsname = cls.__name__
+        ret = _cls_is_render_node_cache[cls] = \
+            _inherits(cls, 'Node') and clsname != 'TextNode' and clsname != 'NodeList'
+        return ret
+
+
 def _is_django_render_call(frame):
     try:
         name = frame.f_code.co_name
@@ -90,20 +121,17 @@ def _is_django_render_call(frame):
 
         cls = frame.f_locals['self'].__class__
 
-        inherits_node = _inherits(cls, 'Node')
-
-        if not inherits_node:
+        if not _is_render_node_class(cls):
             return False
 
-        clsname = cls.__name__
         if IS_DJANGO19:
             # in Django 1.9 we need to save the flag that there is included template
-            if clsname == 'IncludeNode':
+            if cls.__name__ == 'IncludeNode':
                 if dict_contains(frame.f_locals, 'context'):
                     context = frame.f_locals['context']
                     context._has_included_template = True
 
-        return clsname != 'TextNode' and clsname != 'NodeList'
+        return True
     except:
         traceback.print_exc()
         return False
@@ -146,6 +174,8 @@ def _is_django_suspended(thread):
 
 def suspend_django(main_debugger, thread, frame, cmd=CMD_SET_BREAK):
     frame = DjangoTemplateFrame(frame)
+    # The templates may be edited while suspended.
+    _recheck_template_mtimes()
 
     if frame.f_lineno is None:
         return None
@@ -179,23 +209,69 @@ def _read_file(filename):
     return s
 
 
-def _offset_to_line_number(text, offset):
-    curLine = 1
-    curOffset = 0
-    while curOffset < offset:
-        if curOffset == len(text):
-            return -1
-        c = text[curOffset]
+def _get_line_starts(text):
+    '''
+    :return list(int): the offsets where each line starts (considering \\n, \\r and \\r\\n as new lines).
+    '''
+    line_starts = [0]
+    append = line_starts.append
+    i = 0
+    len_text = len(text)
+    while i < len_text:
+        c = text[i]
         if c == '\n':
-            curLine += 1
+            append(i + 1)
         elif c == '\r':
-            curLine += 1
-            if curOffset < len(text) and text[curOffset + 1] == '\n':
-                curOffset += 1
+            if i + 1 < len_text and text[i + 1] == '\n':
+                i += 1
+            append(i + 1)
+        i += 1
+    return line_starts
+
+
+# filename -> (mtime, len(text), line starts, origin, mtime check generation)
+_template_line_starts_cache = {}
+
+# The mtime of a template is only checked again when it's loaded again by django (i.e.: a new origin) or after the
+# debugger suspends, not on each render.
+_template_mtime_check_generation = 0
+
+
+def _recheck_template_mtimes():
+    global _template_mtime_check_generation
+    _template_mtime_check_generation += 1
+
+
+def _get_template_line_starts(filename, origin=None):
+    cached = _template_line_starts_cache.get(filename)
+    generation = _template_mtime_check_generation
+    if cached is not None and origin is not None and cached[3] is origin and cached[4] == generation:
+        return cached[1], cached[2]
+
+    mtime = os.path.getmtime(filename)
+    if cached is not None and cached[0] == mtime:
+        len_text, line_starts = cached[1], cached[2]
+    else:
+        text = _read_file(filename)
+        len_text, line_starts = len(text), _get_line_starts(text)
+    _template_line_starts_cache[filename] = (mtime, len_text, line_starts, origin, generation)
+    return len_text, line_starts
+
+
+def _template_offset_to_line_number(filename, offset, origin=None):
+    '''
+    :param origin: the origin of the template being rendered (if given, the mtime of the file is only checked again
+        for a new origin or after the debugger suspended).
 
-        curOffset += 1
+    :return int: the line (1-based) of the given offset in the template contents (or -1 if it's after the end).
 
-    return curLine
+    The line starts of the template are cached (and only recomputed if the file changes), so, each call is just a
+    bisect.
+    '''
+    len_text, line_starts = _get_template_line_starts(filename, origin)
+    if offset > len_text:
+        return -1
+    return bisect.bisect_right(line_starts, offset)
 
 
 def _get_source_django_18_or_lower(frame):
@@ -278,7 +354,7 @@ def _get_template_line(frame):
     source = _get_source_django_18_or_lower(frame)
     file_name = _get_template_file_name(frame)
     try:
-        return _offset_to_line_number(_read_file(file_name), source[1][0])
+        return _template_offset_to_line_number(file_name, source[1][0], source[0])
     except:
         return None
 
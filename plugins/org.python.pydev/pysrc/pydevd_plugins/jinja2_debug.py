@@ -6,6 +6,10 @@ from _pydevd_bundle import pydevd_vars
 from pydevd_file_utils import get_abs_path_real_path_and_base_from_file
 from _pydevd_bundle.pydevd_frame_utils import add_exception_to_frame, FCode
 
+# Line breakpoints are only checked in frames with these names (see: pydevd_plugin_utils.CodeNameFilter).
+LINE_BREAKPOINT_CODE_NAMES = ('root', 'loop', 'macro')
+LINE_BREAKPOINT_CODE_NAME_PREFIXES = ('block_',)
+
 class Jinja2LineBreakpoint(LineBreakpoint):
 
     def __init__(self, file, line, condition, func_name, expression):
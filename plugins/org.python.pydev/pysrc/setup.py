@@ -134,14 +134,17 @@ args = dict(
 
 import sys
 try:
+    # In this setup, don't even try to compile with cython, just go with the .c file which should've
+    # been properly generated from a tested version.
+    ext_modules = [Extension('_pydevd_bundle.pydevd_cython', ["_pydevd_bundle/pydevd_cython.c",])]
+    if os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), "_pydevd_bundle", "pydevd_cython_xml.c")):
+        # Optional: the xml serialization and resolvers speedups.
+        ext_modules.append(Extension('_pydevd_bundle.pydevd_cython_xml', ["_pydevd_bundle/pydevd_cython_xml.c",]))
+
     args_with_binaries = args.copy()
     args_with_binaries.update(dict(
         distclass=BinaryDistribution,
-        ext_modules=[
-            # In this setup, don't even try to compile with cython, just go with the .c file which should've
-            # been properly generated from a tested version.
-            Extension('_pydevd_bundle.pydevd_cython', ["_pydevd_bundle/pydevd_cython.c",])
-        ]
+        ext_modules=ext_modules
     ))
     setup(**args_with_binaries)
 except:
@@ -28,50 +28,59 @@ import os
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 
-pyx_file = os.path.join(os.path.dirname(__file__), "_pydevd_bundle", "pydevd_cython.pyx")
-c_file = os.path.join(os.path.dirname(__file__), "_pydevd_bundle", "pydevd_cython.c")
+# The tracing speedups (pydevd_cython) and the xml serialization/resolvers speedups (pydevd_cython_xml).
+# The xml speedups are optional: if its .c file wasn't generated they're skipped (the pure python version is
+# used in that case).
+modules = [('pydevd_cython', target_pydevd_name)]
+modules.append(('pydevd_cython_xml', target_pydevd_name.replace('pydevd_cython', 'pydevd_cython_xml', 1)))
 
 if target_pydevd_name != 'pydevd_cython':
-    # It MUST be there in this case!
-    # (otherwise we'll have unresolved externals because the .c file had another name initially).
-    import shutil
-
     # We must force cython in this case (but only in this case -- for the regular setup in the user machine, we
     # should always compile the .c file).
     force_cython = True
 
-    new_pyx_file = os.path.join(os.path.dirname(__file__), "_pydevd_bundle", "%s.pyx" % (target_pydevd_name,))
-    new_c_file = os.path.join(os.path.dirname(__file__), "_pydevd_bundle", "%s.c" % (target_pydevd_name,))
-    shutil.copy(pyx_file, new_pyx_file)
-    pyx_file = new_pyx_file
-    assert os.path.exists(pyx_file)
-
+bundle_dir = os.path.join(os.path.dirname(__file__), "_pydevd_bundle")
+created_files = []
 try:
-    if force_cython:
-        from Cython.Build import cythonize # @UnusedImport
-        ext_modules = cythonize([
-            "_pydevd_bundle/%s.pyx" % (target_pydevd_name,),
-        ])
-    else:
-        # Always compile the .c (and not the .pyx) file (which we should keep up-to-date by running build_tools/build.py).
-        from distutils.extension import Extension
-        ext_modules = [Extension('_pydevd_bundle.%s' % (target_pydevd_name,), [
-            "_pydevd_bundle/%s.c" % (target_pydevd_name,),
-        ])]
+    ext_modules = []
+    for original_name, target_name in modules:
+        pyx_file = os.path.join(bundle_dir, "%s.pyx" % (original_name,))
+        c_file = os.path.join(bundle_dir, "%s.c" % (target_name,))
+
+        if target_name != original_name:
+            # It MUST be there in this case!
+            # (otherwise we'll have unresolved externals because the .c file had another name initially).
+            import shutil
+
+            new_pyx_file = os.path.join(bundle_dir, "%s.pyx" % (target_name,))
+            shutil.copy(pyx_file, new_pyx_file)
+            created_files.append(new_pyx_file)
+            created_files.append(c_file)
+            pyx_file = new_pyx_file
+            assert os.path.exists(pyx_file)
+
+        if force_cython:
+            from Cython.Build import cythonize # @UnusedImport
+            ext_modules.extend(cythonize([
+                "_pydevd_bundle/%s.pyx" % (target_name,),
+            ]))
+        else:
+            if original_name != 'pydevd_cython' and not os.path.exists(c_file):
+                continue
+            # Always compile the .c (and not the .pyx) file (which we should keep up-to-date by running build_tools/build.py).
+            from distutils.extension import Extension
+            ext_modules.append(Extension('_pydevd_bundle.%s' % (target_name,), [
+                "_pydevd_bundle/%s.c" % (target_name,),
+            ]))
 
     setup(
         name='Cythonize',
         ext_modules=ext_modules
     )
 finally:
-    if target_pydevd_name != 'pydevd_cython':
-        try:
-            os.remove(new_pyx_file)
-        except:
-            import traceback
-            traceback.print_exc()
+    for f in created_files:
         try:
-            os.remove(new_c_file)
+            os.remove(f)
         except:
             import traceback
             traceback.print_exc()
@@ -0,0 +1,125 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+PEP8_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'third_party', 'pep8')
+if PEP8_DIR not in sys.path:
+    sys.path.insert(0, PEP8_DIR)
+
+try:
+    import autopep8  #@UnresolvedImport
+except Exception:
+    autopep8 = None  # i.e.: the bundled autopep8 uses inspect.getargspec (removed in Python 3.11).
+
+try:
+    import lib2to3  #@UnresolvedImport @UnusedImport
+except ImportError:
+    lib2to3 = None
+
+
+SOURCE = '''
+d = {}
+if d.has_key('a'):
+    print 'a'
+'''
+
+
+class TestRefactoringToolsCache(unittest.TestCase):
+
+    def setUp(self):
+        if autopep8 is None or lib2to3 is None:
+            self.skipTest('autopep8/lib2to3 not available.')
+
+    def test_same_fixes(self):
+        autopep8._refactoring_tools.clear()
+        fixer_names = ['has_key', 'print']
+        first = autopep8.refactor(SOURCE, fixer_names)
+        self.assertTrue("'a' in d" in first, first)
+
+        # The second time the cached tool is used.
+        self.assertEqual(1, len(autopep8._refactoring_tools))
+        self.assertEqual(first, autopep8.refactor(SOURCE, fixer_names))
+        self.assertEqual(1, len(autopep8._refactoring_tools))
+
+    def test_fixers_order_kept(self):
+        autopep8._refactoring_tools.clear()
+        autopep8.refactor(SOURCE, ['has_key', 'print'])
+        autopep8.refactor(SOURCE, ['print', 'has_key'])
+        self.assertEqual(
+            set([('has_key', 'print'), ('print', 'has_key')]), set(autopep8._refactoring_tools.keys()))
+
+
+class TestGrammarCache(unittest.TestCase):
+    '''
+    Checks the grammar caching done in the lib2to3 bundled with autopep8 (which is only used in Python 2).
+    '''
+
+    def setUp(self):
+        if sys.version_info[0] != 2:
+            self.skipTest('The bundled lib2to3 is only used in Python 2.')
+
+        self.original_modules = dict((name, module) for (name, module) in sys.modules.items()
+                                     if name == 'lib2to3' or name.startswith('lib2to3.'))
+        for name in self.original_modules:
+            del sys.modules[name]
+        self.lib2to3_dir = os.path.join(PEP8_DIR, 'lib2to3')
+        sys.path.insert(0, self.lib2to3_dir)
+        from lib2to3.pgen2 import driver  #@UnresolvedImport
+        self.driver = driver
+        assert driver.__file__.startswith(self.lib2to3_dir), driver.__file__
+
+        self.tempdir = tempfile.mkdtemp()
+        self.original_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.tempdir, 'cache')
+
+    def tearDown(self):
+        if sys.version_info[0] != 2:
+            return
+        if self.original_cache_home is None:
+            del os.environ['XDG_CACHE_HOME']
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.original_cache_home
+        shutil.rmtree(self.tempdir)
+
+        sys.path.remove(self.lib2to3_dir)
+        for name in list(sys.modules):
+            if name == 'lib2to3' or name.startswith('lib2to3.'):
+                del sys.modules[name]
+        sys.modules.update(self.original_modules)
+
+    def test_pickle_fallback(self):
+        driver = self.driver
+        gt = os.path.join(self.tempdir, 'Grammar.txt')
+        shutil.copy(os.path.join(self.lib2to3_dir, 'lib2to3', 'Grammar.txt'), gt)
+        # The pickle can't be written next to the grammar (its directory doesn't exist).
+        gp = os.path.join(self.tempdir, 'not_writable', 'Grammar.pickle')
+
+        g = driver.load_grammar(gt, gp)
+        self.assertFalse(os.path.exists(gp))
+        cached_gp = os.path.join(self.tempdir, 'cache', 'pydev', 'lib2to3', 'Grammar.pickle')
+        self.assertTrue(os.path.exists(cached_gp))
+
+        # Loaded once for each process.
+        self.assertTrue(g is driver.load_grammar(gt, gp))
+
+        # In a new process the pickle from the cache dir is used (the tables aren't generated again).
+        driver._loaded_grammars.clear()
+        original_generate_grammar = driver.pgen.generate_grammar
+
+        def generate_grammar(*args, **kwargs):
+            raise AssertionError('The grammar should be loaded from the cache.')
+
+        driver.pgen.generate_grammar = generate_grammar
+        try:
+            loaded = driver.load_grammar(gt, gp)
+        finally:
+            driver.pgen.generate_grammar = original_generate_grammar
+        self.assertTrue(loaded is not g)
+        self.assertEqual(g.symbol2number, loaded.symbol2number)
+        self.assertEqual(g.dfas, loaded.dfas)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -137,6 +137,73 @@ class Test(unittest.TestCase):
             sys.stdout = self.original_stdout
 
 
+    def test_console_exec_batch(self):
+        self.original_stdout = sys.stdout
+        sys.stdout = pydevd_io.IOBuf()
+        try:
+            from _pydev_bundle.pydev_console_utils import CodeFragment
+
+            interpreter = pydevconsole.InterpreterInterface(None, None, threading.currentThread())
+            self.assertTrue(interpreter.execBatch(['a = 1\nb = 2', 'print(a + b)', 'print(a + b)']))
+            fragments = interpreter.exec_queue.get_nowait()
+            self.assertEqual(3, len(fragments))
+
+            pydevconsole._compiled_fragments.clear()
+            interpreter.add_exec_fragments(fragments)
+            self.assertEqual(['3', '3'], sys.stdout.getvalue().split())
+            # The repeated fragment was compiled only once.
+            self.assertEqual(2, len(pydevconsole._compiled_fragments))
+        finally:
+            sys.stdout = self.original_stdout
+
+
+    def test_console_completions_cache(self):
+        from _pydev_bundle import _pydev_imports_tipper
+        from _pydev_bundle.pydev_console_utils import CodeFragment
+
+        interpreter = pydevconsole.InterpreterInterface(None, None, threading.currentThread())
+        interpreter.add_exec_fragments([CodeFragment('class Foo:\n    CONSTANT=1\nfoo=Foo()', False)])
+        _pydev_imports_tipper.member_tables.clear()
+
+        comps = interpreter.getCompletions('foo.CO', 'foo.CO')
+        self.assertEqual(['CONSTANT'], [c[0] for c in comps])
+        entries = list(_pydev_imports_tipper.member_tables._tables.values())
+        self.assertEqual(1, len(entries))
+        # Only the matching names were introspected.
+        self.assertEqual([('CONSTANT', True)], list(entries[0].completions.keys()))
+
+        self.assertEqual(comps, interpreter.getCompletions('foo.CO', 'foo.CO'))
+        self.assertEqual(entries, list(_pydev_imports_tipper.member_tables._tables.values()))
+
+        # Executing code changes the namespace version (so, the names are gotten again).
+        interpreter.add_exec_fragments([CodeFragment('foo.CONSTANT2 = 2')])
+        comps = interpreter.getCompletions('foo.CO', 'foo.CO')
+        self.assertEqual(['CONSTANT', 'CONSTANT2'], sorted(c[0] for c in comps))
+
+    def test_console_completions_after_rebinding_class_attribute(self):
+        from _pydev_bundle import _pydev_imports_tipper
+        from _pydev_bundle._pydev_completer import Completer
+        from _pydev_bundle.pydev_console_utils import CodeFragment
+
+        interpreter = pydevconsole.InterpreterInterface(None, None, threading.currentThread())
+        interpreter.add_exec_fragments([CodeFragment(
+            'class A:\n    x = 1\n\nclass B:\n    "B doc"\n', False)])
+        _pydev_imports_tipper.member_tables.clear()
+
+        comps = interpreter.getCompletions('A.x', 'A.x')
+        self.assertEqual('', comps[0][1])
+
+        # Rebinding the attribute doesn't change the size of A.__dict__.
+        interpreter.add_exec_fragments([CodeFragment('A.x = B')])
+        comps = interpreter.getCompletions('A.x', 'A.x')
+        self.assertEqual(('x', 'B doc', '', '1'), tuple(comps[0]))
+
+        # Without a namespace version (i.e.: in the debugger) the completions aren't cached.
+        interpreter.add_exec_fragments([CodeFragment('A.x = 3')])
+        comps = Completer(interpreter.get_namespace(), None).complete('A.x')
+        self.assertEqual(('x', '', '', '3'), tuple(comps[0]))
+
+
     def start_client_thread(self, client_port):
         class ClientThread(threading.Thread):
             def __init__(self, client_port):
@@ -80,6 +80,7 @@ if sys.platform.find('java') == -1:
             server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             server.bind((pycompletionserver.HOST, p1))
             server.listen(1)  #socket to receive messages.
+            p1 = server.getsockname()[1]
     
             t = pycompletionserver.CompletionServer(p1)
             t.exit_process_on_kill = False
@@ -182,6 +183,163 @@ if sys.platform.find('java') == -1:
                 except:
                     pass
             
+        def test_pipelined_requests(self):
+            t, socket = self.create_connections(0)
+            self.socket = socket
+            try:
+                # Requests sent together are answered in order (even if handled by different workers).
+                send(socket, '@@IMPORTS:%sEND@@@@SEARCH%sEND@@@@PYTHONPATH_END@@' % (
+                    quote_plus('math'), quote_plus('inspect.ismodule')))
+                msgs = ''
+                while msgs.count('END@@') < 3:
+                    m = self.socket.recv(1024 * 4)
+                    if IS_PYTHON_3K:
+                        m = m.decode('utf-8')
+                    msgs += m
+                imports, search, pythonpath = msgs.split('END@@')[:3]
+                self.assert_('(acos,' in imports, imports)
+                self.assert_('inspect.py' in search, search)
+                self.assert_(pythonpath.startswith('@@COMPLETIONS(None,'), pythonpath)
+            finally:
+                try:
+                    self.send_kill_msg(socket)
+                    socket.close()
+                except:
+                    pass
+
+        def test_malformed_jedi_request(self):
+            t, socket = self.create_connections(0)
+            self.socket = socket
+            socket.settimeout(10)
+            try:
+                # The malformed request is answered with an error and the next requests are still handled.
+                send(socket, '@@MSG_JEDI:1|2END@@@@IMPORTS:%sEND@@' % (quote_plus('math'),))
+                msgs = ''
+                while msgs.count('END@@') < 2:
+                    m = self.socket.recv(1024 * 4)
+                    self.assert_(m, 'Connection closed')
+                    if IS_PYTHON_3K:
+                        m = m.decode('utf-8')
+                    msgs += m
+                error, imports = msgs.split('END@@')[:2]
+                self.assert_(error.startswith('@@COMPLETIONS(None,(ERROR%3A,'), error)
+                self.assert_('(acos,' in imports, imports)
+            finally:
+                try:
+                    self.send_kill_msg(socket)
+                    socket.close()
+                except:
+                    pass
+
+        def test_framed_protocol(self):
+            import struct
+            t, socket = self.create_connections(0)
+            self.socket = socket
+            socket.settimeout(10)
+
+            def frame(msg):
+                msg = msg.encode('utf-8')
+                return struct.pack('>I', len(msg)) + msg
+
+            def recv_exactly(size):
+                data = b''
+                while len(data) < size:
+                    r = socket.recv(size - len(data))
+                    self.assert_(r, 'Connection closed')
+                    data += r
+                return data
+
+            def read_frame():
+                size = struct.unpack('>I', recv_exactly(4))[0]
+                return recv_exactly(size).decode('utf-8')
+
+            try:
+                # The frames may be sent right after the (text) message which enables them.
+                socket.sendall(pycompletionserver.MSG_FRAMED_PROTOCOL.encode('utf-8') + frame('@@IMPORTS:math'))
+                self.assertEqual(pycompletionserver.MSG_OK.encode('utf-8'), recv_exactly(len(pycompletionserver.MSG_OK)))
+
+                fields = read_frame().split(pycompletionserver.FRAMED_SEPARATOR)
+                self.assertEqual(pycompletionserver.MSG_COMPLETIONS, fields[0])
+                completions = fields[2:]
+                self.assertEqual(0, len(completions) % 4)
+                i = completions.index('acos')
+                self.assertEqual('4', completions[i + 3])
+
+                socket.sendall(frame('@@SEARCH' + 'inspect.ismodule'))
+                fields = read_frame().split(pycompletionserver.FRAMED_SEPARATOR)
+                self.assert_(fields[1].endswith('inspect.py'), fields)
+                self.assert_(int(fields[2]) > 0)
+                self.assertEqual(['0', 'ismodule', ''], fields[3:])
+            finally:
+                try:
+                    socket.sendall(frame(pycompletionserver.MSG_KILL_SERVER))
+                    socket.close()
+                except:
+                    pass
+
+        def test_framed_messages_in_arguments(self):
+            import struct
+            t, socket = self.create_connections(0)
+            self.socket = socket
+            socket.settimeout(10)
+
+            def frame(msg):
+                msg = msg.encode('utf-8')
+                return struct.pack('>I', len(msg)) + msg
+
+            def recv_exactly(size):
+                data = b''
+                while len(data) < size:
+                    r = socket.recv(size - len(data))
+                    self.assert_(r, 'Connection closed')
+                    data += r
+                return data
+
+            def read_frame():
+                size = struct.unpack('>I', recv_exactly(4))[0]
+                return recv_exactly(size).decode('utf-8')
+
+            try:
+                socket.sendall(pycompletionserver.MSG_FRAMED_PROTOCOL.encode('utf-8'))
+                self.assertEqual(pycompletionserver.MSG_OK.encode('utf-8'), recv_exactly(len(pycompletionserver.MSG_OK)))
+
+                # The arguments aren't quoted in frames: messages inside them must not be handled as such.
+                source = 'a = "%s"\nb = "%s"\n' % (pycompletionserver.MSG_KILL_SERVER, pycompletionserver.MSG_PYTHONPATH)
+                socket.sendall(frame('@@MSG_JEDI:1|0|utf-8|/tmp/_pydev_test_mod.py|' + source))
+                fields = read_frame().split(pycompletionserver.FRAMED_SEPARATOR)
+                self.assertEqual(pycompletionserver.MSG_COMPLETIONS, fields[0])
+                # Either the jedi completions or an error (i.e.: jedi not available), but not the pythonpath.
+                self.assert_(fields[1] == 'empty' or fields[2] == 'ERROR:', fields[:3])
+
+                socket.sendall(frame('@@SEARCH' + 'inspect.ismodule' + pycompletionserver.MSG_PYTHONPATH))
+                fields = read_frame().split(pycompletionserver.FRAMED_SEPARATOR)
+                self.assertEqual('ERROR:', fields[2], fields[:3])  # There's no such name (and it's not the pythonpath).
+
+                # And the server is still alive.
+                socket.sendall(frame('@@IMPORTS:math'))
+                fields = read_frame().split(pycompletionserver.FRAMED_SEPARATOR)
+                self.assert_('acos' in fields, fields)
+
+                socket.sendall(frame(pycompletionserver.MSG_PYTHONPATH))
+                fields = read_frame().split(pycompletionserver.FRAMED_SEPARATOR)
+                self.assertEqual('None', fields[1])
+                self.assertEqual(pycompletionserver._sys_path, fields[2::4])
+            finally:
+                try:
+                    socket.sendall(frame(pycompletionserver.MSG_KILL_SERVER))
+                    socket.close()
+                except:
+                    pass
+
+        def test_cancel_request(self):
+            request = pycompletionserver.Request('')
+            self.assert_(request.cancel())
+            self.assert_(not request.start())
+
+            request = pycompletionserver.Request('')
+            self.assert_(request.start())
+            self.assert_(not request.cancel())
+
         def send_kill_msg(self, socket):
             socket.send(pycompletionserver.MSG_KILL_SERVER)
 
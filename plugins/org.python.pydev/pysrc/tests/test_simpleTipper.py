@@ -177,6 +177,29 @@ if sys.platform.find('java') == -1:
             raise AssertionError('%s not in %s' % (tok, tips))
 
 
+        def test_member_tables_cache(self):
+            _pydev_imports_tipper.member_tables.clear()
+            tip = _pydev_imports_tipper.generate_tip('inspect')
+            table = _pydev_imports_tipper.member_tables.get_table(inspect)
+            self.assertEqual(tip[1], table.get_completions())
+
+            # The same table is reused by the completion server.
+            self.assertTrue(table is _pydev_imports_tipper.member_tables.get_table(inspect))
+            self.assertEqual(tip, _pydev_imports_tipper.generate_tip('inspect'))
+
+            # Changing the module contents gives a new version.
+            inspect._pydev_test_attr = 1
+            try:
+                new_table = _pydev_imports_tipper.member_tables.get_table(inspect)
+                self.assertTrue(new_table is not table)
+                self.assert_in('_pydev_test_attr', _pydev_imports_tipper.generate_tip('inspect'))
+            finally:
+                del inspect._pydev_test_attr
+
+            # Instances are only cached with an explicit version.
+            self.assertEqual(None, _pydev_imports_tipper.member_tables.get_table(object()))
+
+
         def test_search(self):
             s = _pydev_imports_tipper.search_definition('inspect.ismodule')
             (f, line, col), foundAs = s
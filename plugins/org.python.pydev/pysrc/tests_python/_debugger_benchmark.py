@@ -0,0 +1,93 @@
+'''
+Programs used by debugger_benchmark.py (the program to run is the first argument).
+
+The timed programs print: TotalTime>>seconds<<
+'''
+import sys
+import threading
+import time
+
+try:
+    xrange
+except:
+    xrange = range
+
+
+def method2():
+    i = 1
+
+
+def calls():
+    for i in xrange(200000):
+        method2()
+
+
+def lines():
+    a = 0
+    for i in xrange(200000):
+        a += 1
+        a -= 1
+        a += i
+        a -= i
+    return a
+
+
+def exceptions():
+    for i in xrange(50000):
+        try:
+            raise ValueError()
+        except ValueError:
+            pass
+
+
+def many_threads():
+    threads = []
+    for i in xrange(20):
+        t = threading.Thread(target=_thread_calls)
+        threads.append(t)
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def _thread_calls():
+    for i in xrange(10000):
+        method2()
+
+
+def step():
+    a = 0
+    for i in xrange(1000):
+        a += 1  # Break here (step)
+    return a
+
+
+def variables():
+    big_list = list(xrange(100000))
+    big_dict = dict((str(i), i) for i in xrange(100000))
+    try:
+        import numpy
+        big_array = numpy.zeros((1000, 100))
+    except ImportError:
+        big_array = None
+    return big_list, big_dict, big_array  # Break here (variables)
+
+
+TIMED_PROGRAMS = {
+    'calls': calls,
+    'lines': lines,
+    'exceptions': exceptions,
+    'many_threads': many_threads,
+}
+
+
+if __name__ == '__main__':
+    program = sys.argv[1]
+    if program in TIMED_PROGRAMS:
+        start_time = time.time()
+        TIMED_PROGRAMS[program]()
+        print('TotalTime>>%s<<' % (time.time() - start_time,))
+    else:
+        globals()[program]()
+    print('TEST SUCEEDED')
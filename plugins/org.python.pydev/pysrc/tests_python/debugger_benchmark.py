@@ -0,0 +1,461 @@
+'''
+Benchmarks for the debugger overhead (runs the programs in _debugger_benchmark.py with a local stand-in for the IDE
+which speaks the pydevd protocol).
+
+Usage:
+    python debugger_benchmark.py [--output results.json] [--repeat 3] [--cython | --no-cython] [--only name1,name2]
+
+Measures:
+    - tracing_<program>: the time of the program without the debugger, with the debugger and with the debugger and a
+      line breakpoint in the program file (for 'exceptions' also with a caught exception breakpoint which is never
+      hit).
+    - step_latency: the time from a step over command until the suspend notification is received.
+    - get_variable/get_array: the time to get the contents of large containers (get_array needs numpy).
+    - startup: the time to import pydevd (along with the number of modules loaded and which of the subsystems that
+      should only be loaded on demand were loaded).
+
+The results are written as json (so that they can be compared to track regressions over time).
+'''
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import Queue as _queue
+except ImportError:
+    import queue as _queue  # @UnresolvedImport
+
+try:
+    from urllib import unquote_plus
+except ImportError:
+    from urllib.parse import unquote_plus  # @UnresolvedImport
+
+try:
+    xrange
+except:
+    xrange = range
+
+# Note: copied (don't import because we want it to be independent on the actual code, as in debugger_unittest).
+CMD_RUN = 101
+CMD_THREAD_CREATE = 103
+CMD_THREAD_SUSPEND = 105
+CMD_THREAD_RUN = 106
+CMD_STEP_OVER = 108
+CMD_GET_VARIABLE = 110
+CMD_SET_BREAK = 111
+CMD_REMOVE_BREAK = 112
+CMD_ADD_EXCEPTION_BREAK = 122
+CMD_GET_ARRAY = 143
+CMD_VERSION = 501
+
+PYSRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYDEVD_FILE = os.path.join(PYSRC_DIR, 'pydevd.py')
+BENCHMARK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_debugger_benchmark.py')
+
+TIMED_PROGRAMS = ('calls', 'lines', 'exceptions', 'many_threads')
+
+TIMEOUT = 60
+
+# Modules which shouldn't be loaded just by importing pydevd (they're loaded on first use).
+DEFERRED_MODULES = (
+    'pydevconsole',
+    '_pydev_bundle._pydev_completer',
+    '_pydevd_bundle.pydevd_console',
+    '_pydevd_bundle.pydevd_plugin_utils',
+    'pydevd_concurrency_analyser.pydevd_concurrency_logger',
+    'pydevd_concurrency_analyser.pydevd_thread_wrappers',
+    'pydev_ipython.matplotlibtools',
+    'IPython',
+    'asyncio',
+)
+
+STARTUP_CODE = '''
+import sys
+import time
+start_time = time.time()
+import pydevd
+print('TotalTime>>%%s<<' %% (time.time() - start_time,))
+print('Modules>>%%s<<' %% (len(sys.modules),))
+print('Deferred>>%%s<<' %% (','.join(m for m in %r if m in sys.modules),))
+print('TEST SUCEEDED')
+''' % (DEFERRED_MODULES,)
+
+
+def _get_marker_line(marker):
+    f = open(BENCHMARK_FILE, 'r')
+    try:
+        for i, line in enumerate(f):
+            if marker in line:
+                return i + 1
+    finally:
+        f.close()
+    raise AssertionError('Marker: %s not found in %s' % (marker, BENCHMARK_FILE))
+
+
+def _get_total_time(output):
+    match = re.search(r'TotalTime>>((\d|\.|e|-)+)<<', output)
+    if match is None:
+        raise AssertionError('Time not found in output:\n%s' % (output,))
+    return float(match.group(1))
+
+
+def _summarize(values):
+    values = sorted(values)
+    return {
+        'min': values[0],
+        'median': values[len(values) // 2],
+        'max': values[-1],
+        'count': len(values),
+    }
+
+
+#=======================================================================================================================
+# BenchmarkIde
+#=======================================================================================================================
+class BenchmarkIde(object):
+    '''
+    Stand-in for the IDE: accepts the connection from the debugger, writes commands and keeps the messages received
+    (along with the time they were received).
+    '''
+
+    def __init__(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.sock = None
+        self.received = _queue.Queue()
+        self._seq = -1
+        self._next_breakpoint_id = 0
+
+    def accept(self):
+        self.server.settimeout(TIMEOUT)
+        self.sock, _addr = self.server.accept()
+        t = threading.Thread(target=self._read)
+        t.daemon = True
+        t.start()
+
+    def _read(self):
+        buf = ''
+        try:
+            while True:
+                r = self.sock.recv(65536)
+                if not r:
+                    break
+                received_time = time.time()
+                if not isinstance(r, str):
+                    r = r.decode('utf-8')
+                buf += r
+                while '\n' in buf:
+                    line, buf = buf.split('\n', 1)
+                    cmd_id, seq, text = line.split('\t', 2)
+                    self.received.put((received_time, int(cmd_id), int(seq), text))
+        except:
+            pass  # Finished.
+        self.received.put(None)
+
+    def write(self, cmd_id, text):
+        '''
+        :return tuple(int, float): the sequence of the command and the time when it was written.
+        '''
+        self._seq += 2
+        msg = '%s\t%s\t%s\n' % (cmd_id, self._seq, text)
+        sent_time = time.time()
+        self.sock.sendall(msg.encode('utf-8'))
+        return self._seq, sent_time
+
+    def wait_for(self, cmd_id, seq=None):
+        '''
+        :return tuple(float, int, int, str): the time received, command id, sequence and text of the message
+            (messages which don't match are discarded).
+        '''
+        timeout_at = time.time() + TIMEOUT
+        while True:
+            try:
+                msg = self.received.get(timeout=max(0.01, timeout_at - time.time()))
+            except _queue.Empty:
+                raise AssertionError('Timed out waiting for: %s (seq: %s)' % (cmd_id, seq))
+            if msg is None:
+                raise AssertionError('Connection closed while waiting for: %s (seq: %s)' % (cmd_id, seq))
+            if msg[1] == cmd_id and (seq is None or msg[2] == seq):
+                return msg
+
+    def wait_for_suspend(self):
+        '''
+        :return tuple(float, str, str): the time received, thread id and frame id of the suspended thread.
+        '''
+        received_time, _cmd_id, _seq, text = self.wait_for(CMD_THREAD_SUSPEND)
+        text = unquote_plus(text)
+        thread_id = re.search('<thread id="([^"]+)"', text).group(1)
+        frame_id = re.search('<frame id="([^"]+)"', text).group(1)
+        return received_time, thread_id, frame_id
+
+    def write_version(self):
+        self.write(CMD_VERSION, '1.0\tWINDOWS\tID')
+
+    def write_add_breakpoint(self, line):
+        self._next_breakpoint_id += 1
+        self.write(CMD_SET_BREAK, '%s\tpython-line\t%s\t%s\tNone\tNone\tNone' % (
+            self._next_breakpoint_id, BENCHMARK_FILE, line))
+        return self._next_breakpoint_id
+
+    def write_remove_breakpoint(self, breakpoint_id):
+        self.write(CMD_REMOVE_BREAK, 'python-line\t%s\t%s' % (BENCHMARK_FILE, breakpoint_id))
+
+    def write_add_caught_exception_breakpoint(self, exception):
+        self.write(CMD_ADD_EXCEPTION_BREAK, '%s\t2\t0\t0' % (exception,))
+
+    def close(self):
+        for s in (self.sock, self.server):
+            if s is not None:
+                try:
+                    s.close()
+                except:
+                    pass
+
+
+#=======================================================================================================================
+# DebuggerBenchmark
+#=======================================================================================================================
+class DebuggerBenchmark(object):
+
+    def __init__(self, repeat=3, use_cython=None):
+        self.repeat = repeat
+        self.use_cython = use_cython
+
+    def get_environ(self):
+        env = os.environ.copy()
+        if self.use_cython is not None:
+            env['PYDEVD_USE_CYTHON'] = self.use_cython and 'YES' or 'NO'
+        return env
+
+    def _start_process(self, args):
+        return subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=PYSRC_DIR,
+            env=self.get_environ(),
+        )
+
+    def _finish_process(self, process):
+        timer = threading.Timer(TIMEOUT * 5, process.kill)  # Don't wait forever if it's stuck.
+        timer.start()
+        try:
+            output = process.communicate()[0]
+        finally:
+            timer.cancel()
+        if not isinstance(output, str):
+            output = output.decode('utf-8', 'replace')
+        if 'TEST SUCEEDED' not in output:
+            raise AssertionError('Program did not finish successfully. Output:\n%s' % (output,))
+        return output
+
+    def run_untraced(self, program):
+        return _get_total_time(self._finish_process(self._start_process([sys.executable, BENCHMARK_FILE, program])))
+
+    def run_debugged(self, program, on_connected=None, on_run=None):
+        '''
+        :param on_connected: callable(ide) to set breakpoints before the program starts running.
+        :param on_run: callable(ide) called after the program started running (i.e.: to interact in a breakpoint).
+        :return str: the program output.
+        '''
+        ide = BenchmarkIde()
+        try:
+            process = self._start_process([
+                sys.executable, PYDEVD_FILE, '--client', '127.0.0.1', '--port', str(ide.port),
+                '--file', BENCHMARK_FILE, program])
+            try:
+                ide.accept()
+                ide.write_version()
+                ide.wait_for(CMD_VERSION)
+                if on_connected is not None:
+                    on_connected(ide)
+                ide.write(CMD_RUN, '')
+                if on_run is not None:
+                    on_run(ide)
+            except:
+                process.kill()
+                raise
+            return self._finish_process(process)
+        finally:
+            ide.close()
+
+    #===================================================================================================================
+    # Benchmarks
+    #===================================================================================================================
+    def benchmark_tracing(self, program):
+        results = {'untraced': [], 'traced': [], 'traced_with_breakpoint': []}
+
+        line = _get_marker_line('# Break here (step)')  # A line in the same file which isn't run by the program.
+
+        def add_breakpoint(ide):
+            ide.write_add_breakpoint(line)
+
+        def add_exception_breakpoint(ide):
+            # Note: an exception which isn't raised (neither in the program nor in the standard library).
+            ide.write_add_caught_exception_breakpoint('FloatingPointError')
+
+        if program == 'exceptions':
+            results['traced_with_exception_breakpoint'] = []
+
+        for _i in xrange(self.repeat):
+            results['untraced'].append(self.run_untraced(program))
+            results['traced'].append(_get_total_time(self.run_debugged(program)))
+            results['traced_with_breakpoint'].append(
+                _get_total_time(self.run_debugged(program, on_connected=add_breakpoint)))
+            if program == 'exceptions':
+                results['traced_with_exception_breakpoint'].append(
+                    _get_total_time(self.run_debugged(program, on_connected=add_exception_breakpoint)))
+
+        ret = {'unit': 'seconds'}
+        for key, values in results.items():
+            ret[key] = _summarize(values)
+        untraced = ret['untraced']['min']
+        for key in results:
+            if key != 'untraced' and untraced > 0:
+                ret[key]['overhead'] = ret[key]['min'] / untraced
+        return ret
+
+    def benchmark_step_latency(self, steps=100):
+        latencies = []
+        line = _get_marker_line('# Break here (step)')
+        breakpoint_ids = []
+
+        def on_connected(ide):
+            breakpoint_ids.append(ide.write_add_breakpoint(line))
+
+        def on_run(ide):
+            _received_time, thread_id, _frame_id = ide.wait_for_suspend()
+            for _i in xrange(self.repeat * steps):
+                _seq, sent_time = ide.write(CMD_STEP_OVER, thread_id)
+                received_time, thread_id, _frame_id = ide.wait_for_suspend()
+                latencies.append(received_time - sent_time)
+            ide.write_remove_breakpoint(breakpoint_ids[0])
+            ide.write(CMD_THREAD_RUN, thread_id)
+
+        self.run_debugged('step', on_connected=on_connected, on_run=on_run)
+        ret = _summarize(latencies)
+        ret['unit'] = 'seconds'
+        return ret
+
+    def benchmark_variables(self, requests=10):
+        results = {}
+        line = _get_marker_line('# Break here (variables)')
+        try:
+            import numpy  # @UnusedImport
+            has_numpy = True
+        except ImportError:
+            has_numpy = False
+
+        def on_connected(ide):
+            ide.write_add_breakpoint(line)
+
+        def measure(ide, name, cmd_id, text):
+            times = []
+            size = 0
+            for _i in xrange(self.repeat * requests):
+                seq, sent_time = ide.write(cmd_id, text)
+                received_time, _cmd_id, _seq, response = ide.wait_for(cmd_id, seq)
+                times.append(received_time - sent_time)
+                size = len(response)
+            results[name] = _summarize(times)
+            results[name]['unit'] = 'seconds'
+            results[name]['response_size'] = size
+
+        def on_run(ide):
+            _received_time, thread_id, frame_id = ide.wait_for_suspend()
+            measure(ide, 'get_variable_list', CMD_GET_VARIABLE, '%s\t%s\tFRAME\tbig_list' % (thread_id, frame_id))
+            measure(ide, 'get_variable_dict', CMD_GET_VARIABLE, '%s\t%s\tFRAME\tbig_dict' % (thread_id, frame_id))
+            if has_numpy:
+                measure(ide, 'get_array', CMD_GET_ARRAY, '0\t0\t1000\t100\t%%\t%s\t%s\tFRAME\tbig_array' % (
+                    thread_id, frame_id))
+            ide.write(CMD_THREAD_RUN, thread_id)
+
+        self.run_debugged('variables', on_connected=on_connected, on_run=on_run)
+        return results
+
+    def benchmark_startup(self, runs=10):
+        times = []
+        modules = 0
+        deferred_loaded = []
+        for _i in xrange(self.repeat * runs):
+            output = self._finish_process(self._start_process([sys.executable, '-c', STARTUP_CODE]))
+            times.append(_get_total_time(output))
+            modules = int(re.search(r'Modules>>(\d+)<<', output).group(1))
+            deferred_loaded = [m for m in re.search(r'Deferred>>(.*)<<', output).group(1).split(',') if m]
+        ret = _summarize(times)
+        ret['unit'] = 'seconds'
+        ret['modules_loaded'] = modules
+        ret['deferred_modules_loaded'] = deferred_loaded
+        return ret
+
+    def get_benchmarks(self):
+        benchmarks = [('startup', self.benchmark_startup)]
+        for program in TIMED_PROGRAMS:
+            benchmarks.append(('tracing_%s' % (program,), lambda program=program: self.benchmark_tracing(program)))
+        benchmarks.append(('step_latency', self.benchmark_step_latency))
+        benchmarks.append(('variables', self.benchmark_variables))
+        return benchmarks
+
+    def run(self, only=None):
+        results = {
+            'python': sys.version,
+            'platform': sys.platform,
+            'cython': self.use_cython,
+            'repeat': self.repeat,
+            'timestamp': time.time(),
+            'benchmarks': {},
+        }
+        for name, benchmark in self.get_benchmarks():
+            if only and name not in only:
+                continue
+            sys.stderr.write('Running: %s\n' % (name,))
+            results['benchmarks'][name] = benchmark()
+        return results
+
+
+def main(args):
+    output = None
+    repeat = 3
+    use_cython = None
+    only = None
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--output':
+            i += 1
+            output = args[i]
+        elif arg == '--repeat':
+            i += 1
+            repeat = int(args[i])
+        elif arg == '--cython':
+            use_cython = True
+        elif arg == '--no-cython':
+            use_cython = False
+        elif arg == '--only':
+            i += 1
+            only = set(args[i].split(','))
+        else:
+            raise AssertionError('Unexpected argument: %s\n%s' % (arg, __doc__))
+        i += 1
+
+    results = DebuggerBenchmark(repeat, use_cython).run(only)
+    contents = json.dumps(results, indent=2, sort_keys=True)
+    if output is None:
+        sys.stdout.write(contents + '\n')
+    else:
+        f = open(output, 'w')
+        try:
+            f.write(contents + '\n')
+        finally:
+            f.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
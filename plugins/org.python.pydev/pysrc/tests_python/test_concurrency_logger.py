@@ -0,0 +1,175 @@
+import unittest
+
+from _pydevd_bundle.pydevd_frame_utils import Frame, FCode
+from pydevd_concurrency_analyser.pydevd_concurrency_logger import ConcurrencyEventsBuffer
+
+
+class TestConcurrencyEventsBuffer(unittest.TestCase):
+
+    def test_stacks_interned(self):
+        events_buffer = ConcurrencyEventsBuffer(size=10)
+        frame = Frame(Frame(None, 3, FCode('<module>', 'file.py'), {}), 10, FCode('run', 'file.py'), {})
+        for _i in range(2):
+            events_buffer.add('threading_event', 1, 'Thread-1', 'tid', 'lock', 'acquire_begin', 'file.py', 10, frame, 22, None)
+
+        records, frames, stacks, dropped = events_buffer.pop_all()
+        self.assertEqual(2, len(records))
+        self.assertEqual(2, len(frames))
+        self.assertEqual([(1, (1, 2))], stacks)
+        self.assertEqual(0, dropped)
+        self.assertEqual(
+            (1, 'threading_event', 'Thread-1', 'tid', 'lock', 'acquire_begin', None, 'file.py', 10, 1, 22),
+            records[0])
+        self.assertTrue(frames[0].startswith('<frame id="1" name="run" '), frames[0])
+        self.assertTrue(' line="10"' in frames[0], frames[0])
+
+        # The stack was already sent: only the id is used from now on.
+        events_buffer.add('threading_event', 2, 'Thread-1', 'tid', 'thread', 'start', 'file.py', 10, frame, 0, 'parent')
+        records, frames, stacks, dropped = events_buffer.pop_all()
+        self.assertEqual(1, len(records))
+        self.assertEqual([], frames)
+        self.assertEqual([], stacks)
+        self.assertEqual('parent', records[0][6])
+
+    def test_frames_interned(self):
+        events_buffer = ConcurrencyEventsBuffer(size=10)
+        module_frame = Frame(None, 3, FCode('<module>', 'file.py'), {})
+        events_buffer.add('threading_event', 1, 'Thread-1', 'tid', 'thread', 'start', 'file.py', 10,
+                          Frame(module_frame, 10, FCode('run', 'file.py'), {}), 0, None)
+        events_buffer.pop_all()
+
+        # A new stack only sends the frames which weren't sent before.
+        events_buffer.add('threading_event', 2, 'Thread-1', 'tid', 'thread', 'join', 'file.py', 12,
+                          Frame(module_frame, 12, FCode('run', 'file.py'), {}), 0, None)
+        records, frames, stacks, dropped = events_buffer.pop_all()
+        self.assertEqual(1, len(frames))
+        self.assertTrue(frames[0].startswith('<frame id="3" name="run" '), frames[0])
+        self.assertEqual([(2, (3, 2))], stacks)
+        self.assertEqual(2, records[0][9])
+
+    def test_interned_entries_bounded(self):
+        events_buffer = ConcurrencyEventsBuffer(size=10, max_interned=2)
+        module_frame = Frame(None, 3, FCode('<module>', 'file.py'), {})
+        for i in range(2):
+            events_buffer.add('threading_event', i, 'Thread-1', 'tid', 'thread', 'start', 'file.py', 10,
+                              Frame(module_frame, 10 + i, FCode('run', 'file.py'), {}), 0, None)
+        records, frames, stacks, dropped = events_buffer.pop_all()
+        self.assertEqual([(1, (1, 2)), (2, (3, 2))], stacks)
+        self.assertEqual({}, events_buffer._frame_to_id)
+        self.assertEqual({}, events_buffer._stack_to_id)
+        self.assertEqual([], events_buffer._strings)
+
+        # Forgotten entries are sent again with new ids.
+        events_buffer.add('threading_event', 2, 'Thread-1', 'tid', 'thread', 'start', 'file.py', 10,
+                          Frame(module_frame, 10, FCode('run', 'file.py'), {}), 0, None)
+        records, frames, stacks, dropped = events_buffer.pop_all()
+        self.assertEqual(2, len(frames))
+        self.assertTrue(frames[0].startswith('<frame id="4" name="run" '), frames[0])
+        self.assertEqual([(3, (4, 5))], stacks)
+        self.assertEqual('Thread-1', records[0][2])
+        self.assertEqual(3, records[0][9])
+
+    def test_overflow_drops_oldest(self):
+        events_buffer = ConcurrencyEventsBuffer(size=3)
+        for i in range(5):
+            events_buffer.add('threading_event', i, 'Thread-1', 'tid', 'thread', 'start', 'file.py', i, None, 0, None)
+
+        records, frames, stacks, dropped = events_buffer.pop_all()
+        self.assertEqual([2, 3, 4], [record[0] for record in records])
+        self.assertEqual(2, dropped)
+        self.assertEqual(0, records[0][9])  # no stack
+
+        self.assertEqual(([], [], [], 0), events_buffer.pop_all())
+
+
+class _AsyncioListener(object):
+
+    def __init__(self):
+        from pydevd_concurrency_analyser.pydevd_concurrency_logger import NameManager
+        self.task_mgr = NameManager('Task')
+        self.events = []
+
+    def _name(self, task):
+        if task is None:
+            return 'Task'
+        return self.task_mgr.get(task)
+
+    def on_task_start(self, task, frame):
+        self.events.append((self._name(task), 'start', frame.f_code.co_name))
+        task.add_done_callback(self.on_task_stop)
+
+    def on_task_stop(self, task):
+        self.events.append((self._name(task), 'stop'))
+
+    def on_lock_event(self, obj, event, frame):
+        from pydevd_concurrency_analyser.pydevd_asyncio_wrappers import get_current_task
+        self.events.append((self._name(get_current_task()), event, frame.f_code.co_name))
+
+
+class TestAsyncioWrappers(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            import asyncio  # @UnresolvedImport @UnusedImport
+        except ImportError:
+            self.skipTest('asyncio not available.')
+
+    def tearDown(self):
+        from pydevd_concurrency_analyser import pydevd_asyncio_wrappers
+        pydevd_asyncio_wrappers.wrap_asyncio(None)
+
+    def test_asyncio_events(self):
+        import asyncio  # @UnresolvedImport
+        from pydevd_concurrency_analyser import pydevd_asyncio_wrappers
+        listener = _AsyncioListener()
+        pydevd_asyncio_wrappers.wrap_asyncio(listener)
+
+        namespace = {'asyncio': asyncio}
+        exec('''
+async def worker(lock, queue):
+    async with lock:
+        await queue.put(1)
+
+async def main():
+    lock = asyncio.Lock()
+    queue = asyncio.Queue()
+    await asyncio.get_event_loop().create_task(worker(lock, queue))
+    return await queue.get()
+''', namespace)
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(1, loop.run_until_complete(namespace['main']()))
+        finally:
+            loop.close()
+
+        self.assertEqual([
+            ('Task-1', 'start', 'test_asyncio_events'),
+            ('Task-2', 'start', 'main'),
+            ('Task-2', 'acquire_begin', 'worker'),
+            ('Task-2', 'acquire_end', 'worker'),
+            ('Task-2', 'acquire_begin', 'worker'),
+            ('Task-2', 'acquire_end', 'worker'),
+            ('Task-2', 'release', 'worker'),
+            ('Task-2', 'release_end', 'worker'),
+            ('Task-2', 'stop'),
+            ('Task-1', 'acquire_begin', 'main'),
+            ('Task-1', 'acquire_end', 'main'),
+            ('Task-1', 'release', 'main'),
+            ('Task-1', 'stop'),
+        ], listener.events)
+
+    def test_name_manager_weakrefs(self):
+        import gc
+        from pydevd_concurrency_analyser.pydevd_concurrency_logger import NameManager
+
+        class Task(object):
+            pass
+
+        name_manager = NameManager('Task')
+        task = Task()
+        self.assertEqual('Task-1', name_manager.get(task))
+        self.assertEqual('Task-1', name_manager.get(task))
+        self.assertEqual('Task-2', name_manager.get(Task()))
+        gc.collect()
+        self.assertEqual(1, len(name_manager.tasks))
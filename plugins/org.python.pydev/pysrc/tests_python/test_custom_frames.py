@@ -0,0 +1,41 @@
+import sys
+import unittest
+
+from _pydevd_bundle import pydevd_custom_frames
+from _pydevd_bundle.pydevd_custom_frames import add_custom_frame, update_custom_frame, remove_custom_frame, \
+    get_custom_frame, get_custom_frames_for_thread, CustomFramesContainer
+
+
+class TestCustomFrames(unittest.TestCase):
+
+    def setUp(self):
+        pydevd_custom_frames.custom_frames_container_init()
+
+    def tearDown(self):
+        pydevd_custom_frames.custom_frames_container_init()
+
+    def test_custom_frames(self):
+        frame = sys._getframe()
+        frame_id1 = add_custom_frame(frame, 'Tasklet1', 1)
+        frame_id2 = add_custom_frame(frame, 'Tasklet2', 2)
+
+        self.assertEqual([frame_id1], [frame_id for frame_id, _custom_frame in get_custom_frames_for_thread(1)])
+        self.assertEqual([frame_id2], [frame_id for frame_id, _custom_frame in get_custom_frames_for_thread(2)])
+        self.assertEqual([], get_custom_frames_for_thread(3))
+
+        self.assertTrue(get_custom_frame(frame_id1, id(frame)) is frame)
+        self.assertTrue(get_custom_frame(frame_id1, str(id(frame.f_back))) is frame.f_back)
+        self.assertEqual(None, get_custom_frame(frame_id1, 0))
+
+        # Moved to another thread.
+        update_custom_frame(frame_id2, frame, 1, name='Tasklet2b')
+        self.assertEqual(
+            sorted([frame_id1, frame_id2]), sorted(frame_id for frame_id, _custom_frame in get_custom_frames_for_thread(1)))
+        self.assertEqual([], get_custom_frames_for_thread(2))
+        self.assertEqual('Tasklet2b', CustomFramesContainer.custom_frames[frame_id2].name)
+
+        remove_custom_frame(frame_id1)
+        remove_custom_frame(frame_id2)
+        self.assertEqual({}, CustomFramesContainer.custom_frames)
+        self.assertEqual({}, CustomFramesContainer.custom_frames_by_thread_ident)
+        self.assertRaises(KeyError, get_custom_frame, frame_id1, id(frame))
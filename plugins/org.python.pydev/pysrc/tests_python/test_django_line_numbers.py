@@ -0,0 +1,118 @@
+import bisect
+import os
+import tempfile
+import unittest
+
+from pydevd_plugins import django_debug
+
+
+def _offset_to_line_number(text, offset):
+    # The implementation used before the line starts of the templates were cached.
+    curLine = 1
+    curOffset = 0
+    while curOffset < offset:
+        if curOffset == len(text):
+            return -1
+        c = text[curOffset]
+        if c == '\n':
+            curLine += 1
+        elif c == '\r':
+            curLine += 1
+            if curOffset < len(text) and text[curOffset + 1] == '\n':
+                curOffset += 1
+
+        curOffset += 1
+
+    return curLine
+
+
+class TestTemplateLineNumbers(unittest.TestCase):
+
+    def _create_template(self, contents):
+        fd, filename = tempfile.mkstemp(suffix='.html')
+        os.write(fd, contents.encode('utf-8'))
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        return filename
+
+    def test_same_as_offset_to_line_number(self):
+        # Note: templates are read with universal new lines (as django does), so, the offsets never refer to a text
+        # with \r (those cases are checked in test_line_starts).
+        for contents in (
+                '',
+                'abc',
+                '\n\n',
+                'a\nb\nc\n',
+                '{% block a %}\n  {{ b }}\n{% endblock %}\nend',
+                'last line without new line\n{{ a }}',
+            ):
+            filename = self._create_template(contents)
+            # Offsets at, before and after each line break (and after the end of the file).
+            for offset in range(len(contents) + 2):
+                self.assertEqual(
+                    _offset_to_line_number(contents, offset),
+                    django_debug._template_offset_to_line_number(filename, offset),
+                    'Different line for offset %s in %r' % (offset, contents))
+
+    def test_line_starts(self):
+        for text in (
+                '{% block a %}\n  {{ b }}\r\n{% endblock %}\rend',
+                '\r\n\r\n',
+                '\r\r\n\n',
+                'a\rb\r\nc\n',
+            ):
+            line_starts = django_debug._get_line_starts(text)
+            for offset in range(len(text) + 1):
+                if text[offset - 1:offset + 1] == '\r\n':
+                    continue  # The middle of a \r\n isn't a valid position.
+                self.assertEqual(
+                    _offset_to_line_number(text, offset),
+                    bisect.bisect_right(line_starts, offset),
+                    'Different line for offset %s in %r' % (offset, text))
+
+    def _rewrite(self, filename, contents):
+        f = open(filename, 'w')
+        try:
+            f.write(contents)
+        finally:
+            f.close()
+        mtime = os.stat(filename).st_mtime + 10
+        os.utime(filename, (mtime, mtime))
+
+    def test_cache_updated_when_template_changes(self):
+        filename = self._create_template('a\nb\n')
+        self.assertEqual(2, django_debug._template_offset_to_line_number(filename, 2))
+
+        self._rewrite(filename, 'a\n\n\nb\n')
+        self.assertEqual(3, django_debug._template_offset_to_line_number(filename, 3))
+
+    def test_mtime_checked_once_per_origin_or_suspend(self):
+        filename = self._create_template('a\nb\n')
+        origin = object()
+        calls = []
+        original_getmtime = os.path.getmtime
+
+        def getmtime(f):
+            calls.append(f)
+            return original_getmtime(f)
+
+        os.path.getmtime = getmtime
+        try:
+            for _i in range(3):
+                self.assertEqual(2, django_debug._template_offset_to_line_number(filename, 2, origin))
+            self.assertEqual(1, len(calls))
+
+            # Changes are only noticed when the template is loaded again (new origin)...
+            self._rewrite(filename, 'a\n\n\nb\n')
+            self.assertEqual(2, django_debug._template_offset_to_line_number(filename, 2, origin))
+            origin = object()
+            self.assertEqual(3, django_debug._template_offset_to_line_number(filename, 3, origin))
+            self.assertEqual(2, len(calls))
+
+            # ... or after the debugger suspends.
+            self._rewrite(filename, 'a\nb\n')
+            django_debug._recheck_template_mtimes()
+            self.assertEqual(-1, django_debug._template_offset_to_line_number(filename, 5, origin))
+            self.assertEqual(3, len(calls))
+        finally:
+            os.path.getmtime = original_getmtime
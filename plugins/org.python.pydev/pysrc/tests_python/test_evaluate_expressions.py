@@ -0,0 +1,74 @@
+import sys
+import threading
+import unittest
+
+from _pydevd_bundle import pydevd_vars
+from _pydevd_bundle.pydevd_constants import get_thread_id
+from _pydevd_bundle.pydevd_xml import ExceptionOnEvaluate, var_to_xml
+
+GLOBAL_VAR = 10
+
+
+class TestEvaluateExpressions(unittest.TestCase):
+
+    def _evaluate(self, expressions):
+        local_var = [1, 2, 3]
+        GLOBAL_VAR = 20  # Shadows the global (locals have precedence).
+        frame_id = str(id(sys._getframe()))
+        return pydevd_vars.evaluate_expressions(get_thread_id(threading.currentThread()), frame_id, expressions)
+
+    def test_evaluate_expressions(self):
+        results = self._evaluate([
+            'local_var[0] + GLOBAL_VAR',
+            'sum(x for x in local_var if x < GLOBAL_VAR)',  # Nested scope: locals must be seen there too.
+            'unknown_var',
+            'local_var@LINE@',
+            '1 +',
+        ])
+        self.assertEqual(5, len(results))
+        self.assertEqual(21, results[0])
+        self.assertEqual(6, results[1])
+        self.assertTrue(isinstance(results[2], ExceptionOnEvaluate))
+        self.assertEqual([1, 2, 3], results[3])
+        self.assertTrue(isinstance(results[4], ExceptionOnEvaluate))
+
+    def test_compiled_once(self):
+        pydevd_vars._compiled_expressions.clear()
+        self._evaluate(['local_var[1]'])
+        compiled = pydevd_vars._compiled_expressions['local_var[1]']
+        self.assertEqual([2], self._evaluate(['local_var[1]']))
+        self.assertTrue(compiled is pydevd_vars._compiled_expressions['local_var[1]'])
+
+    def test_compile_error_reported_as_in_evaluate_expression(self):
+        local_var = [1, 2, 3]
+        frame_id = str(id(sys._getframe()))
+        thread_id = get_thread_id(threading.currentThread())
+        for _i in range(2):  # The second time the expression comes from the cache.
+            results = pydevd_vars.evaluate_expressions(thread_id, frame_id, ['1 +'])
+            expected = pydevd_vars.evaluate_expression(thread_id, frame_id, '1 +', False)
+            self.assertTrue(isinstance(results[0], ExceptionOnEvaluate))
+            self.assertEqual(type(expected.result), type(results[0].result))
+            self.assertEqual(str(expected.result), str(results[0].result))
+            self.assertEqual(var_to_xml(expected, '1 +'), var_to_xml(results[0], '1 +'))
+
+    def test_expressions_with_tab_and_new_line(self):
+        from _pydev_imps._pydev_saved_modules import threading as saved_threading
+        from _pydevd_bundle.pydevd_comm import CMD_EVALUATE_EXPRESSIONS
+        from _pydevd_bundle.pydevd_process_net_command import process_net_command
+
+        class PyDbStub(object):
+
+            def __init__(self):
+                self._main_lock = saved_threading.Lock()
+                self.commands = []
+
+            def post_internal_command(self, int_cmd, thread_id):
+                self.commands.append(int_cmd)
+
+        py_db = PyDbStub()
+        expressions = ["'a@_@TAB_CHAR@_@b'.split('@_@TAB_CHAR@_@')", '(local_var[0] +@_@NEW_LINE_CHAR@_@1)']
+        process_net_command(py_db, CMD_EVALUATE_EXPRESSIONS, 1, '\t'.join(['thread_id', 'frame_id', 'LOCAL', '1'] + expressions))
+        self.assertEqual(1, len(py_db.commands))
+        expressions = py_db.commands[0].expressions
+        self.assertEqual(["'a\tb'.split('\t')", '(local_var[0] +\n1)'], expressions)
+        self.assertEqual([['a', 'b'], 2], self._evaluate(expressions))
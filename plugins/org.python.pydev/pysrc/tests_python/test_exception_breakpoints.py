@@ -0,0 +1,35 @@
+import unittest
+
+from _pydevd_bundle import pydevd_breakpoints
+from _pydevd_bundle.pydevd_breakpoints import ExceptionBreakpoint, get_exception_breakpoint
+
+
+def _create_exceptions(*qnames):
+    exceptions = {}
+    for qname in qnames:
+        exceptions[qname] = ExceptionBreakpoint(qname, True, False, False, False)
+    return exceptions
+
+
+class TestExceptionBreakpointResolution(unittest.TestCase):
+
+    def test_resolution(self):
+        exceptions = _create_exceptions('LookupError', 'KeyError')
+        self.assertEqual('KeyError', get_exception_breakpoint(KeyError, exceptions).qname)
+        self.assertEqual('LookupError', get_exception_breakpoint(IndexError, exceptions).qname)
+        self.assertEqual(None, get_exception_breakpoint(StopIteration, exceptions))
+        self.assertEqual(None, get_exception_breakpoint(StopIteration, None))
+
+        resolved = pydevd_breakpoints._exception_breakpoint_resolution[1]
+        self.assertEqual(None, resolved[StopIteration])
+        self.assertTrue(get_exception_breakpoint(IndexError, exceptions) is resolved[IndexError])
+
+    def test_resolution_rebuilt_on_change(self):
+        exceptions = _create_exceptions('LookupError')
+        self.assertEqual(None, get_exception_breakpoint(StopIteration, exceptions))
+
+        # The debugger always sets a new dict when exception breakpoints change.
+        exceptions = exceptions.copy()
+        exceptions.update(_create_exceptions('Exception'))
+        self.assertEqual('Exception', get_exception_breakpoint(StopIteration, exceptions).qname)
+        self.assertEqual('LookupError', get_exception_breakpoint(KeyError, exceptions).qname)
@@ -0,0 +1,60 @@
+import select
+import threading
+import time
+import unittest
+
+from pydev_ipython import inputhook
+from _pydev_bundle.pydev_console_utils import ExecQueue
+
+
+class TestInputhookWakeup(unittest.TestCase):
+
+    def setUp(self):
+        self.channel = inputhook.WakeUpChannel()
+
+    def test_wait_timeout(self):
+        initial_time = time.time()
+        self.assertFalse(self.channel.wait(0.1))
+        self.assertTrue(time.time() - initial_time >= 0.09)
+
+    def test_wakeup(self):
+        self.channel.wakeup()
+        self.assertTrue(self.channel.is_woken())
+        initial_time = time.time()
+        self.assertTrue(self.channel.wait(5))
+        self.assertTrue(time.time() - initial_time < 1)
+
+        self.channel.clear()
+        self.assertFalse(self.channel.is_woken())
+        self.assertFalse(self.channel.wait(0))
+
+    def test_wakeup_from_thread(self):
+        t = threading.Timer(0.1, self.channel.wakeup)
+        t.start()
+        try:
+            initial_time = time.time()
+            self.assertTrue(self.channel.wait(5))
+            self.assertTrue(time.time() - initial_time < 1)
+        finally:
+            t.join()
+
+    def test_exec_queue_wakes_up_inputhook(self):
+        inputhook.clear_wakeup()
+        queue = ExecQueue(0)
+        queue.put('print(1)')
+        self.assertTrue(inputhook.is_woken())
+        initial_time = time.time()
+        self.assertTrue(inputhook.wait_for_wakeup(5))
+        self.assertTrue(time.time() - initial_time < 1)
+        inputhook.clear_wakeup()
+        self.assertEqual('print(1)', queue.get(block=False))
+
+    def test_wakeup_before_fileno(self):
+        # The fd must be readable even if wakeup() happened before the inputhook asked for it.
+        self.channel.wakeup()
+        fd = self.channel.fileno()
+        if fd is None:
+            self.skipTest('No sockets to wake up in this platform.')
+        self.assertEqual([fd], select.select([fd], [], [], 0)[0])
+        self.channel.clear()
+        self.assertEqual([], select.select([fd], [], [], 0)[0])
@@ -0,0 +1,132 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from _pydevd_bundle import pydevd_lazy_attach
+from pydevd_file_utils import get_abs_path_real_path_and_base_from_file
+
+
+class TestLazyAttach(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        sys.path.insert(0, self.tempdir)
+        self.attached = []
+        self.original_meta_path = sys.meta_path[:]
+
+    def tearDown(self):
+        sys.meta_path[:] = self.original_meta_path
+        sys.path.remove(self.tempdir)
+        for name in ('_lazy_attach_mod1', '_lazy_attach_mod2'):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.tempdir)
+
+    def _create_module(self, name):
+        filename = os.path.join(self.tempdir, name + '.py')
+        stream = open(filename, 'w')
+        try:
+            stream.write('a = 1\n')
+        finally:
+            stream.close()
+        return get_abs_path_real_path_and_base_from_file(filename)[1]
+
+    def test_attach_on_import(self):
+        self._create_module('_lazy_attach_mod1')
+        filename = self._create_module('_lazy_attach_mod2')
+        info = {'files': [filename], 'exceptions': False, 'eager': False}
+        self.assertTrue(pydevd_lazy_attach.install_lazy_attach(info, lambda: self.attached.append(1)))
+
+        import _lazy_attach_mod1  # @UnresolvedImport
+        self.assertEqual([], self.attached)
+
+        import _lazy_attach_mod2  # @UnresolvedImport
+        self.assertEqual([1], self.attached)
+        self.assertEqual(self.original_meta_path, sys.meta_path)
+
+    def test_eager(self):
+        info = {'files': [], 'exceptions': False, 'eager': True}
+        self.assertFalse(pydevd_lazy_attach.install_lazy_attach(info, lambda: self.attached.append(1)))
+
+    def test_already_imported(self):
+        info = {'files': [get_abs_path_real_path_and_base_from_file(os.__file__)[1]], 'exceptions': False, 'eager': False}
+        self.assertFalse(pydevd_lazy_attach.install_lazy_attach(info, lambda: self.attached.append(1)))
+        self.assertEqual(self.original_meta_path, sys.meta_path)
+
+    def test_spawned_pool_worker_in_main_script(self):
+        if sys.version_info[:2] < (3, 4):
+            return  # No multiprocessing contexts (nor lazy attach).
+
+        main_script = os.path.join(self.tempdir, '_lazy_attach_main.py')
+        stream = open(main_script, 'w')
+        try:
+            stream.write(_SPAWN_MAIN_SCRIPT)
+        finally:
+            stream.close()
+
+        env = os.environ.copy()
+        pysrc = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join([pysrc] + [p for p in [env.get('PYTHONPATH')] if p])
+        process = subprocess.Popen(
+            [sys.executable, main_script], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env, cwd=self.tempdir)
+        output = process.communicate()[0].decode('utf-8', 'replace')
+        self.assertEqual(0, process.returncode, output)
+        # The pool worker (in the main script, which has a breakpoint) runs in a child where the debugger attached.
+        self.assertTrue('attached in worker: 1' in output, output)
+
+
+_SPAWN_MAIN_SCRIPT = '''
+import multiprocessing
+import os
+import sys
+from multiprocessing import spawn
+
+
+def worker(x):
+    return os.environ.get('_PYDEVD_TEST_ATTACHED', '0')  # A breakpoint is set in this file.
+
+
+class _Debugger(object):
+    break_on_uncaught_exceptions = {}
+    break_on_caught_exceptions = {}
+    has_plugin_line_breaks = False
+    has_plugin_exception_breaks = False
+
+
+def main():
+    from _pydevd_bundle import pydevd_lazy_attach
+    from pydevd_file_utils import get_abs_path_real_path_and_base_from_file
+
+    debugger = _Debugger()
+    debugger.breakpoints = {get_abs_path_real_path_and_base_from_file(__file__)[1]: {10: None}}
+    info = pydevd_lazy_attach.get_lazy_attach_info(debugger)
+
+    # What pydevd.settrace_lazy does in the spawned children (before the multiprocessing code runs).
+    prelude = (
+        'import os; from _pydevd_bundle import pydevd_lazy_attach; '
+        'attach = lambda: os.environ.__setitem__("_PYDEVD_TEST_ATTACHED", "1"); '
+        'pydevd_lazy_attach.install_lazy_attach(%r, attach) or attach(); ' % (info,))
+
+    original_get_command_line = spawn.get_command_line
+
+    def get_command_line(**kwds):
+        args = original_get_command_line(**kwds)
+        i = args.index('-c')
+        args[i + 1] = prelude + args[i + 1]
+        return args
+
+    spawn.get_command_line = get_command_line
+
+    pool = multiprocessing.get_context('spawn').Pool(1)
+    try:
+        sys.stdout.write('attached in worker: %s\\n' % (pool.apply(worker, (1,)),))
+    finally:
+        pool.close()
+        pool.join()
+
+
+if __name__ == '__main__':
+    main()
+'''
@@ -0,0 +1,31 @@
+import unittest
+
+from _pydevd_bundle.pydevd_plugin_utils import CodeNameFilter
+
+
+class _Plugin(object):
+
+    def __init__(self, code_names=None, code_name_prefixes=None):
+        if code_names is not None:
+            self.LINE_BREAKPOINT_CODE_NAMES = code_names
+        if code_name_prefixes is not None:
+            self.LINE_BREAKPOINT_CODE_NAME_PREFIXES = code_name_prefixes
+
+
+class TestCodeNameFilter(unittest.TestCase):
+
+    def test_code_name_filter(self):
+        code_name_filter = CodeNameFilter([_Plugin(('render',)), _Plugin(('root',), ('block_',))])
+        self.assertTrue(code_name_filter['render'])
+        self.assertTrue(code_name_filter['root'])
+        self.assertTrue(code_name_filter['block_content'])
+        self.assertFalse(code_name_filter['<module>'])
+        self.assertFalse(code_name_filter['block'])
+        self.assertEqual(5, len(code_name_filter))  # Cached
+
+    def test_code_name_filter_no_plugins(self):
+        self.assertFalse(CodeNameFilter([])['render'])
+
+    def test_code_name_filter_undeclared(self):
+        code_name_filter = CodeNameFilter([_Plugin(('render',)), _Plugin()])
+        self.assertTrue(code_name_filter['<module>'])
@@ -0,0 +1,199 @@
+import os
+import socket
+import stat
+import time
+import unittest
+
+from _pydevd_bundle import pydevd_relay
+from _pydevd_bundle.pydevd_comm import CMD_VERSION, CMD_SET_BREAK, CMD_GET_FRAME, CMD_THREAD_CREATE, \
+    CMD_THREAD_KILL, CMD_EXIT, CMD_REMOVE_BREAK, CMD_RUN, CMD_ADD_EXCEPTION_BREAK, CMD_REMOVE_EXCEPTION_BREAK
+
+
+class _LineSocket(object):
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.settimeout(5)
+        self.buffer = ''
+
+    def send(self, line):
+        self.sock.sendall((line + '\n').encode('utf-8'))
+
+    def readline(self):
+        while '\n' not in self.buffer:
+            r = self.sock.recv(1024)
+            if not r:
+                raise AssertionError('Socket closed')
+            self.buffer += r.decode('utf-8')
+        line, self.buffer = self.buffer.split('\n', 1)
+        return line
+
+    def assert_nothing_received(self):
+        self.sock.settimeout(0.2)
+        try:
+            try:
+                r = self.sock.recv(1024)
+            except socket.timeout:
+                return
+            raise AssertionError('Received: %r' % (r,))
+        finally:
+            self.sock.settimeout(5)
+
+
+class TestRelay(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.relay = pydevd_relay.Relay('127.0.0.1', self.server.getsockname()[1])
+        self.relay.start()
+        self.ide = None
+
+    def tearDown(self):
+        self.relay.close()
+        self.server.close()
+
+    def _connect_child(self, pid):
+        s = socket.socket(socket.AF_UNIX if self.relay.address.startswith('unix:') else socket.AF_INET)
+        address = self.relay.address.split(':', 1)[1]
+        if not self.relay.address.startswith('unix:'):
+            host, port = address.rsplit(':', 1)
+            address = (host, int(port))
+        s.connect(address)
+        child = _LineSocket(s)
+        child.send(str(pid))
+        if self.ide is None:
+            self.ide = _LineSocket(self.server.accept()[0])
+        return child
+
+    def test_relay(self):
+        child1 = self._connect_child(1)
+        child2 = self._connect_child(2)
+        time.sleep(0.2)  # Give some time for the children to be registered.
+
+        # Broadcast (and only one response forwarded).
+        self.ide.send('%s\t1\t1.1\tWINDOWS' % (CMD_VERSION,))
+        self.assertEqual('%s\t1\t1.1\tWINDOWS' % (CMD_VERSION,), child1.readline())
+        self.assertEqual('%s\t1\t1.1\tWINDOWS' % (CMD_VERSION,), child2.readline())
+        child1.send('%s\t1\tv1' % (CMD_VERSION,))
+        child2.send('%s\t1\tv1' % (CMD_VERSION,))
+        self.assertEqual('%s\t1\tv1' % (CMD_VERSION,), self.ide.readline())
+
+        # Routed by the pid in the thread id.
+        self.ide.send('%s\t3\tpid_2_id_22\t33' % (CMD_GET_FRAME,))
+        self.assertEqual('%s\t3\tpid_2_id_22\t33' % (CMD_GET_FRAME,), child2.readline())
+        child1.assert_nothing_received()
+
+        # Replayed for a child connected later on.
+        self.ide.send('%s\t5\tpython-line\tfile.py\t10' % (CMD_SET_BREAK,))
+        child3 = self._connect_child(3)
+        self.assertEqual('%s\t1\t1.1\tWINDOWS' % (CMD_VERSION,), child3.readline())
+        self.assertEqual('%s\t5\tpython-line\tfile.py\t10' % (CMD_SET_BREAK,), child3.readline())
+        child3.send('%s\t1\tv1' % (CMD_VERSION,))  # Already answered.
+
+        # Threads of a child which disconnects are reported as killed (and its exit isn't forwarded).
+        child3.send('%s\t2\t<xml><thread name="MainThread" id="pid_3_id_1" /></xml>' % (CMD_THREAD_CREATE,))
+        self.assertEqual(
+            '%s\t2\t<xml><thread name="MainThread" id="pid_3_id_1" /></xml>' % (CMD_THREAD_CREATE,),
+            self.ide.readline())
+        child3.send('%s\t4\t' % (CMD_EXIT,))
+        child3.sock.close()
+        line = self.ide.readline()
+        self.assertTrue(line.startswith('%s\t' % (CMD_THREAD_KILL,)), line)
+        self.assertTrue(line.endswith('\tpid_3_id_1'), line)
+
+    def test_replay_keeps_latest_state(self):
+        child1 = self._connect_child(1)
+        time.sleep(0.2)  # Give some time for the child to be registered.
+
+        commands = [
+            '%s\t1\t1.1\tWINDOWS' % (CMD_VERSION,),
+            '%s\t3\t1\tpython-line\tfile.py\t10\tNone\tNone\tNone' % (CMD_SET_BREAK,),
+            '%s\t5\t2\tpython-line\tfile.py\t20\tNone\tNone\tNone' % (CMD_SET_BREAK,),
+            '%s\t7\tValueError\t1\t0\t0' % (CMD_ADD_EXCEPTION_BREAK,),
+            '%s\t9\t' % (CMD_RUN,),
+            # Changes the condition of the first breakpoint.
+            '%s\t11\t1\tpython-line\tfile.py\t10\ta == 1\tNone\tNone' % (CMD_SET_BREAK,),
+            '%s\t13\tpython-line\tfile.py\t2' % (CMD_REMOVE_BREAK,),
+            '%s\t15\tValueError' % (CMD_REMOVE_EXCEPTION_BREAK,),
+            '%s\t17\t1.1\tWINDOWS' % (CMD_VERSION,),
+        ]
+        for command in commands:
+            self.ide.send(command)
+        for command in commands:
+            self.assertEqual(command, child1.readline())
+
+        child2 = self._connect_child(2)
+        # The latest state of each key, in the order the keys were first set.
+        self.assertEqual(commands[8], child2.readline())  # version
+        self.assertEqual(commands[5], child2.readline())  # breakpoint 1 (with the condition)
+        self.assertEqual(commands[4], child2.readline())  # run
+        child2.assert_nothing_received()
+
+    def test_unix_socket_in_private_dir(self):
+        if not self.relay.address.startswith('unix:'):
+            return
+        socket_dir = os.path.dirname(self.relay.address[len('unix:'):])
+        self.assertEqual(0, stat.S_IMODE(os.stat(socket_dir).st_mode) & (stat.S_IRWXG | stat.S_IRWXO))
+        self.relay.close()
+        self.assertFalse(os.path.exists(socket_dir))
+
+    def _wait_for(self, condition):
+        initial_time = time.time()
+        while not condition():
+            if time.time() - initial_time > 5:
+                raise AssertionError('Condition not satisfied.')
+            time.sleep(0.01)
+
+    def test_broadcast_seqs_pruned(self):
+        child1 = self._connect_child(1)
+        child2 = self._connect_child(2)
+        self._wait_for(lambda: len(self.relay._children) == 2)
+
+        # Forgotten when all the children answered.
+        self.ide.send('%s\t1\t1.1\tWINDOWS' % (CMD_VERSION,))
+        child1.readline()
+        child2.readline()
+        child1.send('%s\t1\tv1' % (CMD_VERSION,))
+        self.assertEqual('%s\t1\tv1' % (CMD_VERSION,), self.ide.readline())
+        self._wait_for(lambda: self.relay._broadcast_seqs[1] == [True, set([2])])
+        child2.send('%s\t1\tv1' % (CMD_VERSION,))
+        self._wait_for(lambda: 1 not in self.relay._broadcast_seqs)
+
+        # Forgotten when the children which didn't answer disconnect.
+        self.ide.send('%s\t3\tpython-line\tfile.py\t10' % (CMD_SET_BREAK,))
+        child1.readline()
+        child2.readline()
+        self._wait_for(lambda: 3 in self.relay._broadcast_seqs)
+        child1.sock.close()
+        child2.sock.close()
+        self._wait_for(lambda: not self.relay._children)
+        self.assertEqual({}, self.relay._broadcast_seqs)
+
+    def test_broadcast_seqs_bounded(self):
+        original = pydevd_relay.MAX_BROADCAST_SEQS
+        pydevd_relay.MAX_BROADCAST_SEQS = 3
+        try:
+            for seq in range(10):
+                self.relay._add_broadcast_seq(seq, (1,))
+        finally:
+            pydevd_relay.MAX_BROADCAST_SEQS = original
+        self.assertEqual([7, 8, 9], sorted(self.relay._broadcast_seqs))
+
+    def test_iter_lines(self):
+        class _Socket(object):
+
+            def __init__(self, chunks):
+                self.chunks = list(chunks)
+
+            def recv(self, size):
+                if self.chunks:
+                    return self.chunks.pop(0)
+                return ''.encode('ascii')
+
+        big = 'x'.encode('ascii') * (1024 * 1024)
+        nl = '\n'.encode('ascii')
+        chunks = [big[:1000], big[1000:] + nl + 'a'.encode('ascii'), nl + nl, 'b'.encode('ascii') + nl + 'c'.encode('ascii')]
+        lines = list(pydevd_relay._iter_lines(_Socket(chunks)))
+        self.assertEqual([big, 'a'.encode('ascii'), ''.encode('ascii'), 'b'.encode('ascii')], lines)
@@ -0,0 +1,56 @@
+import sys
+import unittest
+
+from _pydevd_bundle import pydevd_signature
+from _pydevd_bundle.pydevd_signature import SignatureFactory, flush_signatures
+
+
+class _Writer(object):
+
+    def __init__(self):
+        self.commands = []
+
+    def add_command(self, cmd):
+        self.commands.append(cmd)
+
+
+class _Debugger(object):
+
+    def __init__(self, signature_factory):
+        self.signature_factory = signature_factory
+        self.writer = _Writer()
+
+
+def _collect(signature_factory, a, b):
+    return signature_factory.collect_call_signature(sys._getframe())
+
+
+class TestSampledSignatures(unittest.TestCase):
+
+    def test_collect_and_flush(self):
+        signature_factory = SignatureFactory(sampled=True)
+        self.assertTrue(_collect(signature_factory, 1, 'a'))
+        self.assertFalse(_collect(signature_factory, 2, 'b'))  # Same types: cached.
+        self.assertTrue(_collect(signature_factory, 1.0, 'a'))
+
+        dbg = _Debugger(signature_factory)
+        flush_signatures(dbg)
+        self.assertEqual(1, len(dbg.writer.commands))
+        self.assertEqual(2, dbg.writer.commands[0].text.count('<call_signature '))
+
+        flush_signatures(dbg)
+        self.assertEqual(1, len(dbg.writer.commands))
+
+    def test_sampling(self):
+        original_before_sampling = pydevd_signature.SAMPLED_SIGNATURES_BEFORE_SAMPLING
+        original_rate = pydevd_signature.SAMPLED_SIGNATURES_RATE
+        pydevd_signature.SAMPLED_SIGNATURES_BEFORE_SAMPLING = 1
+        pydevd_signature.SAMPLED_SIGNATURES_RATE = 2
+        try:
+            signature_factory = SignatureFactory(sampled=True)
+            self.assertTrue(_collect(signature_factory, 1, 'a'))
+            self.assertFalse(_collect(signature_factory, 1.0, 'a'))  # Skipped by the sampling.
+            self.assertTrue(_collect(signature_factory, 1.0, 'a'))
+        finally:
+            pydevd_signature.SAMPLED_SIGNATURES_BEFORE_SAMPLING = original_before_sampling
+            pydevd_signature.SAMPLED_SIGNATURES_RATE = original_rate
@@ -34,6 +34,86 @@ class Test(unittest.TestCase):
             #remove it to leave it ok for other tests
             sys.path.remove(ADD_TO_PYTHONPATH)
 
+    def test_bounded_drop_oldest(self):
+        from _pydevd_bundle import pydevd_io
+        buf = pydevd_io.IOBuf(max_size=10, overflow_policy=pydevd_io.IO_OVERFLOW_DROP_OLDEST)
+        buf.write('aaaa')
+        buf.write('bbbb')
+        buf.write('cccc')
+        self.assertEqual('... (2 characters of output dropped)\naabbbbcccc', buf.getvalue())
+        self.assertTrue(buf.empty())
+
+        buf.write('0123456789xyz')
+        self.assertEqual('... (3 characters of output dropped)\n3456789xyz', buf.getvalue())
+
+    def test_bounded_summarize(self):
+        from _pydevd_bundle import pydevd_io
+        buf = pydevd_io.IOBuf(max_size=10, overflow_policy=pydevd_io.IO_OVERFLOW_SUMMARIZE)
+        buf.write('aaaa')
+        buf.write('bbbb')
+        buf.write('cccc')
+        buf.write('dddd')
+        self.assertEqual('aaaabbbbcc\n... (6 characters of output omitted)\n', buf.getvalue())
+        buf.write('eeee')
+        self.assertEqual('eeee', buf.getvalue())
+
+    def test_bounded_block(self):
+        from _pydevd_bundle import pydevd_io
+        import threading
+        buf = pydevd_io.IOBuf(max_size=10, overflow_policy=pydevd_io.IO_OVERFLOW_BLOCK)
+        buf.write('aaaaaaaa')
+
+        t = threading.Thread(target=buf.write, args=('bbbb',))
+        t.start()
+        t.join(0.2)
+        self.assertTrue(t.is_alive())  # Blocked until there's space.
+        self.assertEqual('aaaaaaaa', buf.getvalue())
+        t.join()
+        self.assertEqual('bbbb', buf.getvalue())
+
+    def test_on_first_write(self):
+        from _pydevd_bundle import pydevd_io
+        calls = []
+        buf = pydevd_io.IOBuf(max_size=10, on_first_write=lambda: calls.append(1))
+        buf.write('a')
+        buf.write('b')
+        self.assertEqual(1, len(calls))
+        buf.getvalue()
+        buf.write('c')
+        self.assertEqual(2, len(calls))
+
+    def test_invalid_buffer_settings_from_env(self):
+        from _pydevd_bundle import pydevd_io
+        original_env = os.environ.copy()
+        original_stderr = sys.stderr
+        try:
+            from StringIO import StringIO
+        except ImportError:
+            from io import StringIO
+        sys.stderr = StringIO()
+        try:
+            os.environ['PYDEVD_IO_BUFFER_MAX_SIZE'] = '1M'
+            os.environ['PYDEVD_IO_BUFFER_OVERFLOW_POLICY'] = 'wait'
+            self.assertEqual(256 * 1024, pydevd_io._get_io_buffer_max_size())
+            self.assertEqual(pydevd_io.IO_OVERFLOW_DROP_OLDEST, pydevd_io._get_io_buffer_overflow_policy())
+            self.assertTrue('PYDEVD_IO_BUFFER_MAX_SIZE' in sys.stderr.getvalue())
+            self.assertTrue('PYDEVD_IO_BUFFER_OVERFLOW_POLICY' in sys.stderr.getvalue())
+
+            os.environ['PYDEVD_IO_BUFFER_MAX_SIZE'] = '1000'
+            os.environ['PYDEVD_IO_BUFFER_OVERFLOW_POLICY'] = pydevd_io.IO_OVERFLOW_BLOCK
+            self.assertEqual(1000, pydevd_io._get_io_buffer_max_size())
+            self.assertEqual(pydevd_io.IO_OVERFLOW_BLOCK, pydevd_io._get_io_buffer_overflow_policy())
+        finally:
+            sys.stderr = original_stderr
+            os.environ.clear()
+            os.environ.update(original_env)
+
+    def test_split_io_message(self):
+        from _pydevd_bundle.pydevd_comm import _split_io_message
+        self.assertEqual(['abc'], _split_io_message('abc', 3))
+        self.assertEqual(['abc', 'def', 'g'], _split_io_message('abcdefg', 3))
+
+
 if __name__ == '__main__':
     #this is so that we can run it frem the jython tests -- because we don't actually have an __main__ module
     #(so, it won't try importing the __main__ module)
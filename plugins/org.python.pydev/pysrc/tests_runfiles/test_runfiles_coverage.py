@@ -0,0 +1,174 @@
+import os.path
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from _pydev_runfiles import pydev_runfiles_coverage
+
+try:
+    import coverage  #@UnresolvedImport
+except ImportError:
+    coverage = None
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+SAMPLE_CONTENTS = '''
+def check(value):
+    if value == 1:
+        return 'one'
+    elif value == 2:
+        return 'two'
+    return 'other'
+
+def not_called():
+    a = 1
+    return a
+'''
+
+# A line in the report: name, statements, missing, cover and (optionally) the missing lines.
+REPORT_LINE = re.compile(r'^(\S+)\s+(\d+)\s+(\d+)\s+(\d+%)\s*(.*)$')
+
+
+class TestParallelCoverage(unittest.TestCase):
+
+    def setUp(self):
+        if coverage is None or not pydev_runfiles_coverage.can_report_in_parallel():
+            self.skipTest('coverage 4 onwards is needed.')
+        self.tempdir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.tempdir)  # No coverage config (i.e.: [paths]) from the current dir.
+
+        self.sample_files = []
+        for name in ('sample1.py', 'sample2.py', 'sample3.py'):
+            filename = os.path.join(self.tempdir, name)
+            stream = open(filename, 'w')
+            try:
+                stream.write(SAMPLE_CONTENTS)
+            finally:
+                stream.close()
+            self.sample_files.append(filename)
+
+        # One data file for each job (each job calls check() with a different value).
+        self.data_file = os.path.join(self.tempdir, '.coverage')
+        for i, value in enumerate((1, 2, 3, 1)):
+            self._run_job(i, value)
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.tempdir)
+
+    def _run_job(self, i, value):
+        cov = coverage.coverage(data_file=self.data_file, data_suffix=str(i))
+        cov.start()
+        try:
+            for filename in self.sample_files[:i + 1]:
+                namespace = {}
+                exec(compile(SAMPLE_CONTENTS, filename, 'exec'), namespace)
+                namespace['check'](value)
+        finally:
+            cov.stop()
+        cov.save()
+
+    def _get_lines(self, data_file):
+        data = pydev_runfiles_coverage._read_coverage_data(data_file)
+        return dict((filename, sorted(data.lines(filename) or ())) for filename in self.sample_files)
+
+    def test_combine(self):
+        data_files = pydev_runfiles_coverage.get_parallel_data_files(self.tempdir, self.data_file)
+        self.assertEqual(4, len(data_files))
+
+        # Combine a copy of the files serially (with coverage itself).
+        serial_dir = os.path.join(self.tempdir, 'serial')
+        os.mkdir(serial_dir)
+        for f in data_files:
+            shutil.copy(f, serial_dir)
+        serial_data_file = os.path.join(serial_dir, '.coverage')
+        cov = coverage.coverage(data_file=serial_data_file)
+        cov.combine(pydev_runfiles_coverage.get_parallel_data_files(serial_dir, serial_data_file))
+        cov.save()
+
+        pydev_runfiles_coverage.combine_coverage_files_in_parallel(data_files, self.data_file, 2)
+        self.assertEqual([], pydev_runfiles_coverage.get_parallel_data_files(self.tempdir, self.data_file))
+
+        expected = self._get_lines(serial_data_file)
+        self.assertEqual(expected, self._get_lines(self.data_file))
+        self.assertTrue(expected[self.sample_files[0]])
+
+    def test_no_parallel_combine_with_path_aliases(self):
+        self.assertTrue(pydev_runfiles_coverage.can_combine_in_parallel())
+        stream = open(os.path.join(self.tempdir, '.coveragerc'), 'w')
+        try:
+            stream.write('[paths]\nsource =\n    src/\n    /other/src/\n')
+        finally:
+            stream.close()
+        # 'coverage combine' must be used to remap the paths.
+        self.assertFalse(pydev_runfiles_coverage.can_combine_in_parallel())
+
+    def test_report(self):
+        pydev_runfiles_coverage.combine_coverage_files_in_parallel(
+            pydev_runfiles_coverage.get_parallel_data_files(self.tempdir, self.data_file), self.data_file, 2)
+
+        cov = coverage.coverage(data_file=self.data_file)
+        cov.load()
+        serial_stream = StringIO()
+        cov.report(self.sample_files, show_missing=True, file=serial_stream)
+
+        cache_file = os.path.join(self.tempdir, pydev_runfiles_coverage.REPORT_CACHE_FILE)
+        for _i in range(2):  # The second time the results come from the cache.
+            report = pydev_runfiles_coverage.create_coverage_report(self.sample_files, self.data_file, 2, cache_file)
+            stream = StringIO()
+            pydev_runfiles_coverage.write_coverage_report(report, stream)
+            self.assertEqual(self._parse_report(serial_stream.getvalue()), self._parse_report(stream.getvalue()))
+
+        # The files are reported without the extension (as expected by PyCoverage.analyzeReadLine).
+        self.assertTrue(os.path.splitext(self.sample_files[0])[0] + ' ' in stream.getvalue(), stream.getvalue())
+        self.assertTrue('.py ' not in stream.getvalue(), stream.getvalue())
+
+    def test_report_cache_uses_config(self):
+        pydev_runfiles_coverage.combine_coverage_files_in_parallel(
+            pydev_runfiles_coverage.get_parallel_data_files(self.tempdir, self.data_file), self.data_file, 1)
+        cache_file = os.path.join(self.tempdir, pydev_runfiles_coverage.REPORT_CACHE_FILE)
+        report = dict(pydev_runfiles_coverage.create_coverage_report(self.sample_files, self.data_file, 1, cache_file))
+        statements = report[self.sample_files[0]][0]
+
+        # Excluding lines in the .coveragerc changes the report (even if the files and data didn't change).
+        stream = open(os.path.join(self.tempdir, '.coveragerc'), 'w')
+        try:
+            stream.write('[report]\nexclude_lines =\n    def not_called\n')
+        finally:
+            stream.close()
+        report = dict(pydev_runfiles_coverage.create_coverage_report(self.sample_files, self.data_file, 1, cache_file))
+        self.assertEqual(statements - 3, report[self.sample_files[0]][0])
+
+    def test_invalid_jobs(self):
+        import subprocess
+        pydev_coverage = os.path.join(os.path.dirname(pydev_runfiles_coverage.__file__), '..', 'pydev_coverage.py')
+        process = subprocess.Popen(
+            [sys.executable, pydev_coverage, '--pydev-jobs=abc', 'combine'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        _stdout, stderr = process.communicate()
+        stderr = stderr.decode('utf-8', 'replace')
+        self.assertTrue('Invalid value for --pydev-jobs: abc' in stderr, stderr)
+        self.assertTrue('ValueError' not in stderr, stderr)
+
+    def _parse_report(self, contents):
+        ret = {}
+        for line in contents.splitlines():
+            match = REPORT_LINE.match(line.strip())
+            if match is not None:
+                name = os.path.splitext(os.path.basename(match.group(1)))[0]
+                ret[name] = (match.group(2), match.group(3), match.group(4), match.group(5).strip())
+        self.assertTrue(ret, contents)
+        return ret
+
+
+if __name__ == '__main__':
+    unittest.main()
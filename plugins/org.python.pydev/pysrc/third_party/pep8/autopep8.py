@@ -2636,10 +2636,7 @@ def refactor_with_2to3(source_text, fixer_names, filename=''):
     Return the refactored source code.
 
     """
-    check_lib2to3()
-    from lib2to3.refactor import RefactoringTool
-    fixers = ['lib2to3.fixes.fix_' + name for name in fixer_names]
-    tool = RefactoringTool(fixer_names=fixers, explicit=fixers)
+    tool = _get_refactoring_tool(fixer_names)
 
     from lib2to3.pgen2 import tokenize as lib2to3_tokenize
     try:
@@ -2649,6 +2646,33 @@ def refactor_with_2to3(source_text, fixer_names, filename=''):
         return source_text
 
 
+# RefactoringTool instances (with their fixers and compiled patterns) keyed by
+# the fixer names (in the given order, as fixers with the same run_order are
+# applied in that order), so that fixing many files doesn't import and
+# instantiate every fixer again for each one.
+_refactoring_tools = {}
+
+
+def _get_refactoring_tool(fixer_names):
+    """Return a (cached) lib2to3 RefactoringTool for the given fixer names."""
+    key = tuple(fixer_names)
+    tool = _refactoring_tools.get(key)
+    if tool is None:
+        check_lib2to3()
+        from lib2to3.refactor import RefactoringTool
+        fixers = ['lib2to3.fixes.fix_' + name for name in key]
+        tool = RefactoringTool(fixer_names=fixers, explicit=fixers)
+        _refactoring_tools[key] = tool
+    else:
+        # Clear the state accumulated by the previous run (the fixer log is
+        # shared with the fixers, so, it must be cleared in place).
+        del tool.fixer_log[:]
+        del tool.errors[:]
+        del tool.files[:]
+        tool.wrote = False
+    return tool
+
+
 def check_syntax(code):
     """Return True if syntax is okay."""
     try:
@@ -106,9 +106,19 @@ class Driver(object):
         return self.parse_tokens(tokens, debug)
 
 
+# Grammars already loaded in this process, keyed by pickle path.
+_loaded_grammars = {}
+
+
 def load_grammar(gt="Grammar.txt", gp=None,
                  save=True, force=False, logger=None):
-    """Load the grammar (maybe from a pickle)."""
+    """Load the grammar (maybe from a pickle).
+
+    Loaded grammars are kept for the lifetime of the process. When the pickle
+    can't be written next to the grammar file (i.e.: read-only install), it's
+    written to (and later read from) a per-user cache directory instead of
+    regenerating the tables on each start.
+    """
     if logger is None:
         logger = logging.getLogger()
     if gp is None:
@@ -116,21 +126,66 @@ def load_grammar(gt="Grammar.txt", gp=None,
         if tail == ".txt":
             tail = ""
         gp = head + tail + ".".join(map(str, sys.version_info)) + ".pickle"
-    if force or not _newer(gp, gt):
+    if not force:
+        g = _loaded_grammars.get(gp)
+        if g is not None:
+            return g
+
+    if not force and not _newer(gp, gt):
+        cached_gp = _user_cache_pickle(gp)
+        if cached_gp is not None and _newer(cached_gp, gt):
+            gp_to_load = cached_gp
+        else:
+            gp_to_load = None
+    else:
+        gp_to_load = gp
+
+    if force or gp_to_load is None:
         logger.info("Generating grammar tables from %s", gt)
         g = pgen.generate_grammar(gt)
         if save:
-            logger.info("Writing grammar tables to %s", gp)
-            try:
-                g.dump(gp)
-            except IOError, e:
-                logger.info("Writing failed:"+str(e))
+            _dump_grammar(g, gp, logger)
     else:
         g = grammar.Grammar()
-        g.load(gp)
+        g.load(gp_to_load)
+    _loaded_grammars[gp] = g
     return g
 
 
+def _dump_grammar(g, gp, logger):
+    logger.info("Writing grammar tables to %s", gp)
+    try:
+        g.dump(gp)
+        return
+    except IOError, e:
+        logger.info("Writing failed:"+str(e))
+
+    cached_gp = _user_cache_pickle(gp)
+    if cached_gp is None:
+        return
+    logger.info("Writing grammar tables to %s", cached_gp)
+    try:
+        cache_dir = os.path.dirname(cached_gp)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        g.dump(cached_gp)
+    except (IOError, OSError), e:
+        logger.info("Writing failed:"+str(e))
+
+
+def _user_cache_pickle(gp):
+    """Return the path of gp inside the per-user cache dir (or None)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if not cache_home:
+        cache_home = os.environ.get("LOCALAPPDATA")
+    if not cache_home:
+        try:
+            cache_home = os.path.join(os.path.expanduser("~"), ".cache")
+        except Exception:
+            return None
+    return os.path.join(cache_home, "pydev", "lib2to3", os.path.basename(gp))
+
+
 def _newer(a, b):
     """Inquire whether file a was written since file b."""
     if not os.path.exists(a):